@@ -1,11 +1,12 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
-import tempfile
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+import asyncio
 import os
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import logging
 import sys
+import time
 from dotenv import load_dotenv
 import logging as logger
 from datetime import datetime
@@ -20,6 +21,15 @@ from app.modules.scoring.experience import calculate_experience_score
 from app.modules.scoring.projects import calculate_projects_score
 from app.modules.scoring.awards import calculate_awards_score
 from app.modules.scoring.certifications import calculate_certifications_score
+from app.modules.pipeline import evaluate_cv_bytes_async, evaluate_cv_stream_async
+from app.utils.uploads import read_upload_limited
+from app.modules.batch.jobs import batch_jobs, iter_zip_members
+from app.modules.batch.job_queue import DONE, JOB_QUEUE_ENABLED, job_queue, job_worker
+from app.utils.worker_pool import shutdown_worker_pool
+from app.utils.openai_client import openai_client
+from app.utils.metrics import HTTP_SECONDS, metrics, stage_span
+from app.utils.extraction_cache import sha256_bytes
+from app.utils.result_store import result_store
 
 # Load environment variables
 load_dotenv()
@@ -33,6 +43,71 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
+BATCH_MAX_UPLOAD_BYTES = int(os.getenv("BATCH_MAX_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+
+@app.on_event("startup")
+def startup_event() -> None:
+    """
+    Optionally load the embedding model up front instead of on first use.
+    """
+    if os.getenv("EMBEDDING_PRELOAD", "0") == "1":
+        from app.modules.embedding.model_registry import model_registry
+        model_registry.preload()
+
+@app.on_event("startup")
+async def start_job_worker() -> None:
+    """
+    Resume queued jobs, including those interrupted by a crash or redeploy.
+    """
+    if JOB_QUEUE_ENABLED:
+        job_worker.start()
+
+@app.on_event("shutdown")
+async def stop_job_worker() -> None:
+    """
+    Stop claiming jobs; unfinished ones are resumed after their lease expires.
+    """
+    await job_worker.stop()
+    result_store.flush()
+
+@app.on_event("shutdown")
+def shutdown_event() -> None:
+    """
+    Stop the worker pool used for CPU-bound extraction.
+    """
+    shutdown_worker_pool()
+
+@app.on_event("shutdown")
+async def close_llm_clients() -> None:
+    """
+    Close this worker's pooled OpenAI connections.
+    """
+    await openai_client.aclose()
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """
+    Time every request by route template and status code. Streaming
+    responses are timed until their headers are sent.
+    """
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        endpoint = getattr(route, "path", "unmatched")
+        HTTP_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint, status=str(status))
+
+@app.get("/metrics")
+def metrics_endpoint() -> Response:
+    """
+    Stage latency, LLM token and fallback metrics in Prometheus text format.
+    """
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.post("/api/evaluate-cv")
 async def evaluate_cv_endpoint(file: UploadFile = File(...)) -> JSONResponse:
     """
@@ -43,52 +118,147 @@ async def evaluate_cv_endpoint(file: UploadFile = File(...)) -> JSONResponse:
         if not file.filename.lower().endswith('.pdf'):
             raise HTTPException(status_code=400, detail="File must be a PDF")
 
-        # Create temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_path = temp_file.name
+        # Read the upload in chunks, rejecting oversized files early
+        with stage_span("read_upload"):
+            content = await read_upload_limited(file)
 
         try:
-            # Extract CV data
-            resume = extract_resume(temp_path)
-            logger.info("Successfully extracted resume data")
+            if JOB_QUEUE_ENABLED:
+                result = await evaluate_queued(content, file.filename)
+            else:
+                result = await evaluate_cv_bytes_async(content, file.filename)
+                await asyncio.to_thread(result_store.save, result, sha256_bytes(content))
+            return JSONResponse(content=result)
 
-            # Calculate scores
-            score_result = calculate_total_score(resume)
-            logger.info("Successfully calculated scores")
+        except Exception as e:
+            logger.error(f"Processing error: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Failed to process CV: {str(e)}")
 
-            # Generate reasoning based on the status
-            ai_reason = evaluate_resume(resume, score_result["status"])
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing CV: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error processing CV: {str(e)}")
 
-            # Prepare response
-            result = {
-                "file_name": file.filename,
-                "processed_at": datetime.now().isoformat(),
-                "cv_data": resume.dict(),
-                "scores": score_result["scores"],
-                "weighted_scores": score_result["weighted_scores"],
-                "status": score_result["status"],
-                "total_score": score_result["total_score"],
-                "ai_reason": ai_reason
-            }
+async def evaluate_queued(content: bytes, file_name: str) -> Dict[str, Any]:
+    """
+    Evaluate through the durable job queue: identical uploads share one job,
+    and a request interrupted mid-pipeline is finished by the job worker.
+    """
+    queued = await asyncio.to_thread(job_queue.submit, content, file_name)
+    job = await job_worker.run_job(queued.id)
+    if job.status != DONE:
+        raise RuntimeError(job.error or f"Job {job.id} is {job.status}")
+    return {**job.result, "file_name": file_name}
 
-            return JSONResponse(content=result)
+def format_sse(event: str, data: Any) -> str:
+    """
+    Format one server-sent event.
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
+@app.post("/api/evaluate-cv/stream")
+async def evaluate_cv_stream_endpoint(file: UploadFile = File(...)) -> StreamingResponse:
+    """
+    Evaluate a CV and stream sections, scores and the final result as server-sent events.
+    """
+    if not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="File must be a PDF")
+    content = await read_upload_limited(file)
+
+    async def events():
+        try:
+            async for event in evaluate_cv_stream_async(content, file.filename):
+                if event["event"] == "result":
+                    await asyncio.to_thread(result_store.save, event["data"], sha256_bytes(content))
+                yield format_sse(event["event"], event["data"])
         except Exception as e:
             logger.error(f"Processing error: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Failed to process CV: {str(e)}")
+            yield format_sse("error", {"detail": f"Failed to process CV: {str(e)}"})
 
-        finally:
-            # Clean up temp file
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.post("/api/evaluate-cv/batch", status_code=202)
+async def evaluate_cv_batch_endpoint(files: List[UploadFile] = File(...)) -> JSONResponse:
+    """
+    Queue many PDFs (or a zip of PDFs) for evaluation and return a job ID to poll.
+    """
+    items = []
+    for upload in files:
+        name = upload.filename or ""
+        if name.lower().endswith(".zip"):
+            content = await read_upload_limited(upload, max_bytes=BATCH_MAX_UPLOAD_BYTES)
             try:
-                os.unlink(temp_path)
+                items.extend(iter_zip_members(content))
+            except ValueError as e:
+                raise HTTPException(status_code=413, detail=str(e))
             except Exception as e:
-                logger.warning(f"Error removing temp file: {str(e)}")
+                raise HTTPException(status_code=400, detail=f"Invalid zip archive {name}: {str(e)}")
+        elif name.lower().endswith(".pdf"):
+            content = await read_upload_limited(upload)
+            items.append((name, lambda content=content: content))
+        else:
+            raise HTTPException(status_code=400, detail=f"Unsupported file type: {name}")
 
-    except Exception as e:
-        logger.error(f"Error processing CV: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error processing CV: {str(e)}")
+    if not items:
+        raise HTTPException(status_code=400, detail="No PDF files found in the upload")
+
+    job = await batch_jobs.submit(items)
+    return JSONResponse(status_code=202, content={"job_id": job.id, "total": len(job.files)})
+
+@app.get("/api/jobs/{job_id}")
+async def get_job_endpoint(job_id: str) -> JSONResponse:
+    """
+    Return progress and per-file results for a batch job.
+    """
+    job = await asyncio.to_thread(batch_jobs.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JSONResponse(content=job.to_dict())
+
+@app.get("/api/results")
+def list_results_endpoint(
+    status: Optional[str] = None,
+    email: Optional[str] = None,
+    file_hash: Optional[str] = None,
+    min_total: Optional[float] = None,
+    max_total: Optional[float] = None,
+    min_education: Optional[float] = None,
+    min_experience: Optional[float] = None,
+    min_projects: Optional[float] = None,
+    min_awards: Optional[float] = None,
+    min_certifications: Optional[float] = None,
+    sort: str = "total_score",
+    order: str = "desc",
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    full: bool = False,
+) -> JSONResponse:
+    """
+    Query stored results, e.g. ?status=Pass&min_experience=80. Pages are
+    keyset-paginated: pass the returned next_cursor to get the next page.
+    """
+    category_minimums = {
+        "education": min_education,
+        "experience": min_experience,
+        "projects": min_projects,
+        "awards": min_awards,
+        "certifications": min_certifications,
+    }
+    min_scores = {category: value for category, value in category_minimums.items() if value is not None}
+    if min_total is not None:
+        min_scores["total_score"] = min_total
+    max_scores = {"total_score": max_total} if max_total is not None else {}
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be asc or desc")
+    try:
+        page = result_store.query(
+            status=status, email=email, file_hash=file_hash, min_scores=min_scores, max_scores=max_scores,
+            sort=sort, descending=order == "desc", limit=limit, cursor=cursor, include_result=full,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return JSONResponse(content=page)
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
@@ -0,0 +1,610 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.models.resume import Resume
+from app.modules.document_extraction.extractor import (
+    _cache_lookup,
+    analyze_text_async,
+    extract_text_cached_async,
+)
+from app.modules.document_extraction.ocr import extraction_prompt_version
+from app.modules.document_extraction.pdf_text import pdf_text_version
+from app.modules.pipeline import build_evaluation_result, score_resume_async, status_reason_async
+from app.modules.scoring.scorer import scoring_rules_version
+from app.utils.extraction_cache import EXTRACTION_CACHE_TTL_SECONDS, sha256_bytes
+from app.utils.metrics import NEAR_DUPLICATES, stage_span
+from app.utils.near_duplicates import NearDuplicate, near_duplicates, same_contact
+from app.utils.result_store import result_store
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUE_ENABLED = os.getenv("JOB_QUEUE_ENABLED", "1") == "1"
+JOB_QUEUE_PATH = os.getenv(
+    "JOB_QUEUE_PATH",
+    str(Path(__file__).parent.parent.parent.parent / ".cache" / "jobs.sqlite3")
+)
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "120"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_DELAY_SECONDS = float(os.getenv("JOB_RETRY_DELAY_SECONDS", "5"))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "0.5"))
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", os.getenv("BATCH_MAX_CONCURRENCY", "4")))
+# Finished jobs not referenced by a kept batch are deleted this long after their last update.
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+JOB_PRUNE_INTERVAL_SECONDS = 60.0
+
+# Pipeline stages in order; a job's stage is the last one completed.
+STAGE_QUEUED = "queued"
+STAGE_TEXT = "text"
+STAGE_EXTRACTED = "extracted"
+STAGE_SCORED = "scored"
+STAGE_DONE = "done"
+STAGES = (STAGE_QUEUED, STAGE_TEXT, STAGE_EXTRACTED, STAGE_SCORED, STAGE_DONE)
+
+# Job statuses.
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+
+_COLUMNS = (
+    "id, file_hash, file_name, stage, status, attempts, cv_text, resume_json, "
+    "analysis_json, scores_json, result_json, error, created_at, updated_at, "
+    "prompt_version, rules_version, extracted_at, text_version"
+)
+
+# Columns added after the first release, created on existing databases at connect time.
+_ADDED_COLUMNS = {"prompt_version": "TEXT", "rules_version": "TEXT", "extracted_at": "REAL", "text_version": "TEXT"}
+
+def _loads(value: Optional[str]) -> Any:
+    return json.loads(value) if value else None
+
+@dataclass
+class QueuedJob:
+    id: str
+    file_hash: str
+    file_name: str
+    stage: str
+    status: str
+    attempts: int = 0
+    cv_text: Optional[str] = None
+    resume: Optional[Resume] = None
+    analysis: Dict[str, Any] = field(default_factory=dict)
+    score_result: Optional[Dict[str, Any]] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+    prompt_version: Optional[str] = None  # of the extraction behind resume and analysis
+    rules_version: Optional[str] = None   # of the rules behind score_result
+    extracted_at: Optional[float] = None
+    text_version: Optional[str] = None    # of the PDF text settings behind cv_text
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "QueuedJob":
+        resume = _loads(row[7])
+        return cls(
+            id=row[0], file_hash=row[1], file_name=row[2], stage=row[3], status=row[4], attempts=row[5],
+            cv_text=row[6], resume=Resume(**resume) if resume is not None else None,
+            analysis=_loads(row[8]) or {}, score_result=_loads(row[9]), result=_loads(row[10]),
+            error=row[11], created_at=row[12], updated_at=row[13],
+            prompt_version=row[14], rules_version=row[15], extracted_at=row[16], text_version=row[17],
+        )
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, ERROR)
+
+class JobQueue:
+    """
+    Durable SQLite queue of CV evaluations.
+
+    A job stores the upload bytes and, as the pipeline advances, the artifacts
+    of each completed stage (text, Resume and analysis, scores, result), so a
+    job interrupted by a crash or redeploy resumes after its last completed
+    stage instead of repeating LLM calls. Workers claim jobs with a lease that
+    they renew while working; a job whose lease expires is claimed again.
+    Submissions are deduplicated by file hash; resubmitting a finished job
+    whose extraction is older than the extraction cache TTL or came from
+    another prompt version re-runs it from the extracted text, and one scored
+    under other rules is re-scored. The upload bytes are dropped once the text
+    is extracted, and finished jobs are pruned after `retention_seconds`.
+    """
+
+    def __init__(self, path: str = JOB_QUEUE_PATH, lease_seconds: float = JOB_LEASE_SECONDS,
+                 max_attempts: int = JOB_MAX_ATTEMPTS, retry_delay: float = JOB_RETRY_DELAY_SECONDS,
+                 retention_seconds: float = JOB_RETENTION_SECONDS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_prune = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    file_hash TEXT NOT NULL UNIQUE,
+                    file_name TEXT NOT NULL,
+                    data BLOB,
+                    stage TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    available_at REAL NOT NULL,
+                    cv_text TEXT,
+                    resume_json TEXT,
+                    analysis_json TEXT,
+                    scores_json TEXT,
+                    result_json TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    prompt_version TEXT,
+                    rules_version TEXT,
+                    extracted_at REAL,
+                    text_version TEXT
+                )
+                """
+            )
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in _ADDED_COLUMNS.items():
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, available_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs (status, updated_at)")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS batch_items (
+                    batch_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    job_id TEXT NOT NULL,
+                    file_name TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (batch_id, position)
+                )
+                """
+            )
+        return self._conn
+
+    def submit(self, data: bytes, file_name: str) -> QueuedJob:
+        """
+        Queue an upload, or return the existing job for the same file. A job
+        that gave up is queued again and resumes from the stage it reached; a
+        finished job whose artifacts are stale resumes from the first stale one.
+        """
+        file_hash = sha256_bytes(data)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id, status, stage, cv_text IS NOT NULL, prompt_version, rules_version, extracted_at, text_version "
+                    "FROM jobs WHERE file_hash = ?",
+                    (file_hash,)
+                ).fetchone()
+                if row is None:
+                    job_id = uuid.uuid4().hex
+                    conn.execute(
+                        "INSERT INTO jobs (id, file_hash, file_name, data, stage, status, available_at, created_at, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (job_id, file_hash, file_name, data, STAGE_QUEUED, PENDING, now, now, now)
+                    )
+                else:
+                    job_id, status, stage = row[0], row[1], row[2]
+                    resume_from = self._resume_stage(stage, *row[3:], now=now)
+                    if status == ERROR or (status == DONE and resume_from != stage):
+                        # The upload bytes are only needed to extract the text again.
+                        conn.execute(
+                            "UPDATE jobs SET stage = ?, status = ?, attempts = 0, error = NULL, result_json = NULL, "
+                            "available_at = ?, updated_at = ?, data = COALESCE(data, ?) WHERE id = ?",
+                            (resume_from, PENDING, now, now, data if resume_from == STAGE_QUEUED else None, job_id)
+                        )
+                    elif status == PENDING:
+                        # A resubmission skips the retry delay of a failed attempt.
+                        conn.execute("UPDATE jobs SET available_at = MIN(available_at, ?) WHERE id = ?", (now, job_id))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            if now - self._last_prune >= JOB_PRUNE_INTERVAL_SECONDS:
+                self._last_prune = now
+                self._prune_locked(now)
+        return self.get(job_id)
+
+    def _resume_stage(self, stage: str, has_text: bool, prompt_version: Optional[str],
+                      rules_version: Optional[str], extracted_at: Optional[float],
+                      text_version: Optional[str], now: float) -> str:
+        """
+        The last stage whose artifacts are still current: text from other PDF
+        text settings falls back to the upload, an extraction from another
+        prompt version or older than the extraction cache TTL falls back to the
+        text (or the upload, if there is no text), and scores under other rules
+        fall back to the extraction.
+        """
+        position = STAGES.index(stage)
+        if position >= STAGES.index(STAGE_TEXT) and text_version != pdf_text_version():
+            return STAGE_QUEUED
+        if position >= STAGES.index(STAGE_EXTRACTED):
+            expired = extracted_at is None or now - extracted_at > EXTRACTION_CACHE_TTL_SECONDS
+            if expired or prompt_version != extraction_prompt_version():
+                return STAGE_TEXT if has_text else STAGE_QUEUED
+        if position >= STAGES.index(STAGE_SCORED) and rules_version != scoring_rules_version():
+            return STAGE_EXTRACTED
+        return stage
+
+    def prune(self) -> int:
+        """
+        Delete finished jobs last updated more than retention_seconds ago,
+        except those listed in a batch; returns how many were deleted.
+        """
+        with self._lock:
+            return self._prune_locked(time.time())
+
+    def _prune_locked(self, now: float) -> int:
+        cursor = self._connect().execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ? "
+            "AND id NOT IN (SELECT job_id FROM batch_items)",
+            (DONE, ERROR, now - self.retention_seconds)
+        )
+        if cursor.rowcount:
+            logger.info(f"Pruned {cursor.rowcount} finished jobs")
+        return cursor.rowcount
+
+    def get(self, job_id: str) -> Optional[QueuedJob]:
+        with self._lock:
+            row = self._connect().execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return QueuedJob.from_row(row) if row else None
+
+    def get_many(self, job_ids: List[str]) -> Dict[str, QueuedJob]:
+        if not job_ids:
+            return {}
+        with self._lock:
+            placeholders = ",".join("?" * len(job_ids))
+            rows = self._connect().execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE id IN ({placeholders})", tuple(job_ids)
+            ).fetchall()
+        return {row[0]: QueuedJob.from_row(row) for row in rows}
+
+    def claim(self, owner: str, job_id: Optional[str] = None) -> Optional[QueuedJob]:
+        """
+        Lease the oldest runnable job (or the given one): pending and due, or
+        running with an expired lease. Returns None when nothing is claimable.
+        """
+        now = time.time()
+        condition = "((status = ? AND available_at <= ?) OR (status = ? AND lease_expires < ?))"
+        params: tuple = (PENDING, now, RUNNING, now)
+        if job_id is not None:
+            condition += " AND id = ?"
+            params += (job_id,)
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    f"SELECT id FROM jobs WHERE {condition} ORDER BY created_at LIMIT 1", params
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                        "updated_at = ? WHERE id = ?",
+                        (RUNNING, owner, now + self.lease_seconds, now, row[0])
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return self.get(row[0]) if row else None
+
+    def data(self, job_id: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._connect().execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def _update_leased(self, job_id: str, owner: str, assignments: str, params: tuple) -> bool:
+        with self._lock:
+            cursor = self._connect().execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ? AND lease_owner = ? AND status = ?",
+                params + (time.time(), job_id, owner, RUNNING)
+            )
+        return cursor.rowcount == 1
+
+    def renew(self, job_id: str, owner: str) -> bool:
+        """
+        Extend a lease; False when the lease was lost to another worker.
+        """
+        return self._update_leased(job_id, owner, "lease_expires = ?", (time.time() + self.lease_seconds,))
+
+    def save_stage(self, job: QueuedJob, owner: str, stage: str) -> bool:
+        """
+        Persist the job's artifacts and mark `stage` completed, renewing the lease.
+        """
+        assignments = (
+            "stage = ?, cv_text = ?, resume_json = ?, analysis_json = ?, scores_json = ?, result_json = ?, "
+            "prompt_version = ?, rules_version = ?, extracted_at = ?, text_version = ?, lease_expires = ?"
+        )
+        params = (
+            stage,
+            job.cv_text,
+            json.dumps(job.resume.dict(), ensure_ascii=False) if job.resume is not None else None,
+            json.dumps(job.analysis, ensure_ascii=False) if job.analysis else None,
+            json.dumps(job.score_result, ensure_ascii=False) if job.score_result is not None else None,
+            json.dumps(job.result, ensure_ascii=False) if job.result is not None else None,
+            job.prompt_version,
+            job.rules_version,
+            job.extracted_at,
+            job.text_version,
+            time.time() + self.lease_seconds,
+        )
+        if stage != STAGE_QUEUED:
+            # Every later stage starts from the text, so the upload is no longer needed.
+            assignments += ", data = NULL"
+        if stage == STAGE_DONE:
+            assignments += ", status = ?, lease_owner = NULL, lease_expires = NULL"
+            params += (DONE,)
+        saved = self._update_leased(job.id, owner, assignments, params)
+        if saved:
+            job.stage = stage
+            if stage == STAGE_DONE:
+                job.status = DONE
+        return saved
+
+    def fail(self, job: QueuedJob, owner: str, error: str) -> None:
+        """
+        Record a failed attempt: retry later, or give up after max_attempts.
+        """
+        if job.attempts >= self.max_attempts:
+            self._update_leased(
+                job.id, owner, "status = ?, error = ?, lease_owner = NULL, lease_expires = NULL", (ERROR, error)
+            )
+        else:
+            self._update_leased(
+                job.id, owner, "status = ?, error = ?, available_at = ?, lease_owner = NULL, lease_expires = NULL",
+                (PENDING, error, time.time() + self.retry_delay * job.attempts)
+            )
+
+    def add_batch(self, batch_id: str, jobs: List[QueuedJob], file_names: List[str]) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    "INSERT INTO batch_items VALUES (?, ?, ?, ?, ?)",
+                    [(batch_id, i, job.id, name, now) for i, (job, name) in enumerate(zip(jobs, file_names))]
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def batch(self, batch_id: str) -> List[tuple]:
+        """
+        Return (file_name, job_id, created_at) for each file of a batch, in submission order.
+        """
+        with self._lock:
+            return self._connect().execute(
+                "SELECT file_name, job_id, created_at FROM batch_items WHERE batch_id = ? ORDER BY position",
+                (batch_id,)
+            ).fetchall()
+
+    def trim_batches(self, keep: int) -> None:
+        """
+        Forget all but the newest `keep` batches; their jobs (and results) are kept.
+        """
+        with self._lock:
+            self._connect().execute(
+                "DELETE FROM batch_items WHERE batch_id NOT IN ("
+                "SELECT batch_id FROM batch_items GROUP BY batch_id ORDER BY MAX(created_at) DESC LIMIT ?)",
+                (keep,)
+            )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+# Singleton instance
+job_queue = JobQueue()
+
+class JobWorker:
+    """
+    Runs queued jobs on the event loop, up to `concurrency` at a time.
+
+    start() launches a polling loop that also picks up jobs left behind by a
+    crashed process once their lease expires; run_job() processes one job
+    inline (as /api/evaluate-cv does) while still holding a lease, so an
+    interrupted request is finished by the polling loop later.
+    """
+
+    def __init__(self, queue: Optional[JobQueue] = None, concurrency: int = JOB_WORKER_CONCURRENCY,
+                 poll_interval: float = JOB_POLL_INTERVAL_SECONDS):
+        self.queue = queue or job_queue
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._running: set = set()
+
+    def start(self) -> None:
+        """
+        Start the polling loop on the running event loop, if not already running there.
+        """
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._task = loop.create_task(self._poll())
+
+    async def stop(self) -> None:
+        if self._task is not None and self._loop is asyncio.get_running_loop():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _poll(self) -> None:
+        while True:
+            await self._semaphore.acquire()
+            try:
+                job = await asyncio.to_thread(self.queue.claim, self.owner)
+            except Exception as e:
+                logger.error(f"Claiming a job failed: {str(e)}")
+                job = None
+            if job is None:
+                self._semaphore.release()
+                await asyncio.sleep(self.poll_interval)
+                continue
+            task = asyncio.create_task(self._process_and_release(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _process_and_release(self, job: QueuedJob) -> None:
+        try:
+            await self.process(job)
+        finally:
+            self._semaphore.release()
+
+    async def run_job(self, job_id: str, timeout: Optional[float] = None) -> QueuedJob:
+        """
+        Process a job now if it is claimable, otherwise wait for whoever holds it.
+        """
+        job = await asyncio.to_thread(self.queue.claim, self.owner, job_id)
+        if job is not None:
+            return await self.process(job)
+        return await self.wait(job_id, timeout)
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> QueuedJob:
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            job = await asyncio.to_thread(self.queue.get, job_id)
+            if job is None or job.finished:
+                return job
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Job {job_id} did not finish in {timeout} seconds")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            if not await asyncio.to_thread(self.queue.renew, job_id, self.owner):
+                logger.warning(f"Lost the lease on job {job_id}")
+                return
+
+    async def process(self, job: QueuedJob) -> QueuedJob:
+        """
+        Run the stages after job.stage, saving artifacts after each one.
+        """
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            await self._run_stages(job)
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.file_name}) failed at stage {job.stage}: {str(e)}")
+            await asyncio.to_thread(self.queue.fail, job, self.owner, str(e))
+        finally:
+            heartbeat.cancel()
+        return await asyncio.to_thread(self.queue.get, job.id)
+
+    async def _save(self, job: QueuedJob, stage: str) -> None:
+        if not await asyncio.to_thread(self.queue.save_stage, job, self.owner, stage):
+            raise RuntimeError(f"Lease on job {job.id} was lost before saving stage {stage}")
+
+    async def _run_stages(self, job: QueuedJob) -> None:
+        prompt_version = extraction_prompt_version()
+        if job.stage == STAGE_QUEUED:
+            cached = await asyncio.to_thread(_cache_lookup, job.file_hash, prompt_version)
+            if cached is not None:
+                job.cv_text, job.resume, job.analysis = cached.cv_text, cached.resume, cached.analysis
+                job.prompt_version, job.extracted_at = prompt_version, time.time()
+                job.text_version = pdf_text_version()
+                await self._save(job, STAGE_EXTRACTED)
+            else:
+                data = await asyncio.to_thread(self.queue.data, job.id)
+                job.cv_text = await extract_text_cached_async(data, job.file_name, job.file_hash)
+                job.text_version = pdf_text_version()
+                await self._save(job, STAGE_TEXT)
+
+        if job.stage == STAGE_TEXT:
+            duplicate = await self._near_duplicate(job)
+            if duplicate is not None and near_duplicates.policy == "reuse_result" and await self._reuse_result(job, duplicate):
+                return
+            cached = None
+            if duplicate is not None and near_duplicates.policy == "reuse_extraction":
+                cached = await asyncio.to_thread(_cache_lookup, duplicate.file_hash, prompt_version)
+            if cached is not None:
+                job.resume, job.analysis = cached.resume, cached.analysis
+            else:
+                job.resume, job.analysis = await analyze_text_async(job.cv_text, job.file_hash, prompt_version)
+            job.prompt_version, job.extracted_at = prompt_version, time.time()
+            await self._save(job, STAGE_EXTRACTED)
+
+        if job.stage == STAGE_EXTRACTED:
+            job.score_result = await score_resume_async(job.resume)
+            job.rules_version = scoring_rules_version()
+            await self._save(job, STAGE_SCORED)
+
+        if job.stage == STAGE_SCORED:
+            with stage_span("reasoning"):
+                ai_reason = await status_reason_async(job.resume, job.score_result, job.analysis)
+            job.result = build_evaluation_result(job.file_name, job.resume, job.score_result, ai_reason)
+            duplicate = await self._near_duplicate(job, count=False) if job.cv_text else None
+            if duplicate is not None:
+                job.result["near_duplicate_of"] = {"file_hash": duplicate.file_hash, "similarity": duplicate.similarity}
+            await self._save(job, STAGE_DONE)
+            await asyncio.to_thread(result_store.save, job.result, job.file_hash)
+            # Extractions that fell back to the default structure carry no
+            # analysis; they are not worth matching later uploads against.
+            if duplicate is None and job.cv_text and job.analysis:
+                await asyncio.to_thread(near_duplicates.add, job.file_hash, job.cv_text)
+
+    async def _near_duplicate(self, job: QueuedJob, count: bool = True) -> Optional[NearDuplicate]:
+        with stage_span("near_duplicate"):
+            duplicate = await asyncio.to_thread(near_duplicates.find, job.cv_text, exclude=job.file_hash)
+        if duplicate is not None and count:
+            NEAR_DUPLICATES.inc(policy=near_duplicates.policy)
+            logger.info(f"{job.file_name} is a near duplicate of {duplicate.file_hash} ({duplicate.similarity:.2f})")
+        return duplicate
+
+    async def _reuse_result(self, job: QueuedJob, duplicate: NearDuplicate) -> bool:
+        """
+        Finish the job with the earlier CV's result; False when that result is
+        not stored or its contact details are not in this CV's text. The
+        borrowed result stays on the job only: it is not saved to the result
+        store under this file's hash.
+        """
+        earlier = await asyncio.to_thread(result_store.get, duplicate.file_hash)
+        if earlier is None or not same_contact(earlier.get("cv_data") or {}, job.cv_text):
+            return False
+        job.result = {
+            **earlier,
+            "file_name": job.file_name,
+            "near_duplicate_of": {"file_hash": duplicate.file_hash, "file_name": earlier.get("file_name"), "similarity": duplicate.similarity},
+        }
+        await self._save(job, STAGE_DONE)
+        return True
+
+# Singleton instance
+job_worker = JobWorker()
@@ -0,0 +1,153 @@
+import asyncio
+import io
+import logging
+import os
+import uuid
+import zipfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.modules.batch.job_queue import (
+    DONE,
+    ERROR,
+    RUNNING,
+    STAGE_QUEUED,
+    JobQueue,
+    JobWorker,
+    QueuedJob,
+    job_worker,
+)
+from app.utils.uploads import MAX_UPLOAD_BYTES
+
+logger = logging.getLogger(__name__)
+
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+BATCH_MAX_JOBS = int(os.getenv("BATCH_MAX_JOBS", "100"))
+
+# A batch item is a file name plus a loader that produces its bytes; zip
+# members are decompressed one at a time as they are queued.
+BatchItem = Tuple[str, Callable[[], bytes]]
+
+@dataclass
+class FileResult:
+    file_name: str
+    status: str = "pending"  # pending, processing, done, error
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+@dataclass
+class BatchJob:
+    id: str
+    files: List[FileResult]
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    finished_at: Optional[str] = None
+
+    @property
+    def status(self) -> str:
+        if self.finished_at:
+            return "completed"
+        if any(f.status != "pending" for f in self.files):
+            return "running"
+        return "queued"
+
+    def to_dict(self) -> Dict[str, Any]:
+        completed = sum(1 for f in self.files if f.status in ("done", "error"))
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "total": len(self.files),
+            "completed": completed,
+            "failed": sum(1 for f in self.files if f.status == "error"),
+            "progress": completed / len(self.files) if self.files else 1.0,
+            "results": [
+                {"file_name": f.file_name, "status": f.status, "result": f.result, "error": f.error}
+                for f in self.files
+            ],
+        }
+
+def iter_zip_members(data: bytes, max_member_bytes: int = MAX_UPLOAD_BYTES) -> List[BatchItem]:
+    """
+    List the PDF members of a zip archive held in memory. Nothing is extracted
+    to disk; each member is decompressed when its loader is called.
+    """
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    items: List[BatchItem] = []
+    for info in archive.infolist():
+        name = info.filename
+        if info.is_dir() or not name.lower().endswith(".pdf") or "__MACOSX" in name:
+            continue
+        if info.file_size > max_member_bytes:
+            raise ValueError(f"Archive member {name} exceeds the {max_member_bytes} byte limit")
+        items.append((os.path.basename(name), lambda info=info: archive.read(info)))
+    return items
+
+class BatchJobManager:
+    """
+    Batch jobs on top of the durable job queue: each file becomes (or reuses)
+    a queued job, and a batch is the ordered list of those jobs, so progress
+    and results survive restarts.
+    """
+
+    def __init__(self, max_concurrency: int = BATCH_MAX_CONCURRENCY, max_jobs: int = BATCH_MAX_JOBS,
+                 worker: Optional[JobWorker] = None):
+        self.max_concurrency = max_concurrency
+        self.max_jobs = max_jobs
+        self.worker = worker or JobWorker(concurrency=max_concurrency)
+
+    @property
+    def queue(self) -> JobQueue:
+        return self.worker.queue
+
+    async def submit(self, items: List[BatchItem]) -> BatchJob:
+        """
+        Queue every file of a batch and make sure the worker is running.
+        Decompressing, hashing and the queue writes run on a worker thread.
+        """
+        batch_id = uuid.uuid4().hex
+        await asyncio.to_thread(self._queue_batch, batch_id, items)
+        self.worker.start()
+        return await asyncio.to_thread(self.get, batch_id)
+
+    def _queue_batch(self, batch_id: str, items: List[BatchItem]) -> None:
+        names = [name for name, _ in items]
+        jobs = [self.queue.submit(loader(), name) for name, loader in items]
+        self.queue.add_batch(batch_id, jobs, names)
+        self.queue.trim_batches(self.max_jobs)
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        rows = self.queue.batch(job_id)
+        if not rows:
+            return None
+        queued = self.queue.get_many([queued_id for _, queued_id, _ in rows])
+        files = [_file_result(name, queued.get(queued_id)) for name, queued_id, _ in rows]
+        created_at = datetime.fromtimestamp(rows[0][2]).isoformat()
+        finished_at = None
+        if all(f.status in ("done", "error") for f in files):
+            finished = max((queued[queued_id].updated_at for _, queued_id, _ in rows if queued_id in queued), default=rows[0][2])
+            finished_at = datetime.fromtimestamp(finished).isoformat()
+        return BatchJob(id=job_id, files=files, created_at=created_at, finished_at=finished_at)
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> None:
+        """
+        Wait until a job has finished; mainly useful for tests and scripts.
+        """
+        for _, queued_id, _ in await asyncio.to_thread(self.queue.batch, job_id):
+            await self.worker.wait(queued_id, timeout)
+
+def _file_result(file_name: str, job: Optional[QueuedJob]) -> FileResult:
+    if job is None:
+        return FileResult(file_name=file_name, status="error", error="Job record missing")
+    if job.status == DONE:
+        # Duplicate uploads share a job; report the name used in this batch.
+        return FileResult(file_name=file_name, status="done", result={**job.result, "file_name": file_name})
+    if job.status == ERROR:
+        return FileResult(file_name=file_name, status="error", error=job.error)
+    if job.status == RUNNING or job.stage != STAGE_QUEUED:
+        return FileResult(file_name=file_name, status="processing")
+    return FileResult(file_name=file_name)
+
+# Singleton instance
+batch_jobs = BatchJobManager(worker=job_worker)
@@ -0,0 +1,181 @@
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List
+
+try:
+    import tiktoken
+except ImportError:  # optional: fall back to a character/word heuristic
+    tiktoken = None
+
+EXTRACTION_INPUT_TOKEN_BUDGET = int(os.getenv("EXTRACTION_INPUT_TOKEN_BUDGET", "6000"))
+EXTRACTION_CHUNK_TOKENS = int(os.getenv("EXTRACTION_CHUNK_TOKENS", "4000"))
+# Bump when compaction output changes so cached extractions are not reused.
+COMPACTION_VERSION = 2
+
+PAGE_BREAK = "\f"
+# Appended to each extracted PDF page, so the last line of a page never runs into the next.
+PAGE_SUFFIX = "\n" + PAGE_BREAK
+HEADER_MAX_CHARS = 100
+HEADER_LINES = 2
+
+_encoding = None
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens with tiktoken when installed, otherwise estimate: the larger of
+    chars / 4 and 1.3 tokens per word, which errs high for Vietnamese text.
+    """
+    global _encoding
+    if tiktoken is not None:
+        if _encoding is None:
+            try:
+                _encoding = tiktoken.get_encoding("o200k_base")
+            except Exception:
+                _encoding = tiktoken.get_encoding("cl100k_base")
+        return len(_encoding.encode(text, disallowed_special=()))
+    return int(max(len(text) / 4, len(text.split()) * 1.3))
+
+def _line_signature(line: str) -> str:
+    # Page numbers differ between pages: "Page 2 of 5" and "Page 3 of 5" are the same footer.
+    return re.sub(r"\d+", "#", line.lower())
+
+def _edge_lines(page: List[str]) -> List[int]:
+    # Positions of the first and last HEADER_LINES non-empty lines of a page.
+    filled = [i for i, line in enumerate(page) if line]
+    return sorted(set(filled[:HEADER_LINES] + filled[-HEADER_LINES:]))
+
+def compact_cv_text(text: str) -> str:
+    """
+    Shrink CV text before it is sent to the model: collapse runs of spaces and
+    blank lines, and drop short lines at the top or bottom of a page that
+    repeat on most pages (headers, footers, page numbers). The first
+    occurrence of each is kept, since running headers often carry the
+    candidate's name and contact details. Pages are separated by form feeds.
+    """
+    pages = [
+        [" ".join(line.split()) for line in page.splitlines()]
+        for page in text.split(PAGE_BREAK)
+    ]
+    if len(pages) > 1:
+        seen_on = Counter()
+        for page in pages:
+            seen_on.update({
+                _line_signature(page[i]) for i in _edge_lines(page) if len(page[i]) <= HEADER_MAX_CHARS
+            })
+        threshold = max(2, math.ceil(len(pages) / 2))
+        repeated = {signature for signature, count in seen_on.items() if count >= threshold}
+        kept = set()
+        for page in pages:
+            for i in _edge_lines(page):
+                signature = _line_signature(page[i])
+                if signature not in repeated:
+                    continue
+                if signature in kept:
+                    page[i] = ""
+                else:
+                    kept.add(signature)
+
+    lines: List[str] = []
+    for page in pages:
+        for line in page:
+            if line or (lines and lines[-1]):
+                lines.append(line)
+    return "\n".join(lines).strip()
+
+def split_into_chunks(text: str, max_tokens: int = None) -> List[str]:
+    """
+    Split text into chunks of at most max_tokens, breaking at blank lines where
+    possible and at line ends otherwise, so CV sections stay together.
+    """
+    max_tokens = max_tokens or EXTRACTION_CHUNK_TOKENS
+    if count_tokens(text) <= max_tokens:
+        return [text]
+    blocks = [block for block in re.split(r"\n\s*\n", text) if block.strip()]
+    pieces: List[str] = []
+    for block in blocks:
+        if count_tokens(block) <= max_tokens:
+            pieces.append(block)
+            continue
+        pieces.extend(line for line in block.splitlines() if line.strip())
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for piece in pieces:
+        piece_tokens = count_tokens(piece)
+        if current and current_tokens + piece_tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += piece_tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+LIST_KEYS = {
+    "education": ("school", "major"),
+    "professional_experience": ("company", "position", "duration"),
+    "projects": ("name",),
+    "awards": ("contest", "prize"),
+    "certifications": ("name",),
+}
+EMPTY_VALUES = ("", "Unknown", None, "No introduction provided.")
+
+def _identity(item: Dict[str, Any], fields: tuple) -> str:
+    return json.dumps([" ".join(str(item.get(field) or "").lower().split()) for field in fields])
+
+def merge_extractions(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge per-chunk extraction results into one, in chunk order.
+
+    Scalar fields keep the first non-empty value, list sections are
+    concatenated without duplicates, skills are unioned per group, and each
+    scoring recommendation keeps the highest score seen for that category.
+    The summary and evaluation come from the first chunk.
+    """
+    merged_data: Dict[str, Any] = {}
+    skills: Dict[str, List[str]] = {}
+    seen: Dict[str, set] = {key: set() for key in LIST_KEYS}
+    for result in results:
+        for key, value in (result.get("extracted_data") or {}).items():
+            if key in LIST_KEYS:
+                items = merged_data.setdefault(key, [])
+                for item in value or []:
+                    if not isinstance(item, dict):
+                        continue
+                    identity = _identity(item, LIST_KEYS[key])
+                    if identity not in seen[key]:
+                        seen[key].add(identity)
+                        items.append(item)
+            elif key == "skills":
+                for group in value or []:
+                    if not isinstance(group, dict) or group.get("name") in EMPTY_VALUES:
+                        continue
+                    names = skills.setdefault(group["name"], [])
+                    names.extend(skill for skill in group.get("list") or [] if skill not in names)
+            elif key == "social":
+                social = merged_data.setdefault("social", [])
+                social.extend(link for link in value or [] if link not in social)
+            elif merged_data.get(key) in EMPTY_VALUES and value not in EMPTY_VALUES:
+                merged_data[key] = value
+            else:
+                merged_data.setdefault(key, value)
+    if skills:
+        merged_data["skills"] = [{"name": name, "list": names} for name, names in skills.items()]
+
+    merged = dict(results[0])
+    merged["extracted_data"] = merged_data
+    recommendations: Dict[str, Any] = {}
+    for result in results:
+        for category, recommendation in (result.get("scoring_recommendations") or {}).items():
+            best = recommendations.get(category)
+            try:
+                if best is None or float(recommendation.get("score", 0)) > float(best.get("score", 0)):
+                    recommendations[category] = recommendation
+            except (TypeError, ValueError, AttributeError):
+                recommendations.setdefault(category, recommendation)
+    merged["scoring_recommendations"] = recommendations
+    return merged
@@ -1,18 +1,166 @@
 from app.models.resume import Resume, EducationItem, ProfessionalExperienceItem, ProjectItem, AwardItem, CertificationItem, SkillItem
-from .ocr import extract_structured_data_from_cv, create_default_structure
-from typing import Dict, Any
+from app.utils.worker_pool import run_in_worker
+from app.utils.extraction_cache import extraction_cache, sha256_bytes, sha256_file
+from app.utils.metrics import EXTRACTION_CACHE, record_fallback, record_stage, stage_span
+from .pdf_text import extract_pdf_text, pdf_text_version
+from .compaction import PAGE_SUFFIX
+from .ocr import (
+    extract_structured_data_from_cv,
+    stream_structured_data_from_cv_async,
+    extract_structured_data_from_cv_async,
+    create_default_structure,
+    extraction_prompt_version,
+    is_default_structure,
+)
+from typing import Dict, Any, AsyncIterator, Tuple
+from pathlib import Path
+import asyncio
+import io
+import time
+
+ANALYSIS_KEYS = ("summary", "evaluation", "scoring_recommendations")
 
 def extract_resume(file_path: str) -> Resume:
     """
     Extract structured data from a CV and return a Resume object.
+    Repeat uploads of the same file are served from the extraction cache.
     """
+    file_hash = sha256_file(file_path)
+    prompt_version = extraction_prompt_version()
+    cached = _cache_lookup(file_hash, prompt_version)
+    if cached is not None:
+        return cached.resume
+
     # Extract raw text from the CV (assuming extract_text_from_cv is defined elsewhere)
-    cv_text = extract_text_from_cv(file_path)
+    with stage_span("text_extraction"):
+        cv_text = extraction_cache.get_text(file_hash, pdf_text_version()) or extract_text_from_cv(file_path)
 
     # Get structured data and analysis from the LLM
-    result = extract_structured_data_from_cv(cv_text)
-    structured_data = result.get("extracted_data", {})
+    with stage_span("extraction"):
+        result = extract_structured_data_from_cv(cv_text)
+    resume = _build_checked(result)
+    if not is_default_structure(result):
+        extraction_cache.put(file_hash, prompt_version, cv_text, resume, extraction_analysis(result), pdf_text_version())
+    return resume
+
+async def extract_resume_async(file_path: str) -> Resume:
+    """
+    Async variant of extract_resume: text extraction runs on the worker pool and
+    the LLM call is awaited, so neither blocks the event loop.
+    """
+    data = await asyncio.to_thread(Path(file_path).read_bytes)
+    return await extract_resume_from_bytes_async(data, file_path)
+
+async def extract_resume_from_bytes_async(data: bytes, file_name: str) -> Resume:
+    """
+    Extract a Resume from an in-memory upload; file_name only selects the parser.
+    """
+    resume, _ = await extract_analysis_from_bytes_async(data, file_name)
+    return resume
+
+async def extract_analysis_from_bytes_async(data: bytes, file_name: str) -> Tuple[Resume, Dict[str, Any]]:
+    """
+    Like extract_resume_from_bytes_async, but also return the summary, evaluation
+    and scoring recommendations the extraction call produced alongside the data.
+    """
+    file_hash = await asyncio.to_thread(sha256_bytes, data)
+    prompt_version = extraction_prompt_version()
+    cached = await asyncio.to_thread(_cache_lookup, file_hash, prompt_version)
+    if cached is not None:
+        return cached.resume, cached.analysis
+
+    cv_text = await extract_text_cached_async(data, file_name, file_hash)
+    return await analyze_text_async(cv_text, file_hash, prompt_version)
+
+async def extract_text_cached_async(data: bytes, file_name: str, file_hash: str) -> str:
+    """
+    The upload's text, reused from the extraction cache when an earlier extraction stored it.
+    """
+    with stage_span("text_extraction"):
+        cached_text = await asyncio.to_thread(extraction_cache.get_text, file_hash, pdf_text_version())
+        return cached_text or await run_in_worker(extract_text_from_bytes, data, file_name)
+
+async def analyze_text_async(cv_text: str, file_hash: str, prompt_version: str) -> Tuple[Resume, Dict[str, Any]]:
+    """
+    Run the extraction call on CV text and cache the result unless it fell back to the default structure.
+    """
+    with stage_span("extraction"):
+        result = await extract_structured_data_from_cv_async(cv_text)
+    resume = _build_checked(result)
+    analysis = extraction_analysis(result)
+    if not is_default_structure(result):
+        await asyncio.to_thread(
+            extraction_cache.put, file_hash, prompt_version, cv_text, resume, analysis, pdf_text_version()
+        )
+    return resume, analysis
 
+def _cache_lookup(file_hash: str, prompt_version: str):
+    with stage_span("cache_lookup"):
+        cached = extraction_cache.get(file_hash, prompt_version)
+    EXTRACTION_CACHE.inc(result="miss" if cached is None else "hit")
+    return cached
+
+def _build_checked(result: Dict[str, Any]) -> Resume:
+    # Build the Resume, counting extractions that fell back to the default structure.
+    if is_default_structure(result):
+        record_fallback("default_structure")
+    with stage_span("build_resume"):
+        return build_resume(result.get("extracted_data", {}))
+
+def extraction_analysis(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The parts of an extraction result besides the resume data; empty for the default structure.
+    """
+    if is_default_structure(result):
+        return {}
+    return {key: result[key] for key in ANALYSIS_KEYS if key in result}
+
+async def stream_resume_from_bytes_async(data: bytes, file_name: str) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Streaming variant of extract_resume_from_bytes_async. Yields
+    ("section", (name, value)) for each extracted_data member as soon as it is
+    complete, then ("analysis", dict) and ("resume", Resume). Cache hits replay
+    the cached sections.
+    """
+    file_hash = await asyncio.to_thread(sha256_bytes, data)
+    prompt_version = extraction_prompt_version()
+    cached = await asyncio.to_thread(_cache_lookup, file_hash, prompt_version)
+    if cached is not None:
+        for name, value in cached.resume.dict().items():
+            yield "section", (name, value)
+        yield "analysis", cached.analysis
+        yield "resume", cached.resume
+        return
+
+    cv_text = await extract_text_cached_async(data, file_name, file_hash)
+    result: Dict[str, Any] = {}
+    # Timed by hand: a stage_span cannot be held across the yields below.
+    start = time.perf_counter()
+    failed = False
+    try:
+        async for path, value in stream_structured_data_from_cv_async(cv_text):
+            if path == ():
+                result = value
+            elif path[0] == "extracted_data":
+                yield "section", (path[1], value)
+    except Exception:
+        failed = True
+        raise
+    finally:
+        record_stage("extraction", time.perf_counter() - start, failed)
+    resume = _build_checked(result)
+    analysis = extraction_analysis(result)
+    if not is_default_structure(result):
+        await asyncio.to_thread(
+            extraction_cache.put, file_hash, prompt_version, cv_text, resume, analysis, pdf_text_version()
+        )
+    yield "analysis", analysis
+    yield "resume", resume
+
+def build_resume(structured_data: Dict[str, Any]) -> Resume:
+    """
+    Build a Resume object from the "extracted_data" part of the LLM response.
+    """
     # Convert numeric fields in education (e.g., GPA) so that scoring functions receive numbers.
     education_items = structured_data.get("education", [])
     for edu in education_items:
@@ -54,17 +202,33 @@ def extract_text_from_cv(file_path: str) -> str:
         with open(file_path, "r") as file:
             return file.read()
 
+def extract_text_from_bytes(data: bytes, file_name: str) -> str:
+    """
+    Extract raw text from an in-memory CV (PDF or DOCX) without touching disk.
+    """
+    lowered = file_name.lower()
+    if lowered.endswith(".pdf"):
+        return extract_text_from_pdf_bytes(data)
+    elif lowered.endswith(".docx"):
+        from docx import Document
+        doc = Document(io.BytesIO(data))
+        return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
+    else:
+        # Assume it's a plain text file
+        return bytes(data).decode("utf-8", errors="replace")
+
+def extract_text_from_pdf_bytes(data: bytes) -> str:
+    """
+    Extract text from PDF bytes held in memory.
+    """
+    return extract_pdf_text(data, page_suffix=PAGE_SUFFIX).text
+
 def extract_text_from_pdf(file_path: str) -> str:
     """
     Extract text from a PDF file.
     """
-    import PyPDF2
     with open(file_path, "rb") as file:
-        reader = PyPDF2.PdfReader(file)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text()
-        return text
+        return extract_pdf_text(file.read(), page_suffix=PAGE_SUFFIX).text
 
 def extract_text_from_docx(file_path: str) -> str:
     """
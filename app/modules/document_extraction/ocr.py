@@ -2,18 +2,32 @@ from openai import OpenAI
 from dotenv import load_dotenv
 import os, json, openai
 from app.models.resume import Resume, EducationItem, ProfessionalExperienceItem, ProjectItem, AwardItem, CertificationItem, SkillItem
-from typing import Dict, Any, List
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 import logging
 from pathlib import Path
 import PyPDF2
 from pydantic import ValidationError
+from app.utils.metrics import stage_label
 from app.utils.openai_client import openai_client
+from app.modules.document_extraction.pdf_text import extract_pdf_text, pdf_text_version
+from app.modules.document_extraction.streaming import IncrementalJSONParser
+from app.modules.document_extraction.compaction import (
+    COMPACTION_VERSION, EXTRACTION_CHUNK_TOKENS, EXTRACTION_INPUT_TOKEN_BUDGET, PAGE_SUFFIX,
+    compact_cv_text, count_tokens, merge_extractions, split_into_chunks
+)
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+from app.models.scoring_rules import SCORING_RULES
+import hashlib
 
 load_dotenv()
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
 logger = logging.getLogger(__name__)
 
+EXTRACTION_MODEL = "gpt-4o"
+EXTRACTION_MAX_TOKENS = 3000
+
 def extract_resume(file_path: str) -> Resume:
     """
     Extract resume data from a PDF file and return a validated Resume object.
@@ -117,19 +131,12 @@ def extract_text_from_cv(file_path: str) -> str:
             raise ValueError("File must be a PDF")
             
         with open(file_path, "rb") as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                try:
-                    text += page.extract_text() + "\n"
-                except Exception as e:
-                    logger.warning(f"Error extracting text from page: {str(e)}")
-                    continue
-                    
-            if not text.strip():
-                raise ValueError("No text could be extracted from the PDF")
-                
-            return text
+            text = extract_pdf_text(file.read(), page_suffix=PAGE_SUFFIX).text
+            
+        if not text.strip():
+            raise ValueError("No text could be extracted from the PDF")
+            
+        return text
                 
     except Exception as e:
         logger.error(f"Error extracting text from PDF: {str(e)}")
@@ -166,12 +173,33 @@ def create_default_structure() -> Dict[str, Any]:
         }
     }
 
-def extract_structured_data_from_cv(cv_text: str) -> Dict[str, Any]:
+def is_default_structure(structured_data: Dict[str, Any]) -> bool:
     """
-    Extract structured data, summary, and evaluation from CV text using a single OpenAI API call.
+    Check whether an extraction result is the create_default_structure() fallback.
+    """
+    return structured_data.get("extracted_data") == create_default_structure()["extracted_data"]
+
+def extraction_prompt_version() -> str:
+    """
+    Fingerprint everything besides the CV text that shapes an extraction result:
+    the prompt wording, model, token limit, scoring rules, text compaction and
+    the PDF text settings.
+    """
+    payload = json.dumps({
+        "messages": build_extraction_messages("{cv_text}"),
+        "compaction": [COMPACTION_VERSION, EXTRACTION_INPUT_TOKEN_BUDGET, EXTRACTION_CHUNK_TOKENS],
+        "model": EXTRACTION_MODEL,
+        "max_tokens": EXTRACTION_MAX_TOKENS,
+        "scoring_rules": SCORING_RULES,
+        "pdf_text": pdf_text_version(),
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def build_extraction_messages(cv_text: str, part: Optional[Tuple[int, int]] = None) -> List[Dict[str, str]]:
+    """
+    Build the chat messages for the structured-extraction call. part=(k, n)
+    marks the text as the k-th of n chunks of a longer CV.
     """
-    client = openai_client.get_client()
-    
     if not cv_text.strip():
         raise ValueError("Empty CV text provided")
     
@@ -247,40 +275,39 @@ def extract_structured_data_from_cv(cv_text: str) -> Dict[str, Any]:
         CV Text:
         {cleaned_cv_text}
         """
+    if part is not None:
+        prompt += f"""
+        Note: this is part {part[0]} of {part[1]} of a longer CV. Extract only what appears in this part.
+        """
+    return [
+        {
+            "role": "system", 
+            "content": "You are a professional CV parser. Return only valid JSON that matches the required structure exactly."
+        },
+        {"role": "user", "content": prompt}
+    ]
+
+def parse_extraction_response(response_content: str) -> Dict[str, Any]:
+    """
+    Parse the raw model output into the extraction structure, falling back to
+    create_default_structure() when the output is unusable.
+    """
+    response_content = (response_content or "").strip()
+    # Remove markdown formatting markers if present.
+    response_content = response_content.replace("```json", "").replace("```", "").strip()
+    
+    if not response_content:
+        logger.error("Empty response from API")
+        return create_default_structure()
+    
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": "You are a professional CV parser. Return only valid JSON that matches the required structure exactly."
-                },
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=3000,
-            temperature=0
-        )
-        
-        response_content = response.choices[0].message.content.strip()
-        # Remove markdown formatting markers if present.
-        response_content = response_content.replace("```json", "").replace("```", "").strip()
-        
-        if not response_content:
-            logger.error("Empty response from API")
-            return create_default_structure()
-        
-        try:
-            structured_data = json.loads(response_content)
-            if not isinstance(structured_data, dict) or "extracted_data" not in structured_data:
-                logger.error("Response JSON missing required 'extracted_data' field")
-                return create_default_structure()
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON response: {e}")
-            logger.error(f"Raw response: {response_content}")
+        structured_data = json.loads(response_content)
+        if not isinstance(structured_data, dict) or "extracted_data" not in structured_data:
+            logger.error("Response JSON missing required 'extracted_data' field")
             return create_default_structure()
-            
-    except Exception as e:
-        logger.error(f"Error during API call: {e}")
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse JSON response: {e}")
+        logger.error(f"Raw response: {response_content}")
         return create_default_structure()
     
     # Ensure all required fields exist.
@@ -289,4 +316,127 @@ def extract_structured_data_from_cv(cv_text: str) -> Dict[str, Any]:
         if key not in structured_data:
             structured_data[key] = default_structure[key]
     
-    return structured_data
\ No newline at end of file
+    return structured_data
+
+def prepare_extraction_chunks(cv_text: str) -> List[str]:
+    """
+    Compact the CV text and, when it is over EXTRACTION_INPUT_TOKEN_BUDGET,
+    split it into chunks that are extracted separately and merged.
+    """
+    compacted = compact_cv_text(cv_text)
+    if not compacted:
+        raise ValueError("Empty CV text provided")
+    if count_tokens(compacted) <= EXTRACTION_INPUT_TOKEN_BUDGET:
+        return [compacted]
+    chunks = split_into_chunks(compacted)
+    logger.info(f"Long CV split into {len(chunks)} chunks for extraction")
+    return chunks
+
+def merge_chunk_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge chunk extractions, ignoring chunks that fell back to the default structure.
+    """
+    usable = [result for result in results if not is_default_structure(result)]
+    if not usable:
+        return create_default_structure()
+    return merge_extractions(usable)
+
+def extract_structured_data_from_cv(cv_text: str) -> Dict[str, Any]:
+    """
+    Extract structured data, summary, and evaluation from CV text using a single OpenAI API call.
+    Long CVs are split into chunks that are extracted in parallel threads and merged.
+    """
+    chunks = prepare_extraction_chunks(cv_text)
+    if len(chunks) == 1:
+        return _extract_chunk(chunks[0])
+    with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+        results = list(executor.map(
+            lambda item: _extract_chunk(item[1], (item[0] + 1, len(chunks))), enumerate(chunks)
+        ))
+    return merge_chunk_results(results)
+
+def _extract_chunk(cv_text: str, part: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+    client = openai_client.get_client()
+    messages = build_extraction_messages(cv_text, part)
+    # API errors propagate, so the evaluation fails and can be retried instead of
+    # scoring an empty default structure.
+    response = client.chat.completions.create(
+        model=EXTRACTION_MODEL,
+        messages=messages,
+        max_tokens=EXTRACTION_MAX_TOKENS,
+        temperature=0
+    )
+    return parse_extraction_response(response.choices[0].message.content)
+
+async def extract_structured_data_from_cv_async(cv_text: str) -> Dict[str, Any]:
+    """
+    Async variant of extract_structured_data_from_cv that awaits the OpenAI call
+    instead of blocking the event loop. Chunks of a long CV are extracted concurrently.
+    """
+    return await _extract_chunks_async(prepare_extraction_chunks(cv_text))
+
+async def _extract_chunks_async(chunks: List[str]) -> Dict[str, Any]:
+    if len(chunks) == 1:
+        return await _extract_chunk_async(chunks[0])
+    results = await asyncio.gather(*(
+        _extract_chunk_async(chunk, (i + 1, len(chunks))) for i, chunk in enumerate(chunks)
+    ))
+    return merge_chunk_results(list(results))
+
+async def _extract_chunk_async(cv_text: str, part: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+    client = openai_client.get_async_client()
+    messages = build_extraction_messages(cv_text, part)
+    # API errors propagate, so the evaluation fails and can be retried instead of
+    # scoring an empty default structure.
+    response = await client.chat.completions.create(
+        model=EXTRACTION_MODEL,
+        messages=messages,
+        max_tokens=EXTRACTION_MAX_TOKENS,
+        temperature=0
+    )
+    return parse_extraction_response(response.choices[0].message.content)
+
+async def stream_structured_data_from_cv_async(cv_text: str) -> AsyncIterator[Tuple[Tuple[str, ...], Any]]:
+    """
+    Streaming variant of extract_structured_data_from_cv_async. Yields
+    (path, value) for each top-level and "extracted_data" member as soon as the
+    model has written it, e.g. (("extracted_data", "education"), [...]), and
+    finally ((), full structure). Chunked long CVs cannot be streamed in order,
+    so their merged result is replayed member by member. Calls are labelled
+    with the "extraction" stage; the caller times the stream.
+    """
+    chunks = prepare_extraction_chunks(cv_text)
+    if len(chunks) > 1:
+        with stage_label("extraction"):
+            structured_data = await _extract_chunks_async(chunks)
+        for key, value in structured_data.get("extracted_data", {}).items():
+            yield ("extracted_data", key), value
+        yield (), structured_data
+        return
+
+    client = openai_client.get_async_client()
+    messages = build_extraction_messages(chunks[0])
+    parser = IncrementalJSONParser()
+    parts: List[str] = []
+    with stage_label("extraction"):
+        stream = await client.chat.completions.create(
+            model=EXTRACTION_MODEL,
+            messages=messages,
+            max_tokens=EXTRACTION_MAX_TOKENS,
+            temperature=0,
+            stream=True,
+            # The last chunk then carries the token usage of the whole call.
+            stream_options={"include_usage": True}
+        )
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        piece = chunk.choices[0].delta.content
+        if not piece:
+            continue
+        parts.append(piece)
+        for path, value in parser.feed(piece):
+            if len(path) == 2:
+                yield path, value
+
+    yield (), parse_extraction_response("".join(parts))
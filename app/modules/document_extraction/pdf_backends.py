@@ -0,0 +1,124 @@
+import importlib.util
+import io
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PDF_TEXT_BACKEND = os.getenv("PDF_TEXT_BACKEND", "pypdf2")
+
+class PdfBackend:
+    """
+    PDF-to-text backend. Subclasses open a document from bytes and extract one
+    page at a time, so pdf_text can read pages lazily and in worker processes.
+    """
+
+    name = ""
+    module = ""
+
+    def available(self) -> bool:
+        return importlib.util.find_spec(self.module) is not None
+
+    def open(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+    def page_count(self, document: Any) -> int:
+        raise NotImplementedError
+
+    def page_text(self, document: Any, index: int) -> str:
+        raise NotImplementedError
+
+class PyPDF2Backend(PdfBackend):
+    name = "pypdf2"
+    module = "PyPDF2"
+
+    def open(self, data: bytes) -> Any:
+        import PyPDF2
+        return PyPDF2.PdfReader(io.BytesIO(data))
+
+    def page_count(self, document: Any) -> int:
+        return len(document.pages)
+
+    def page_text(self, document: Any, index: int) -> str:
+        return document.pages[index].extract_text() or ""
+
+class PypdfBackend(PyPDF2Backend):
+    name = "pypdf"
+    module = "pypdf"
+
+    def open(self, data: bytes) -> Any:
+        import pypdf
+        return pypdf.PdfReader(io.BytesIO(data))
+
+class PyMuPDFBackend(PdfBackend):
+    name = "pymupdf"
+    module = "fitz"
+
+    def open(self, data: bytes) -> Any:
+        import fitz
+        return fitz.open(stream=data, filetype="pdf")
+
+    def page_count(self, document: Any) -> int:
+        return document.page_count
+
+    def page_text(self, document: Any, index: int) -> str:
+        return document.load_page(index).get_text()
+
+class PdfiumBackend(PdfBackend):
+    name = "pdfium"
+    module = "pypdfium2"
+
+    def open(self, data: bytes) -> Any:
+        import pypdfium2
+        return pypdfium2.PdfDocument(data)
+
+    def page_count(self, document: Any) -> int:
+        return len(document)
+
+    def page_text(self, document: Any, index: int) -> str:
+        return document[index].get_textpage().get_text_range()
+
+class PdfminerBackend(PdfBackend):
+    name = "pdfminer"
+    module = "pdfminer"
+
+    def open(self, data: bytes) -> Any:
+        return data
+
+    def page_count(self, document: Any) -> int:
+        from pdfminer.pdfpage import PDFPage
+        return sum(1 for _ in PDFPage.get_pages(io.BytesIO(document)))
+
+    def page_text(self, document: Any, index: int) -> str:
+        from pdfminer.high_level import extract_text
+        return extract_text(io.BytesIO(document), page_numbers=[index])
+
+_backends: Dict[str, PdfBackend] = {}
+
+def register_backend(backend: PdfBackend) -> None:
+    """
+    Add or replace a backend under its name.
+    """
+    _backends[backend.name] = backend
+
+for _backend in (PyPDF2Backend(), PypdfBackend(), PyMuPDFBackend(), PdfiumBackend(), PdfminerBackend()):
+    register_backend(_backend)
+
+def available_backends() -> List[str]:
+    """
+    Names of registered backends whose library is installed.
+    """
+    return [name for name, backend in _backends.items() if backend.available()]
+
+def get_backend(name: Optional[str] = None) -> PdfBackend:
+    """
+    Return the named backend (default PDF_TEXT_BACKEND), falling back to PyPDF2
+    when it is unknown or its library is not installed.
+    """
+    name = name or PDF_TEXT_BACKEND
+    backend = _backends.get(name)
+    if backend is None or not backend.available():
+        logger.warning(f"PDF backend {name!r} is not available, using pypdf2")
+        return _backends["pypdf2"]
+    return backend
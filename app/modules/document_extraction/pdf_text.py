@@ -0,0 +1,166 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, List, Optional, Tuple
+
+from app.modules.document_extraction.pdf_backends import PDF_TEXT_BACKEND, PdfBackend, get_backend
+
+logger = logging.getLogger(__name__)
+
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "200000"))
+PDF_PAGE_TIMEOUT_SECONDS = float(os.getenv("PDF_PAGE_TIMEOUT_SECONDS", "10"))
+PDF_TOTAL_TIMEOUT_SECONDS = float(os.getenv("PDF_TOTAL_TIMEOUT_SECONDS", "60"))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "32"))
+PDF_PAGE_WORKERS = int(os.getenv("PDF_PAGE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+def pdf_text_version() -> str:
+    """
+    Fingerprint of the settings that shape extracted PDF text: the backend and
+    the page and character budgets. Cached text from other settings is stale.
+    """
+    payload = f"{PDF_TEXT_BACKEND}:{PDF_MAX_PAGES}:{PDF_MAX_CHARS}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+@dataclass
+class PageTiming:
+    index: int
+    seconds: float
+    chars: int
+    error: Optional[str] = None
+
+@dataclass
+class PdfTextResult:
+    text: str
+    pages_total: int
+    pages_read: int
+    truncated: bool
+    parallel: bool
+    seconds: float
+    timings: List[PageTiming] = field(default_factory=list)
+
+    def slowest_pages(self, count: int = 3) -> List[PageTiming]:
+        return sorted(self.timings, key=lambda timing: timing.seconds, reverse=True)[:count]
+
+def _read_page(backend: PdfBackend, document: Any, index: int) -> Tuple[str, float, Optional[str]]:
+    start = time.perf_counter()
+    try:
+        text = backend.page_text(document, index)
+        error = None
+    except Exception as e:
+        text, error = "", str(e)
+    return text, time.perf_counter() - start, error
+
+# Backend and document held by each page worker process, opened once by the pool initializer.
+_worker_backend: Optional[PdfBackend] = None
+_worker_document: Any = None
+
+def _init_page_worker(backend_name: str, data: bytes) -> None:
+    global _worker_backend, _worker_document
+    _worker_backend = get_backend(backend_name)
+    _worker_document = _worker_backend.open(data)
+
+def _read_page_in_worker(index: int) -> Tuple[str, float, Optional[str]]:
+    return _read_page(_worker_backend, _worker_document, index)
+
+def extract_pdf_text(
+    data: bytes,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    page_timeout: Optional[float] = None,
+    total_timeout: Optional[float] = None,
+    parallel: Optional[bool] = None,
+    workers: Optional[int] = None,
+    page_suffix: str = "",
+    backend: Optional[str] = None,
+) -> PdfTextResult:
+    """
+    Extract text page by page, stopping at the page, character or time budget.
+
+    Pages are parsed only when reached and joined once at the end. Documents
+    with at least PDF_PARALLEL_MIN_PAGES pages (or parallel=True) are read by a
+    pool of processes, which is also the only mode that can abandon a page
+    after page_timeout; the sequential mode records overruns in the timings.
+    Budgets of 0 mean unlimited. backend picks a registered PDF backend
+    (default PDF_TEXT_BACKEND).
+    """
+    pdf_backend = get_backend(backend)
+
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = PDF_MAX_CHARS if max_chars is None else max_chars
+    page_timeout = PDF_PAGE_TIMEOUT_SECONDS if page_timeout is None else page_timeout
+    total_timeout = PDF_TOTAL_TIMEOUT_SECONDS if total_timeout is None else total_timeout
+    workers = workers or PDF_PAGE_WORKERS
+
+    start = time.perf_counter()
+    document = pdf_backend.open(data)
+    pages_total = pdf_backend.page_count(document)
+    page_limit = min(pages_total, max_pages) if max_pages else pages_total
+    if parallel is None:
+        parallel = workers > 1 and page_limit >= PDF_PARALLEL_MIN_PAGES
+
+    pool = None
+    if parallel:
+        try:
+            pool = multiprocessing.get_context().Pool(workers, initializer=_init_page_worker, initargs=(pdf_backend.name, bytes(data)))
+        except Exception as e:
+            # Daemonic pool workers cannot start children of their own.
+            logger.warning(f"Page pool unavailable, reading pages sequentially: {str(e)}")
+
+    parts: List[str] = []
+    timings: List[PageTiming] = []
+    chars = 0
+    truncated = page_limit < pages_total
+    try:
+        pending: Deque[Tuple[int, Any]] = deque()
+        next_index = 0
+        while next_index < page_limit or pending:
+            if total_timeout and time.perf_counter() - start > total_timeout:
+                truncated = True
+                break
+            if pool is not None:
+                while next_index < page_limit and len(pending) < workers * 2:
+                    pending.append((next_index, pool.apply_async(_read_page_in_worker, (next_index,))))
+                    next_index += 1
+                index, async_result = pending.popleft()
+                try:
+                    text, seconds, error = async_result.get(timeout=page_timeout or None)
+                except multiprocessing.TimeoutError:
+                    text, seconds, error = "", page_timeout, "timeout"
+            else:
+                index = next_index
+                next_index += 1
+                text, seconds, error = _read_page(pdf_backend, document, index)
+                if error is None and page_timeout and seconds > page_timeout:
+                    error = "slow"
+            if error:
+                logger.warning(f"Page {index + 1}/{pages_total}: {error} after {seconds:.2f}s")
+            timings.append(PageTiming(index=index, seconds=seconds, chars=len(text), error=error))
+            parts.append(text + page_suffix)
+            chars += len(text)
+            if max_chars and chars >= max_chars:
+                truncated = truncated or index + 1 < pages_total
+                break
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    text = "".join(parts)
+    if max_chars and len(text) > max_chars:
+        text = text[:max_chars]
+    result = PdfTextResult(
+        text=text,
+        pages_total=pages_total,
+        pages_read=len(timings),
+        truncated=truncated,
+        parallel=pool is not None,
+        seconds=time.perf_counter() - start,
+        timings=timings,
+    )
+    if truncated:
+        logger.info(f"Read {result.pages_read}/{pages_total} pages in {result.seconds:.2f}s (budget reached)")
+    return result
@@ -0,0 +1,111 @@
+import json
+import logging
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Path = Tuple[str, ...]
+
+class _Frame:
+    __slots__ = ("kind", "path", "key", "value_start", "expect_key")
+
+    def __init__(self, kind: str, path: Path):
+        self.kind = kind            # "object" or "array"
+        self.path = path
+        self.key: Optional[str] = None
+        self.value_start: Optional[int] = None
+        self.expect_key = kind == "object"
+
+class IncrementalJSONParser:
+    """
+    Parse a streamed JSON object and report each member of the top-level
+    object, and of the objects listed in `expand`, as soon as its value closes.
+
+    feed() takes text as it arrives and returns (path, value) pairs, e.g.
+    (("extracted_data", "education"), [...]) the moment the education array and
+    the comma after it have been received. Text before the first "{" (such as
+    a ```json fence) is ignored.
+    """
+
+    def __init__(self, expand: Tuple[str, ...] = ("extracted_data",)):
+        self.expand = set(expand)
+        self._buffer: List[str] = []
+        self._text = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._started = False
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Tuple[Path, Any]]:
+        events: List[Tuple[Path, Any]] = []
+        if self.done or not chunk:
+            return events
+        self._text += chunk
+        text = self._text
+        while self._pos < len(text):
+            ch = text[self._pos]
+            i = self._pos
+            self._pos += 1
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._stack.append(_Frame("object", ()))
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    frame = self._stack[-1]
+                    if frame.kind == "object" and frame.expect_key:
+                        frame.key = json.loads(text[self._string_start:i + 1])
+                continue
+            if ch in " \t\r\n":
+                continue
+            frame = self._stack[-1]
+            tracked = self._tracks(frame)
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+                if tracked and not frame.expect_key and frame.value_start is None:
+                    frame.value_start = i
+                continue
+            if ch == ":":
+                frame.expect_key = False
+                continue
+            if ch in ",}]":
+                if tracked and frame.value_start is not None:
+                    events.append(self._emit(frame, text[frame.value_start:i]))
+                frame.value_start = None
+                if ch == ",":
+                    frame.expect_key = frame.kind == "object"
+                    continue
+                self._stack.pop()
+                if not self._stack:
+                    self.done = True
+                    break
+                continue
+            if tracked and not frame.expect_key and frame.value_start is None:
+                frame.value_start = i
+            if ch in "{[":
+                child_path = frame.path + (frame.key,) if frame.kind == "object" and frame.key is not None else frame.path
+                self._stack.append(_Frame("object" if ch == "{" else "array", child_path))
+        return events
+
+    def _tracks(self, frame: _Frame) -> bool:
+        # Members of the root object and of the expanded objects are reported.
+        return frame.kind == "object" and (frame.path == () or (len(frame.path) == 1 and frame.path[0] in self.expand))
+
+    def _emit(self, frame: _Frame, raw: str) -> Tuple[Path, Any]:
+        path = frame.path + (frame.key,)
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Could not parse streamed value for {'.'.join(path)}: {e}")
+            value = None
+        return path, value
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "1") == "1"
+EMBEDDING_CACHE_DIR = os.getenv(
+    "EMBEDDING_CACHE_DIR",
+    str(Path(__file__).parent.parent.parent.parent / ".cache" / "embeddings")
+)
+
+# One index record per cached vector: a 16-byte key and the vector's row number.
+INDEX_DTYPE = np.dtype([("key", "S16"), ("row", "<i8")])
+
+def normalize_embedding_text(text: str) -> str:
+    """
+    Normalize text before hashing so trivial differences share one cache entry.
+    """
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+class EmbeddingCache:
+    """
+    Append-only embedding cache shared between processes.
+
+    Vectors live in a raw float32 file read through np.memmap, so lookups are
+    zero-copy views and every worker process shares the OS page cache instead
+    of loading its own copy. A compact index file maps a hash of
+    (model revision, normalized text) to a row. Writers append under an
+    exclusive file lock; readers pick up rows appended by other processes the
+    next time they miss.
+    """
+
+    def __init__(self, directory: str, revision: str, dim: int):
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", revision)
+        self.directory = Path(directory) / slug
+        self.revision = revision
+        self.dim = dim
+        self.hits = 0
+        self.misses = 0
+        self._index: Dict[bytes, int] = {}
+        self._index_records = 0
+        self._vectors: Optional[np.memmap] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.directory / "vectors.f32"
+        self.index_path = self.directory / "index.bin"
+        self.lock_path = self.directory / "lock"
+        self.meta_path = self.directory / "meta.json"
+        if self.meta_path.exists():
+            meta = json.loads(self.meta_path.read_text())
+            if meta.get("dim") != dim:
+                raise ValueError(f"Embedding cache at {self.directory} has dim {meta.get('dim')}, expected {dim}")
+        else:
+            self._write_meta(0)
+        self.vectors_path.touch(exist_ok=True)
+        self.index_path.touch(exist_ok=True)
+        self._refresh()
+
+    def key(self, text: str) -> bytes:
+        payload = f"{self.revision}\0{normalize_embedding_text(text)}".encode("utf-8")
+        return hashlib.sha256(payload).digest()[:16]
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        with open(self.lock_path, "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _write_meta(self, generation: int) -> None:
+        tmp_meta = self.meta_path.with_suffix(".tmp")
+        tmp_meta.write_text(json.dumps({"revision": self.revision, "dim": self.dim, "generation": generation}))
+        os.replace(tmp_meta, self.meta_path)
+
+    def _refresh(self) -> None:
+        # Another process compacted the files: every row number we hold is stale.
+        generation = json.loads(self.meta_path.read_text()).get("generation", 0)
+        if generation != self._generation:
+            self._index = {}
+            self._index_records = 0
+            self._vectors = None
+            self._generation = generation
+        # Read index records appended since the last refresh (by any process).
+        size = self.index_path.stat().st_size
+        total = size // INDEX_DTYPE.itemsize
+        if total > self._index_records:
+            new = np.fromfile(
+                self.index_path, dtype=INDEX_DTYPE,
+                count=total - self._index_records,
+                offset=self._index_records * INDEX_DTYPE.itemsize
+            )
+            for record in new:
+                self._index[bytes(record["key"])] = int(record["row"])
+            self._index_records = total
+        rows = self.vectors_path.stat().st_size // (self.dim * 4)
+        if rows and (self._vectors is None or self._vectors.shape[0] < rows):
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """
+        Return a read-only view of the cached vector, or None.
+        """
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up several texts at once; misses come back as None.
+        """
+        keys = [self.key(text) for text in texts]
+        with self._lock:
+            if any(key not in self._index for key in keys):
+                self._refresh()
+            results: List[Optional[np.ndarray]] = []
+            for key in keys:
+                row = self._index.get(key)
+                if row is None or self._vectors is None or row >= self._vectors.shape[0]:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self.hits += 1
+                    results.append(self._vectors[row])
+        return results
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """
+        Append vectors for texts not already cached.
+        """
+        array = np.asarray(vectors, dtype=np.float32).reshape(len(texts), self.dim)
+        with self._lock, self._file_lock():
+            self._refresh()
+            fresh: Dict[bytes, int] = {}
+            for i, text in enumerate(texts):
+                key = self.key(text)
+                if key not in self._index and key not in fresh:
+                    fresh[key] = i
+            if not fresh:
+                return
+            row_bytes = self.dim * 4
+            size = self.vectors_path.stat().st_size
+            if size % row_bytes:
+                # Drop a partial row left by a writer that crashed mid-append.
+                os.truncate(self.vectors_path, size - size % row_bytes)
+            first_row = size // row_bytes
+            with open(self.vectors_path, "ab") as handle:
+                handle.write(array[list(fresh.values())].tobytes())
+            records = np.array(
+                [(key, first_row + offset) for offset, key in enumerate(fresh)],
+                dtype=INDEX_DTYPE
+            )
+            # The index is written after the vectors so a reader never sees a row that is not on disk yet.
+            with open(self.index_path, "ab") as handle:
+                handle.write(records.tobytes())
+            self._refresh()
+
+    def compact(self, max_entries: Optional[int] = None) -> int:
+        """
+        Rewrite the files without duplicate or unreachable rows, keeping only the
+        newest max_entries vectors if given. Returns the number of rows dropped.
+        """
+        with self._lock, self._file_lock():
+            self._refresh()
+            items = sorted(self._index.items(), key=lambda item: item[1])
+            if max_entries is not None:
+                items = items[-max_entries:] if max_entries > 0 else []
+            old_rows = 0 if self._vectors is None else self._vectors.shape[0]
+            kept = np.empty((len(items), self.dim), dtype=np.float32)
+            for new_row, (_, old_row) in enumerate(items):
+                kept[new_row] = self._vectors[old_row]
+            records = np.array([(key, row) for row, (key, _) in enumerate(items)], dtype=INDEX_DTYPE)
+
+            tmp_vectors = self.vectors_path.with_suffix(".tmp")
+            tmp_index = self.index_path.with_suffix(".tmp")
+            kept.tofile(tmp_vectors)
+            records.tofile(tmp_index)
+            os.replace(tmp_vectors, self.vectors_path)
+            os.replace(tmp_index, self.index_path)
+            self._write_meta(self._generation + 1)
+            self._refresh()
+            return old_rows - len(items)
+
+    def clear(self) -> None:
+        """
+        Drop every cached vector.
+        """
+        self.compact(max_entries=0)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Return hit/miss counters for this process and the cache size on disk.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._index),
+            "bytes_on_disk": self.vectors_path.stat().st_size + self.index_path.stat().st_size,
+        }
+
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+def get_embedding_cache(revision: str, dim: int) -> Optional[EmbeddingCache]:
+    """
+    Return the shared cache for a model revision, or None when caching is disabled.
+    """
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    with _caches_lock:
+        cache = _caches.get(revision)
+        if cache is None:
+            cache = EmbeddingCache(EMBEDDING_CACHE_DIR, revision, dim)
+            _caches[revision] = cache
+        return cache
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or compact an embedding cache.")
+    parser.add_argument("command", choices=["stats", "compact"])
+    parser.add_argument("--revision", required=True, help="Model revision the cache was built for")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--max-entries", type=int, default=None)
+    args = parser.parse_args()
+
+    cache = EmbeddingCache(EMBEDDING_CACHE_DIR, args.revision, args.dim)
+    if args.command == "compact":
+        print(f"Dropped {cache.compact(args.max_entries)} rows")
+    print(json.dumps(cache.stats(), indent=2))
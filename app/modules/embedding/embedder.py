@@ -1,17 +1,62 @@
-from transformers import AutoTokenizer, AutoModel
+import os
 import torch
-from typing import List
+from typing import List, Optional
 
+from app.modules.embedding.model_registry import model_registry, LoadedModel
+from app.modules.embedding.cache import get_embedding_cache
 
-def get_embeddings(texts: List[str]) -> List[List[float]]:
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_MAX_LENGTH = int(os.getenv("EMBEDDING_MAX_LENGTH", "256"))
+
+def get_embeddings(texts: List[str], batch_size: Optional[int] = None, model_name: Optional[str] = None) -> List[List[float]]:
     """
     Generate embeddings for a list of texts using PhoBERT.
+    The model stays resident in the model registry; texts are grouped into
+    length buckets so each batch pads as little as possible, and vectors
+    already in the embedding cache are not recomputed.
+    """
+    if not texts:
+        return []
+    loaded = model_registry.get(model_name)
+    batch_size = batch_size or EMBEDDING_BATCH_SIZE
+    cache = get_embedding_cache(loaded.revision, loaded.model.config.hidden_size)
+    if cache is None:
+        return encode_texts(loaded, texts, batch_size)
+
+    cached = cache.get_many(texts)
+    missing = list(dict.fromkeys(text for text, vector in zip(texts, cached) if vector is None))
+    if missing:
+        fresh = dict(zip(missing, encode_texts(loaded, missing, batch_size)))
+        cache.put_many(missing, [fresh[text] for text in missing])
+        return [vector.tolist() if vector is not None else fresh[text] for text, vector in zip(texts, cached)]
+    return [vector.tolist() for vector in cached]
+
+def length_buckets(lengths: List[int], batch_size: int) -> List[List[int]]:
+    """
+    Group indices into batches of similar length: sort by length, then slice.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+def encode_texts(loaded: LoadedModel, texts: List[str], batch_size: int) -> List[List[float]]:
+    """
+    Mean-pool the last hidden state over real (non-padding) tokens, so a text's
+    embedding does not depend on which other texts share its batch.
     """
-    tokenizer = AutoTokenizer.from_pretrained("vinai/phobert-base")
-    model = AutoModel.from_pretrained("vinai/phobert-base")
+    tokenizer, model = loaded.tokenizer, loaded.model
+    encoded = tokenizer(texts, truncation=True, max_length=EMBEDDING_MAX_LENGTH)
+    lengths = [len(ids) for ids in encoded["input_ids"]]
+    device = next(model.parameters()).device
 
-    inputs = tokenizer(texts, return_tensors="pt", padding=True, truncation=True)
-    with torch.no_grad():
-        outputs = model(**inputs)
-    embeddings = outputs.last_hidden_state.mean(dim=1).tolist()
-    return embeddings
\ No newline at end of file
+    embeddings: List[Optional[List[float]]] = [None] * len(texts)
+    with torch.inference_mode():
+        for bucket in length_buckets(lengths, batch_size):
+            features = [{key: encoded[key][i] for key in encoded.keys()} for i in bucket]
+            inputs = tokenizer.pad(features, return_tensors="pt")
+            inputs = {key: value.to(device) for key, value in inputs.items()}
+            outputs = model(**inputs)
+            mask = inputs["attention_mask"].unsqueeze(-1).to(outputs.last_hidden_state.dtype)
+            pooled = (outputs.last_hidden_state * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+            for i, vector in zip(bucket, pooled.cpu().tolist()):
+                embeddings[i] = vector
+    return embeddings
@@ -0,0 +1,70 @@
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "vinai/phobert-base")
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE", "cpu")
+
+@dataclass
+class LoadedModel:
+    name: str
+    tokenizer: Any
+    model: Any
+    revision: str
+
+class ModelRegistry:
+    """
+    Process-wide registry that loads each transformer model once and keeps it
+    resident in eval mode, instead of reloading it on every embedding call.
+    """
+
+    def __init__(self, device: str = EMBEDDING_DEVICE):
+        self.device = device
+        self._models: Dict[str, LoadedModel] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: Optional[str] = None) -> LoadedModel:
+        """
+        Return the loaded model, loading it on first use.
+        """
+        name = name or EMBEDDING_MODEL_NAME
+        loaded = self._models.get(name)
+        if loaded is None:
+            with self._lock:
+                loaded = self._models.get(name)
+                if loaded is None:
+                    loaded = self._load(name)
+                    self._models[name] = loaded
+        return loaded
+
+    def _load(self, name: str) -> LoadedModel:
+        from transformers import AutoTokenizer, AutoModel
+
+        logger.info(f"Loading embedding model {name} on {self.device}")
+        tokenizer = AutoTokenizer.from_pretrained(name)
+        model = AutoModel.from_pretrained(name)
+        model.to(self.device)
+        model.eval()
+        # The hub commit hash when available, so caches can key on the exact weights.
+        revision = getattr(model.config, "_commit_hash", None) or name
+        return LoadedModel(name=name, tokenizer=tokenizer, model=model, revision=revision)
+
+    def preload(self, name: Optional[str] = None) -> None:
+        """
+        Load a model eagerly, e.g. at server startup.
+        """
+        self.get(name)
+
+    def clear(self) -> None:
+        """
+        Drop every loaded model.
+        """
+        with self._lock:
+            self._models.clear()
+
+# Singleton instance
+model_registry = ModelRegistry()
@@ -1,8 +1,149 @@
-from typing import List
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 
 def calculate_similarity(embedding1: List[float], embedding2: List[float]) -> float:
     """
     Calculate cosine similarity between two embeddings.
     """
-    return cosine_similarity([embedding1], [embedding2])[0][0]
\ No newline at end of file
+    return cosine_similarity([embedding1], [embedding2])[0][0]
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+class SimilarityIndex:
+    """
+    Cosine top-k search over candidate embeddings.
+
+    Rows are L2-normalized once on insert and kept in a contiguous float32
+    matrix, so a query costs one matrix-vector product plus argpartition
+    rather than one cosine_similarity call per candidate. Deletes move the
+    last row into the freed slot, keeping the matrix dense.
+
+    For corpora too large for brute force, build_approximate_index() clusters
+    rows into inverted lists (IVF); searches then only score rows in the
+    n_probe lists whose centroids are closest to the query.
+    """
+
+    def __init__(self, dim: int, initial_capacity: int = 1024):
+        self.dim = dim
+        self._matrix = np.zeros((initial_capacity, dim), dtype=np.float32)
+        self._ids: List[Hashable] = []
+        self._rows: Dict[Hashable, int] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(initial_capacity, dtype=np.int32)
+        self.n_probe = 8
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: Hashable) -> bool:
+        return item_id in self._rows
+
+    def _ensure_capacity(self, size: int) -> None:
+        capacity = self._matrix.shape[0]
+        if size <= capacity:
+            return
+        new_capacity = max(size, capacity * 2)
+        matrix = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        matrix[:len(self._ids)] = self._matrix[:len(self._ids)]
+        assignments = np.zeros(new_capacity, dtype=np.int32)
+        assignments[:len(self._ids)] = self._assignments[:len(self._ids)]
+        self._matrix, self._assignments = matrix, assignments
+
+    def add(self, ids: Sequence[Hashable], vectors: Sequence[Sequence[float]]) -> None:
+        """
+        Insert or replace candidates.
+        """
+        vectors = _normalize_rows(np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim))
+        new_ids = [item_id for item_id in ids if item_id not in self._rows]
+        self._ensure_capacity(len(self._ids) + len(set(new_ids)))
+        for item_id, vector in zip(ids, vectors):
+            row = self._rows.get(item_id)
+            if row is None:
+                row = len(self._ids)
+                self._ids.append(item_id)
+                self._rows[item_id] = row
+            self._matrix[row] = vector
+            if self._centroids is not None:
+                self._assignments[row] = int(np.argmax(self._centroids @ vector))
+
+    def remove(self, ids: Sequence[Hashable]) -> int:
+        """
+        Delete candidates; unknown IDs are ignored. Returns the number removed.
+        """
+        removed = 0
+        for item_id in ids:
+            row = self._rows.pop(item_id, None)
+            if row is None:
+                continue
+            last = len(self._ids) - 1
+            if row != last:
+                moved_id = self._ids[last]
+                self._matrix[row] = self._matrix[last]
+                self._assignments[row] = self._assignments[last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+            self._ids.pop()
+            removed += 1
+        return removed
+
+    def search(self, query: Sequence[float], k: int = 10, exact: bool = False) -> List[Tuple[Hashable, float]]:
+        """
+        Return the k most similar candidates as (id, cosine similarity), best first.
+        """
+        size = len(self._ids)
+        if size == 0 or k <= 0:
+            return []
+        q = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        norm = np.linalg.norm(q)
+        if norm:
+            q = q / norm
+
+        if self._centroids is not None and not exact:
+            probe = np.argsort(-(self._centroids @ q))[:self.n_probe]
+            rows = np.flatnonzero(np.isin(self._assignments[:size], probe))
+            scores = self._matrix[rows] @ q
+        else:
+            rows = None
+            scores = self._matrix[:size] @ q
+
+        k = min(k, scores.shape[0])
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        if rows is not None:
+            return [(self._ids[rows[i]], float(scores[i])) for i in top]
+        return [(self._ids[i], float(scores[i])) for i in top]
+
+    def build_approximate_index(self, n_lists: Optional[int] = None, n_probe: int = 8, iterations: int = 10, seed: int = 0) -> None:
+        """
+        Cluster the current rows with spherical k-means into n_lists inverted
+        lists (default about sqrt(N)). Later inserts join their nearest list.
+        """
+        size = len(self._ids)
+        if size == 0:
+            return
+        n_lists = min(n_lists or max(1, int(np.sqrt(size))), size)
+        rng = np.random.default_rng(seed)
+        data = self._matrix[:size]
+        centroids = data[rng.choice(size, n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(data @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = data[assignments == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+            centroids = _normalize_rows(centroids)
+        self._centroids = centroids
+        self._assignments[:size] = np.argmax(data @ centroids.T, axis=1)
+        self.n_probe = n_probe
+
+    def drop_approximate_index(self) -> None:
+        """
+        Go back to exact brute-force search.
+        """
+        self._centroids = None
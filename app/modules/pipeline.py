@@ -0,0 +1,169 @@
+from typing import Dict, Any, AsyncIterator, Optional
+import asyncio
+import logging
+import os
+from pathlib import Path
+from datetime import datetime
+
+from app.models.resume import Resume
+from app.modules.document_extraction.extractor import (
+    build_resume,
+    extract_analysis_from_bytes_async,
+    stream_resume_from_bytes_async,
+)
+from app.modules.scoring.scorer import (
+    best_item_score,
+    calculate_award_item_score,
+    calculate_certification_item_score,
+    calculate_education_item_score,
+    calculate_experience_item_score,
+    calculate_project_item_score,
+    calculate_total_score,
+)
+from app.modules.summarization.evaluator import evaluate_resume_async, reason_from_analysis
+from app.utils.entity_memo import ENTITY_RESOLVE_ENABLED, collect_entities, resolve_entity_scores_async
+from app.utils.metrics import record_fallback, stage_span
+
+logger = logging.getLogger(__name__)
+
+# "two_call": extraction, then a separate reasoning call that knows the status.
+# "single_call": reuse the evaluation written by the extraction call, falling
+# back to the reasoning call only when that evaluation is missing.
+EVALUATION_MODE = os.getenv("EVALUATION_MODE", "two_call")
+
+def build_evaluation_result(file_name: str, resume: Resume, score_result: Dict[str, Any], ai_reason: str) -> Dict[str, Any]:
+    """
+    Assemble the response payload returned by /api/evaluate-cv.
+    """
+    return {
+        "file_name": file_name,
+        "processed_at": datetime.now().isoformat(),
+        "cv_data": resume.dict(),
+        "scores": score_result["scores"],
+        "weighted_scores": score_result["weighted_scores"],
+        "status": score_result["status"],
+        "total_score": score_result["total_score"],
+        "ai_reason": ai_reason
+    }
+
+async def evaluate_cv_async(file_path: str, file_name: str) -> Dict[str, Any]:
+    """
+    Run the full CV pipeline (extraction, scoring, reasoning) without blocking the event loop.
+    """
+    data = await asyncio.to_thread(Path(file_path).read_bytes)
+    # Extract CV data; the path's extension selects the parser
+    resume, analysis = await extract_analysis_from_bytes_async(data, file_path)
+    logger.info("Successfully extracted resume data")
+    return await score_and_evaluate_async(resume, file_name, analysis)
+
+async def evaluate_cv_bytes_async(data: bytes, file_name: str) -> Dict[str, Any]:
+    """
+    Same as evaluate_cv_async for an upload already held in memory.
+    """
+    resume, analysis = await extract_analysis_from_bytes_async(data, file_name)
+    logger.info("Successfully extracted resume data")
+    return await score_and_evaluate_async(resume, file_name, analysis)
+
+async def score_and_evaluate_async(resume: Resume, file_name: str, analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Score an extracted resume and produce the reasoning behind its status.
+    """
+    score_result = await score_resume_async(resume)
+    logger.info("Successfully calculated scores")
+
+    with stage_span("reasoning"):
+        ai_reason = await status_reason_async(resume, score_result, analysis)
+    return build_evaluation_result(file_name, resume, score_result, ai_reason)
+
+async def score_resume_async(resume: Resume) -> Dict[str, Any]:
+    """
+    Score the resume. With ENTITY_RESOLVE_ENABLED, its entities are also
+    resolved into the entity memo in the background, off the request path.
+    """
+    if ENTITY_RESOLVE_ENABLED:
+        schedule_entity_resolution(resume)
+    # Calculate scores (pure Python and fast, so it stays on the loop)
+    with stage_span("scoring"):
+        return calculate_total_score(resume)
+
+# Background entity resolutions, referenced until they finish so they are not garbage collected.
+_entity_tasks: set = set()
+
+def schedule_entity_resolution(resume: Resume) -> asyncio.Task:
+    """
+    Resolve the scores of the resume's universities, companies, tech stacks,
+    contests and certifications (knowledge base, memo, then one bulk LLM call
+    for the rest) without waiting for them. Must be called from a running event loop.
+    """
+    task = asyncio.create_task(_resolve_entities(resume))
+    _entity_tasks.add(task)
+    task.add_done_callback(_entity_tasks.discard)
+    return task
+
+async def _resolve_entities(resume: Resume) -> None:
+    try:
+        with stage_span("entity_resolution"):
+            await resolve_entity_scores_async(collect_entities([resume]))
+    except Exception as e:
+        # Nobody awaits this task; the memo is simply not warmed for these names.
+        logger.error(f"Background entity resolution failed: {str(e)}")
+
+async def status_reason_async(resume: Resume, score_result: Dict[str, Any], analysis: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Reasoning for the status: reused from the extraction call in single_call
+    mode when available, otherwise generated by a second LLM call.
+    """
+    if EVALUATION_MODE == "single_call":
+        reason = reason_from_analysis(analysis, score_result)
+        if reason is not None:
+            return reason
+        record_fallback("single_call_reason_missing")
+    return await evaluate_resume_async(resume, score_result["status"])
+
+
+# Resume sections that are scored on their own, with the score key they feed.
+SECTION_SCORERS = {
+    "education": ("education", calculate_education_item_score),
+    "professional_experience": ("experience", calculate_experience_item_score),
+    "projects": ("projects", calculate_project_item_score),
+    "awards": ("awards", calculate_award_item_score),
+    "certifications": ("certifications", calculate_certification_item_score),
+}
+
+async def evaluate_cv_stream_async(data: bytes, file_name: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of evaluate_cv_bytes_async. Yields events as work finishes:
+      {"event": "section", "data": {"name", "value"}}  validated resume section
+      {"event": "score", "data": {"category", "score"}}  raw score of that section
+      {"event": "scores", "data": score_result}          all scores and status
+      {"event": "result", "data": payload}               same payload as /api/evaluate-cv
+    """
+    resume, analysis = None, None
+    async for kind, payload in stream_resume_from_bytes_async(data, file_name):
+        if kind == "resume":
+            resume = payload
+            continue
+        if kind == "analysis":
+            analysis = payload
+            continue
+        name, value = payload
+        scorer = SECTION_SCORERS.get(name)
+        if scorer is None:
+            yield {"event": "section", "data": {"name": name, "value": value}}
+            continue
+        try:
+            items = getattr(build_resume({name: value or []}), name)
+        except Exception as e:
+            logger.warning(f"Streamed section {name} failed validation: {str(e)}")
+            continue
+        yield {"event": "section", "data": {"name": name, "value": [item.dict() for item in items]}}
+        category, item_score = scorer
+        yield {"event": "score", "data": {"category": category, "score": best_item_score(items, item_score)}}
+
+    logger.info("Successfully extracted resume data")
+    score_result = await score_resume_async(resume)
+    yield {"event": "scores", "data": score_result}
+
+    with stage_span("reasoning"):
+        ai_reason = await status_reason_async(resume, score_result, analysis)
+    yield {"event": "result", "data": build_evaluation_result(file_name, resume, score_result, ai_reason)}
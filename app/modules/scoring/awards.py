@@ -5,6 +5,7 @@ from app.models.resume import AwardItem
 from app.models.scoring_rules import SCORING_RULES
 from typing import List, Optional
 from app.utils.openai_client import openai_client
+from app.utils.entity_memo import infer_entity_score, infer_entity_score_async
 
 load_dotenv()
 openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -13,28 +14,13 @@ def infer_contest_prestige(contest: str) -> int:
     """
     Use LLM to infer contest prestige if not found in the JSON file.
     """
-    client = openai_client.get_client()
-    
-    prompt = f"""
-    Based on the following contest name, provide a prestige score between 0 and 30, where 30 is the highest.
-    Contest: {contest}
+    return infer_entity_score("contest", contest, model="gpt-4")
+
+async def infer_contest_prestige_async(contest: str) -> int:
+    """
+    Async variant of infer_contest_prestige.
     """
-    
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {"role": "system", "content": "You are a contest prestige evaluator. Provide a score between 0 and 30."},
-            {"role": "user", "content": prompt}
-        ],
-        max_tokens=10,
-        temperature=0.3
-    )
-    
-    try:
-        score = int(response.choices[0].message.content.strip())
-        return min(max(score, 0), 30)  # Ensure score is between 0 and 30
-    except:
-        return 10  # Default score if parsing fails
+    return await infer_entity_score_async("contest", contest, model="gpt-4")
 
 def calculate_awards_score(awards: List[AwardItem]) -> float:
     """
@@ -0,0 +1,177 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+import numpy as np
+
+from app.models.resume import Resume
+from app.models.scoring_rules import SCORING_RULES
+
+ResumeLike = Union[Resume, Dict[str, Any]]
+
+# Field checks and points per category, mirroring calculate_*_item_score in
+# scorer.py check for check so batch and per-resume scores stay identical.
+#   "known":     truthy and not "Unknown"
+#   "present":   truthy
+#   "non_blank": truthy and not only whitespace
+# Each entry: (resume attribute, score key, [(item field, check, points)]).
+CATEGORY_COLUMNS: List[Tuple[str, str, List[Tuple[str, str, Callable[[], float]]]]] = [
+    ("education", "education", [
+        ("school", "known", lambda: SCORING_RULES["education"].get("school", 0)),
+        ("class_year", "present", lambda: SCORING_RULES["education"].get("class_year", 0)),
+        ("major", "present", lambda: SCORING_RULES["education"].get("major", 0)),
+    ]),
+    ("professional_experience", "experience", [
+        ("company", "known", lambda: 25),
+        ("location", "known", lambda: 5),
+        ("position", "known", lambda: 25),
+        ("seniority", "known", lambda: 5),
+        ("duration", "known", lambda: 5),
+        ("description", "non_blank", lambda: 25),
+    ]),
+    ("projects", "projects", [
+        ("name", "known", lambda: 10),
+        ("link", "present", lambda: 20),
+        ("tech", "present", lambda: 25),
+        ("duration", "present", lambda: 5),
+        ("description", "non_blank", lambda: 40),
+    ]),
+    ("awards", "awards", [
+        ("contest", "known", lambda: 30),
+        ("prize", "known", lambda: 25),
+        ("description", "non_blank", lambda: 25),
+        ("role", "present", lambda: 10),
+        ("link", "present", lambda: 5),
+        ("time", "present", lambda: 5),
+    ]),
+    ("certifications", "certifications", [
+        ("name", "known", lambda: 50),
+        ("link", "present", lambda: 10),
+        ("org", "known", lambda: 40),
+    ]),
+]
+
+WEIGHT_KEYS = {
+    "education": "education",
+    "experience": "professional_experience",
+    "projects": "projects",
+    "awards": "awards",
+    "certifications": "certifications",
+}
+
+@dataclass
+class CategoryFeatures:
+    owner: np.ndarray  # resume index of each item
+    flags: np.ndarray  # items x fields, 1 where the field counts
+    gpa: np.ndarray    # education only: GPA per item, NaN when missing
+
+@dataclass
+class ResumeFeatures:
+    size: int
+    categories: Dict[str, CategoryFeatures]
+    item_counts: Dict[str, np.ndarray]
+
+def _column(items: List[Any], name: str, from_dicts: bool) -> List[Any]:
+    if from_dicts:
+        return [item.get(name) for item in items]
+    return [getattr(item, name, None) for item in items]
+
+def _check_column(values: List[Any], check: str) -> np.ndarray:
+    if check == "known":
+        flags = [bool(v) and v != "Unknown" for v in values]
+    elif check == "non_blank":
+        flags = [bool(v) and bool(v.strip()) for v in values]
+    else:
+        flags = [bool(v) for v in values]
+    return np.fromiter(flags, dtype=np.int64, count=len(values))
+
+def _gpa_value(value: Any) -> float:
+    # NaN marks "no GPA points", matching the try/except around float() in scorer.py.
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except Exception:
+        return np.nan
+
+def extract_features(resumes: Sequence[ResumeLike]) -> ResumeFeatures:
+    """
+    Flatten resumes (Resume objects or their .dict() form) into columnar arrays,
+    one row per item, walking the Python objects exactly once.
+    """
+    from_dicts = bool(resumes) and isinstance(resumes[0], dict)
+    categories: Dict[str, CategoryFeatures] = {}
+    item_counts: Dict[str, np.ndarray] = {}
+    for attribute, score_key, columns in CATEGORY_COLUMNS:
+        per_resume = _column(list(resumes), attribute, from_dicts)
+        counts = np.fromiter((len(items or ()) for items in per_resume), dtype=np.int64, count=len(per_resume))
+        items = [item for resume_items in per_resume if resume_items for item in resume_items]
+        flags = np.zeros((len(items), len(columns)), dtype=np.int64)
+        for position, (name, check, _) in enumerate(columns):
+            flags[:, position] = _check_column(_column(items, name, from_dicts), check)
+        gpa = np.empty(0, dtype=np.float64)
+        if score_key == "education":
+            gpa = np.fromiter(
+                (_gpa_value(value) for value in _column(items, "gpa", from_dicts)),
+                dtype=np.float64, count=len(items)
+            )
+        categories[score_key] = CategoryFeatures(owner=np.repeat(np.arange(len(resumes)), counts), flags=flags, gpa=gpa)
+        item_counts[score_key] = counts
+    return ResumeFeatures(size=len(resumes), categories=categories, item_counts=item_counts)
+
+@dataclass
+class BatchScores:
+    raw: Dict[str, np.ndarray]
+    weighted: Dict[str, np.ndarray]
+    total: np.ndarray
+    status: np.ndarray
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Return one dict per resume in the same shape as calculate_total_score.
+        """
+        keys = list(self.raw)
+        return [
+            {
+                "scores": {key: float(self.raw[key][i]) for key in keys},
+                "weighted_scores": {key: float(self.weighted[key][i]) for key in keys},
+                "total_score": float(self.total[i]),
+                "status": str(self.status[i]),
+            }
+            for i in range(len(self.total))
+        ]
+
+def score_features(features: ResumeFeatures) -> BatchScores:
+    """
+    Compute raw, weighted and total scores plus status for every resume at once.
+    Features can be kept and re-scored cheaply after SCORING_RULES change.
+    """
+    raw: Dict[str, np.ndarray] = {}
+    for _, score_key, columns in CATEGORY_COLUMNS:
+        category = features.categories[score_key]
+        points = np.asarray([field_points() for _, _, field_points in columns], dtype=np.float64)
+        item_scores = category.flags @ points
+        if score_key == "education":
+            has_gpa = ~np.isnan(category.gpa)
+            item_scores[has_gpa] += SCORING_RULES["education"].get("gpa", 0) * (category.gpa[has_gpa] / 4.0)
+        # Best item per resume; resumes without items score 0 like best_item_score.
+        best = np.full(features.size, -np.inf, dtype=np.float64)
+        np.maximum.at(best, category.owner, item_scores)
+        best[features.item_counts[score_key] == 0] = 0.0
+        raw[score_key] = np.minimum(best, 100)
+
+    weighted = {
+        key: raw[key] * (SCORING_RULES[WEIGHT_KEYS[key]]["weight"] / 100)
+        for key in raw
+    }
+    total = (weighted["education"] +
+             weighted["experience"] +
+             weighted["projects"] +
+             weighted["awards"] +
+             weighted["certifications"])
+    status = np.where(total >= 70, "Pass", np.where(total >= 50, "Consider", "Fail"))
+    return BatchScores(raw=raw, weighted=weighted, total=total, status=status)
+
+def calculate_total_scores_batch(resumes: Sequence[ResumeLike]) -> BatchScores:
+    """
+    Vectorized equivalent of calling calculate_total_score on each resume.
+    """
+    return score_features(extract_features(resumes))
@@ -5,6 +5,7 @@ from app.models.resume import CertificationItem
 from app.models.scoring_rules import SCORING_RULES
 from typing import List, Optional
 from app.utils.openai_client import openai_client
+from app.utils.entity_memo import infer_entity_score, infer_entity_score_async
 
 load_dotenv()
 openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -13,28 +14,13 @@ def infer_certification_relevance(name: str) -> int:
     """
     Use LLM to infer certification relevance if not found in the JSON file.
     """
-    client = openai_client.get_client()
-    
-    prompt = f"""
-    Based on the following certification name, provide a relevance score between 0 and 50, where 50 is the highest.
-    Certification: {name}
+    return infer_entity_score("certification", name, model="gpt-4")
+
+async def infer_certification_relevance_async(name: str) -> int:
+    """
+    Async variant of infer_certification_relevance.
     """
-    
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {"role": "system", "content": "You are a certification relevance evaluator. Provide a score between 0 and 50."},
-            {"role": "user", "content": prompt}
-        ],
-        max_tokens=10,
-        temperature=0.3
-    )
-    
-    try:
-        score = int(response.choices[0].message.content.strip())
-        return min(max(score, 0), 50)  # Ensure score is between 0 and 50
-    except:
-        return 10  # Default score if parsing fails
+    return await infer_entity_score_async("certification", name, model="gpt-4")
 
 def calculate_certifications_score(certifications: List[CertificationItem]) -> float:
     """
@@ -6,6 +6,7 @@ from app.models.scoring_rules import SCORING_RULES
 from app.utils.json_lookup import get_university_score
 from typing import List
 from app.utils.openai_client import openai_client
+from app.utils.entity_memo import infer_entity_score, infer_entity_score_async
 
 load_dotenv()
 openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -14,28 +15,13 @@ def infer_university_reputation(university: str) -> int:
     """
     Use LLM to infer university reputation if not found in the JSON file.
     """
-    client = openai_client.get_client()
-    
-    prompt = f"""
-    Based on the following university name, provide a reputation score between 0 and 20, where 20 is the highest reputation.
-    University: {university}
+    return infer_entity_score("university", university, model="gpt-4o")
+
+async def infer_university_reputation_async(university: str) -> int:
+    """
+    Async variant of infer_university_reputation.
     """
-    
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": "You are a university reputation evaluator. Provide a score between 0 and 20."},
-            {"role": "user", "content": prompt}
-        ],
-        max_tokens=10,
-        temperature=0.3
-    )
-    
-    try:
-        score = int(response.choices[0].message.content.strip())
-        return min(max(score, 0), 20)  # Ensure score is between 0 and 20
-    except:
-        return 10  # Default score if parsing fails
+    return await infer_entity_score_async("university", university, model="gpt-4o")
 
 def calculate_education_score(education_items: List[EducationItem]) -> float:
     """
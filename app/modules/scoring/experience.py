@@ -8,6 +8,7 @@ from typing import List
 import re
 from datetime import datetime
 from app.utils.openai_client import openai_client
+from app.utils.entity_memo import infer_entity_score, infer_entity_score_async
 
 load_dotenv()
 openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -16,28 +17,13 @@ def infer_company_size(company: str) -> int:
     """
     Use LLM to infer company size if not found in the JSON file.
     """
-    client = openai_client.get_client()
-    
-    prompt = f"""
-    Based on the following company name, provide a size score between 0 and 25, where 25 is the highest.
-    Company: {company}
+    return infer_entity_score("company", company, model="gpt-4o")
+
+async def infer_company_size_async(company: str) -> int:
     """
-    
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": "You are a company size evaluator. Provide a score between 0 and 25."},
-            {"role": "user", "content": prompt}
-        ],
-        max_tokens=10,
-        temperature=0.3
-    )
-    
-    try:
-        score = int(response.choices[0].message.content.strip())
-        return min(max(score, 0), 25)  # Ensure score is between 0 and 25
-    except:
-        return 10  # Default score if parsing fails
+    Async variant of infer_company_size.
+    """
+    return await infer_entity_score_async("company", company, model="gpt-4o")
 
 def parse_experience_duration(duration: str) -> float:
     """
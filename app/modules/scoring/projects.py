@@ -5,6 +5,7 @@ from app.models.resume import ProjectItem
 from app.models.scoring_rules import SCORING_RULES
 from typing import List, Optional
 from app.utils.openai_client import openai_client
+from app.utils.entity_memo import infer_entity_score, infer_entity_score_async
 
 load_dotenv()
 openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -13,28 +14,13 @@ def infer_tech_stack_relevance(tech: str) -> int:
     """
     Use LLM to infer tech stack relevance if not found in the JSON file.
     """
-    client = openai_client.get_client()
-    
-    prompt = f"""
-    Based on the following tech stack, provide a relevance score between 0 and 25, where 25 is the highest.
-    Tech Stack: {tech}
+    return infer_entity_score("tech_stack", tech, model="gpt-4")
+
+async def infer_tech_stack_relevance_async(tech: str) -> int:
+    """
+    Async variant of infer_tech_stack_relevance.
     """
-    
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {"role": "system", "content": "You are a tech stack relevance evaluator. Provide a score between 0 and 25."},
-            {"role": "user", "content": prompt}
-        ],
-        max_tokens=10,
-        temperature=0.3
-    )
-    
-    try:
-        score = int(response.choices[0].message.content.strip())
-        return min(max(score, 0), 25)  # Ensure score is between 0 and 25
-    except:
-        return 10  # Default score if parsing fails
+    return await infer_entity_score_async("tech_stack", tech, model="gpt-4")
 
 def calculate_projects_score(projects: List[ProjectItem]) -> float:
     """
@@ -1,4 +1,6 @@
 from typing import Dict, Any, List
+import hashlib
+import json
 import logging
 from app.models.resume import (
     Resume, 
@@ -93,6 +95,13 @@ def calculate_certification_item_score(cert: CertificationItem) -> float:
         score += 40
     return score
 
+def scoring_rules_version() -> str:
+    """
+    Fingerprint of SCORING_RULES; stored results scored under other rules are re-scored.
+    """
+    payload = json.dumps(SCORING_RULES, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
 def best_item_score(items: List, calc_func) -> float:
     """
     Compute the highest score among items using the provided calculation function.
@@ -2,17 +2,16 @@ from app.utils.openai_client import openai_client
 from dotenv import load_dotenv
 import os
 from app.models.resume import Resume
+from typing import Any, Dict, List, Optional
 
 load_dotenv()
 
-def evaluate_resume(resume: Resume, status: str) -> str:
+def build_evaluation_messages(resume: Resume, status: str) -> List[Dict[str, str]]:
     """
-    Evaluate a resume using OpenAI's API and provide reasoning for the status.
+    Build the chat messages asking for reasoning behind a resume's status.
     """
-    client = openai_client.get_client()
-    
     prompt = f"""Please provide detailed reasoning for why this resume received a {status} status:
-    {resume}
+    {format_resume_for_evaluation(resume)}
     
     Provide specific reasons based on:
     - Education quality and relevance
@@ -23,19 +22,51 @@ def evaluate_resume(resume: Resume, status: str) -> str:
     
     Be concise but specific, focusing on key decision factors.
     """
+    return [
+        {"role": "system", "content": "You are a professional resume evaluator. Provide specific reasoning for the evaluation status."},
+        {"role": "user", "content": prompt}
+    ]
+
+def evaluate_resume(resume: Resume, status: str) -> str:
+    """
+    Evaluate a resume using OpenAI's API and provide reasoning for the status.
+    """
+    client = openai_client.get_client()
     
     response = client.chat.completions.create(
         model="gpt-4o",  
-        messages=[
-            {"role": "system", "content": "You are a professional resume evaluator. Provide specific reasoning for the evaluation status."},
-            {"role": "user", "content": prompt}
-        ],
+        messages=build_evaluation_messages(resume, status),
         max_tokens=1000,
         temperature=0
     )
     
     return response.choices[0].message.content
 
+async def evaluate_resume_async(resume: Resume, status: str) -> str:
+    """
+    Async variant of evaluate_resume.
+    """
+    client = openai_client.get_async_client()
+    
+    response = await client.chat.completions.create(
+        model="gpt-4o",  
+        messages=build_evaluation_messages(resume, status),
+        max_tokens=1000,
+        temperature=0
+    )
+    
+    return response.choices[0].message.content
+
+def reason_from_analysis(analysis: Dict[str, Any], score_result: Dict[str, Any]) -> Optional[str]:
+    """
+    Build the status reasoning from the evaluation the extraction call already
+    wrote, so no second LLM call is needed. Returns None when there is none.
+    """
+    evaluation = (analysis or {}).get("evaluation")
+    if not evaluation or evaluation == "Unable to generate evaluation.":
+        return None
+    return f"Status: {score_result['status']} (total score {score_result['total_score']:.1f}/100).\n{evaluation}"
+
 def format_resume_for_evaluation(resume: Resume) -> str:
     """
     Format the resume into a text string for evaluation.
@@ -1,24 +1,45 @@
-from app.utils.openai_client import openai_client
+from app.utils.openai_client import openai_client, PRIORITY_BACKGROUND
 from dotenv import load_dotenv
 import os
 from app.models.resume import Resume
+from typing import Dict, List
 
 load_dotenv()
 
+def build_summary_messages(resume: Resume) -> List[Dict[str, str]]:
+    """
+    Build the chat messages for a resume summary.
+    """
+    prompt = f"Please summarize the following resume:\n{resume}"
+    return [
+        {"role": "system", "content": "You are a professional resume reviewer. Summarize the key points of the resume concisely."},
+        {"role": "user", "content": prompt}
+    ]
+
 def summarize_resume(resume: Resume) -> str:
     """
     Summarize a resume using OpenAI's API.
     """
-    client = openai_client.get_client()
-    
-    prompt = f"Please summarize the following resume:\n{resume}"
+    client = openai_client.get_client(PRIORITY_BACKGROUND)
     
     response = client.chat.completions.create(
         model="gpt-4o",  
-        messages=[
-            {"role": "system", "content": "You are a professional resume reviewer. Summarize the key points of the resume concisely."},
-            {"role": "user", "content": prompt}
-        ],
+        messages=build_summary_messages(resume),
+        max_tokens=500,
+        temperature=0.7
+    )
+    
+    return response.choices[0].message.content
+
+async def summarize_resume_async(resume: Resume) -> str:
+    """
+    Async variant of summarize_resume.
+    """
+    client = openai_client.get_async_client(PRIORITY_BACKGROUND)
+    
+    response = await client.chat.completions.create(
+        model="gpt-4o",  
+        messages=build_summary_messages(resume),
         max_tokens=500,
         temperature=0.7
     )
@@ -1,12 +1,19 @@
 import requests
 import json
 from pathlib import Path
+import hashlib
 import logging
 import mimetypes
+import threading
 import time
 from typing import Optional, Dict, Any
 import sys
 
+# Run as a script (python app/test_api.py), the repository root is not on sys.path.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.utils.result_store import ResultStore
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,6 +29,8 @@ class CVAPITester:
     def __init__(self, api_url: str = "http://localhost:8000/api/evaluate-cv"):
         self.api_url = api_url
         self.session = requests.Session()
+        self._stores: Dict[Path, ResultStore] = {}
+        self._stores_lock = threading.Lock()
 
     def validate_file(self, file_path: Path) -> bool:
         """
@@ -106,23 +115,39 @@ class CVAPITester:
                     
         return None
 
-    def save_result(self, result: Dict[str, Any], output_dir: Path) -> None:
+    def save_result(self, result: Dict[str, Any], output_dir: Path, file_path: Optional[Path] = None) -> None:
         """
-        Save API response to JSON file.
+        Save an API response to the result store in output_dir (results.sqlite3).
+        Results are keyed by the CV file's hash, so re-running a CV replaces
+        its result; writes are batched, call close() when done.
         """
         try:
-            output_dir.mkdir(parents=True, exist_ok=True)
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            output_file = output_dir / f"cv_result_{timestamp}.json"
-            
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
-                
-            logger.info(f"Results saved to: {output_file}")
-            
+            if file_path is not None:
+                file_hash = hashlib.sha256(file_path.read_bytes()).hexdigest()
+            else:
+                file_hash = hashlib.sha256(json.dumps(result, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+            self._result_store(output_dir).save(result, file_hash)
+            logger.info(f"Result for {result.get('file_name')} saved to: {output_dir / 'results.sqlite3'}")
+
         except Exception as e:
             logger.error(f"Error saving results: {str(e)}")
 
+    def _result_store(self, output_dir: Path) -> ResultStore:
+        with self._stores_lock:
+            store = self._stores.get(output_dir)
+            if store is None:
+                output_dir.mkdir(parents=True, exist_ok=True)
+                store = self._stores[output_dir] = ResultStore(path=str(output_dir / "results.sqlite3"))
+            return store
+
+    def close(self) -> None:
+        """
+        Write any buffered results.
+        """
+        with self._stores_lock:
+            for store in self._stores.values():
+                store.close()
+
 def main():
     """
     Main function to test the CV evaluation API.
@@ -148,7 +173,8 @@ def main():
         
         if result:
             # Save results
-            tester.save_result(result, output_dir)
+            tester.save_result(result, output_dir, cv_path)
+            tester.close()
             
             # Print key information
             print("\nCV Processing Results:")
@@ -0,0 +1,64 @@
+import pytest
+
+from app.utils.extraction_cache import ExtractionCache
+
+@pytest.fixture(autouse=True)
+def isolated_extraction_cache(tmp_path, monkeypatch):
+    """
+    Give every test its own empty extraction cache so results never leak
+    between tests or into the developer's local cache.
+    """
+    cache = ExtractionCache(path=str(tmp_path / "extraction_cache.sqlite3"))
+    monkeypatch.setattr("app.modules.document_extraction.extractor.extraction_cache", cache)
+    return cache
+
+@pytest.fixture(autouse=True)
+def isolated_embedding_cache(tmp_path, monkeypatch):
+    """
+    Point the embedding cache at a per-test directory.
+    """
+    from app.modules.embedding import cache
+    monkeypatch.setattr(cache, "EMBEDDING_CACHE_DIR", str(tmp_path / "embeddings"))
+    monkeypatch.setattr(cache, "_caches", {})
+
+@pytest.fixture(autouse=True)
+def isolated_entity_memo(tmp_path, monkeypatch):
+    """
+    Keep memoized entity scores in a per-test database.
+    """
+    from app.utils.entity_memo import entity_memo
+    monkeypatch.setattr(entity_memo, "path", str(tmp_path / "entity_scores.sqlite3"))
+    monkeypatch.setattr(entity_memo, "_conn", None)
+    return entity_memo
+
+@pytest.fixture(autouse=True)
+def isolated_job_queue(tmp_path, monkeypatch):
+    """
+    Keep queued jobs in a per-test database.
+    """
+    from app.modules.batch.job_queue import job_queue
+    monkeypatch.setattr(job_queue, "path", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(job_queue, "_conn", None)
+    return job_queue
+
+@pytest.fixture(autouse=True)
+def isolated_result_store(tmp_path, monkeypatch):
+    """
+    Store evaluation results in a per-test database.
+    """
+    from app.utils.result_store import result_store
+    monkeypatch.setattr(result_store, "path", str(tmp_path / "results.sqlite3"))
+    monkeypatch.setattr(result_store, "_conn", None)
+    monkeypatch.setattr(result_store, "_pending", [])
+    monkeypatch.setattr(result_store, "_timer", None)
+    return result_store
+
+@pytest.fixture(autouse=True)
+def isolated_near_duplicates(tmp_path, monkeypatch):
+    """
+    Fingerprint CVs into a per-test near-duplicate index.
+    """
+    from app.utils.near_duplicates import near_duplicates
+    monkeypatch.setattr(near_duplicates, "path", str(tmp_path / "near_duplicates.sqlite3"))
+    monkeypatch.setattr(near_duplicates, "_conn", None)
+    return near_duplicates
@@ -0,0 +1,37 @@
+import asyncio
+import time
+
+from app.modules.document_extraction.extractor import extract_text_from_pdf
+from app.modules.pipeline import evaluate_cv_async
+from app.utils.openai_client import openai_client
+from benchmarks.fake_openai import FakeAsyncOpenAI
+from benchmarks.synthetic import make_pdf_bytes, sample_cv_text
+
+def _write_pdf(tmp_path, name="cv.pdf"):
+    path = tmp_path / name
+    path.write_bytes(make_pdf_bytes([sample_cv_text()]))
+    return str(path)
+
+def test_synthetic_pdf_is_readable(tmp_path):
+    text = extract_text_from_pdf(_write_pdf(tmp_path))
+    assert "EXPERIENCE" in text
+    assert "FPT Software" in text
+
+def test_evaluate_cv_async_runs_concurrently(tmp_path, monkeypatch):
+    fake = FakeAsyncOpenAI(latency=0.2)
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    pdf_path = _write_pdf(tmp_path)
+
+    async def run_many():
+        return await asyncio.gather(*(evaluate_cv_async(pdf_path, f"cv_{i}.pdf") for i in range(8)))
+
+    start = time.perf_counter()
+    results = asyncio.run(run_many())
+    elapsed = time.perf_counter() - start
+
+    # Two LLM calls per CV at 0.2s each; run serially this would take 3.2s.
+    assert elapsed < 1.5
+    assert len(fake.calls) == 16
+    assert [r["file_name"] for r in results] == [f"cv_{i}.pdf" for i in range(8)]
+    assert results[0]["cv_data"]["professional_experience"][0]["company"] == "FPT Software"
+    assert results[0]["status"] in ("Pass", "Consider", "Fail")
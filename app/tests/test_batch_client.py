@@ -0,0 +1,65 @@
+import asyncio
+
+import httpx
+
+from batch_process import AIMDLimiter, AsyncBatchClient, Progress, iter_pdf_files, parse_retry_after
+from app.utils.result_store import ResultStore
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+def test_aimd_increases_additively_and_halves_once_per_cooldown():
+    limiter = AIMDLimiter(initial=4, maximum=8)
+    for _ in range(4):
+        limiter.on_success(0.1)
+    assert 4.9 < limiter.limit < 5.0
+
+    limiter.on_overload(cooldown=60)
+    halved = limiter.limit
+    limiter.on_overload(cooldown=60)
+    assert halved == limiter.limit
+    assert 2.4 < halved < 2.5
+
+def test_aimd_backs_off_when_latency_climbs():
+    limiter = AIMDLimiter(initial=10, latency_tolerance=2.0)
+    for _ in range(5):
+        limiter.on_success(0.1)
+    before = limiter.limit
+    for _ in range(10):
+        limiter.on_success(1.0)
+    assert limiter.limit < before
+
+def test_client_honors_retry_after_and_processes_every_file(tmp_path):
+    for i in range(12):
+        (tmp_path / f"cv_{i}.pdf").write_bytes(f"%PDF-1.4 {i}".encode())
+    (tmp_path / "notes.txt").write_text("skip me")
+    state = {"requests": 0, "in_flight": 0, "peak": 0}
+
+    async def handler(request):
+        state["requests"] += 1
+        if state["requests"] <= 3:
+            return httpx.Response(429, headers={"Retry-After": "0.05"})
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        name = request.content.split(b'filename="')[1].split(b'"')[0].decode()
+        return httpx.Response(200, json={
+            "file_name": name, "status": "Pass", "total_score": 80.0,
+            "scores": {}, "cv_data": {}, "processed_at": "2025-01-01T00:00:00",
+        })
+
+    store = ResultStore(path=str(tmp_path / "results.sqlite3"))
+    limiter = AIMDLimiter(initial=4, maximum=6)
+    client = AsyncBatchClient(api_url="http://api/api/evaluate-cv", limiter=limiter, backoff_base=0.01,
+                              transport=httpx.MockTransport(handler))
+    progress = asyncio.run(client.run(iter_pdf_files(str(tmp_path)), store, Progress(total=12), report_interval=60))
+
+    assert progress.done == 12 and progress.failed == 0
+    assert store.count() == 12
+    assert client.retries == 3
+    assert state["peak"] <= 6
+    assert limiter.in_flight == 0
@@ -0,0 +1,75 @@
+import asyncio
+import io
+import threading
+import time
+import zipfile
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.modules.batch.jobs import BatchJobManager, iter_zip_members
+from app.utils.openai_client import openai_client
+from benchmarks.fake_openai import FakeAsyncOpenAI
+from benchmarks.synthetic import make_pdf_bytes, sample_cv_text
+
+def _zip_of_pdfs(count):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for i in range(count):
+            archive.writestr(f"cvs/cv_{i}.pdf", make_pdf_bytes([sample_cv_text(i)]))
+        archive.writestr("cvs/readme.txt", "not a cv")
+    return buffer.getvalue()
+
+def _poll(client, job_id, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        body = client.get(f"/api/jobs/{job_id}").json()
+        if body["status"] == "completed":
+            return body
+        time.sleep(0.05)
+    raise AssertionError("job did not finish")
+
+def test_iter_zip_members_skips_non_pdf():
+    names = [name for name, _ in iter_zip_members(_zip_of_pdfs(2))]
+    assert names == ["cv_0.pdf", "cv_1.pdf"]
+
+def test_batch_endpoint_with_pdfs_and_zip(monkeypatch):
+    fake = FakeAsyncOpenAI(latency=0.01)
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    monkeypatch.setattr(main, "batch_jobs", BatchJobManager(max_concurrency=2))
+
+    with TestClient(main.app) as client:
+        response = client.post("/api/evaluate-cv/batch", files=[
+            ("files", ("single.pdf", io.BytesIO(make_pdf_bytes([sample_cv_text(9)])), "application/pdf")),
+            ("files", ("bundle.zip", io.BytesIO(_zip_of_pdfs(3)), "application/zip")),
+        ])
+        assert response.status_code == 202
+        assert response.json()["total"] == 4
+
+        body = _poll(client, response.json()["job_id"])
+
+    assert body["completed"] == 4
+    assert body["failed"] == 0
+    assert [r["file_name"] for r in body["results"]] == ["single.pdf", "cv_0.pdf", "cv_1.pdf", "cv_2.pdf"]
+    assert all(r["result"]["status"] in ("Pass", "Consider", "Fail") for r in body["results"])
+
+def test_unknown_job_returns_404():
+    client = TestClient(main.app)
+    assert client.get("/api/jobs/missing").status_code == 404
+
+def test_submit_reads_files_off_the_event_loop(monkeypatch):
+    loader_threads = []
+
+    def loader():
+        loader_threads.append(threading.get_ident())
+        return make_pdf_bytes([sample_cv_text(11)])
+
+    async def submit():
+        manager = BatchJobManager(max_concurrency=1)
+        job = await manager.submit([("cv.pdf", loader)])
+        await manager.worker.stop()
+        return job, threading.get_ident()
+
+    job, loop_thread = asyncio.run(submit())
+    assert job.to_dict()["total"] == 1
+    assert loader_threads and loop_thread not in loader_threads
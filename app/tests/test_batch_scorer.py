@@ -0,0 +1,37 @@
+from app.models.resume import Resume, EducationItem
+from app.models.scoring_rules import SCORING_RULES
+from app.modules.scoring.batch_scorer import calculate_total_scores_batch
+from app.modules.scoring.scorer import calculate_total_score
+from benchmarks.synthetic_resumes import random_resumes
+
+def test_batch_matches_per_resume_scores():
+    resumes = random_resumes(2000, seed=1) + [Resume(), Resume(education=[EducationItem(school="HUST", gpa=-4.0)])]
+
+    batch = calculate_total_scores_batch(resumes).to_dicts()
+
+    assert batch == [calculate_total_score(resume) for resume in resumes]
+
+def test_batch_accepts_stored_dicts():
+    resumes = random_resumes(200, seed=2)
+    from_objects = calculate_total_scores_batch(resumes).to_dicts()
+    from_dicts = calculate_total_scores_batch([resume.dict() for resume in resumes]).to_dicts()
+    assert from_dicts == from_objects
+
+def test_empty_batch():
+    assert calculate_total_scores_batch([]).to_dicts() == []
+
+def test_unparseable_gpa_in_stored_dict_scores_like_missing():
+    stored = Resume(education=[EducationItem(school="HUST", class_year="2022", major="CS")]).dict()
+    stored["education"][0]["gpa"] = "n/a"
+    assert calculate_total_scores_batch([stored]).to_dicts()[0]["scores"]["education"] == 90.0
+
+def test_batch_matches_per_resume_scores_with_fractional_points(monkeypatch):
+    monkeypatch.setitem(SCORING_RULES["education"], "school", 12.5)
+    monkeypatch.setitem(SCORING_RULES["education"], "class_year", 27.25)
+    monkeypatch.setitem(SCORING_RULES["education"], "major", 30.75)
+    resumes = random_resumes(500, seed=3)
+
+    batch = calculate_total_scores_batch(resumes).to_dicts()
+
+    assert batch == [calculate_total_score(resume) for resume in resumes]
+    assert any(result["scores"]["education"] % 1 for result in batch)
@@ -0,0 +1,36 @@
+import pytest
+
+from app.modules.document_extraction.extractor import build_resume, extract_text_from_pdf_bytes
+from app.modules.document_extraction.ocr import parse_extraction_response
+from benchmarks.bench_stages import STAGES, compare, run_stages
+from benchmarks.cv_corpus import generate_corpus
+
+def test_corpus_is_deterministic_and_sized():
+    first = generate_corpus(3, items=4, seed=7)
+    second = generate_corpus(3, items=4, seed=7)
+    assert [cv.llm_json for cv in first] == [cv.llm_json for cv in second]
+    assert len(first[0].payload["extracted_data"]["professional_experience"]) == 4
+    assert "KINH NGHIỆM LÀM VIỆC" in first[0].text and "EXPERIENCE" in first[1].text
+    with pytest.raises(ValueError):
+        generate_corpus(1, language="fr")
+
+def test_corpus_round_trips_through_the_pipeline_stages():
+    cv = generate_corpus(1, items=3, sentences=30)[0]
+    assert "candidate0@example.com" in extract_text_from_pdf_bytes(cv.pdf)
+    resume = build_resume(parse_extraction_response(cv.llm_json)["extracted_data"])
+    assert len(resume.projects) == 3
+
+def test_run_stages_reports_per_op_timings():
+    report = run_stages(generate_corpus(2), {name: STAGES[name] for name in ("total_score", "normalize_gpa")}, repeat=2, min_sample_seconds=0)
+    assert set(report) == {"total_score", "normalize_gpa"}
+    assert report["total_score"]["ops"] == 2
+    assert report["total_score"]["min_us_per_op"] <= report["total_score"]["median_us_per_op"]
+
+def test_compare_flags_only_meaningful_slowdowns():
+    baseline = {"stages": {"a": {"min_us_per_op": 10.0}, "b": {"min_us_per_op": 0.5}, "c": {"min_us_per_op": 10.0}}}
+    current = {"stages": {"a": {"min_us_per_op": 14.0}, "b": {"min_us_per_op": 0.9}, "c": {"min_us_per_op": 11.0}, "d": {"min_us_per_op": 1.0}}}
+    rows = {row["stage"]: row for row in compare(current, baseline, tolerance=0.25, min_delta_us=1.0)}
+    assert rows["a"]["regressed"]
+    assert not rows["b"]["regressed"]
+    assert not rows["c"]["regressed"]
+    assert "d" not in rows
@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+from app.modules.document_extraction import ocr
+from app.modules.document_extraction.compaction import compact_cv_text, count_tokens, merge_extractions, split_into_chunks
+from app.utils.openai_client import openai_client
+from benchmarks.fake_openai import FakeAsyncOpenAI
+from benchmarks.synthetic import sample_extraction_payload
+
+def test_compaction_drops_headers_footers_and_whitespace():
+    pages = [
+        f"Nguyen Van A - Curriculum Vitae\nJob history\nSection {i}   has    text\nResponsibilities:\n\n\n\nmore\nbody\nPage {i + 1} of 3"
+        for i in range(3)
+    ]
+    compacted = compact_cv_text("\f".join(pages))
+    assert compacted.count("Curriculum Vitae") == 1
+    assert compacted.count("Page") == 1
+    assert "Section 2 has text" in compacted
+    assert compacted.count("Responsibilities:") == 3
+    assert "\n\n\n" not in compacted
+
+def test_running_header_keeps_contact_details_once():
+    header = "Nguyen Van A | a@example.com | 0912345678"
+    pages = [f"{header}\nExperience\nBackend developer at {company}\nBuilt services and APIs for {company}" for company in ("Acme", "Globex")]
+    compacted = compact_cv_text("\f".join(pages))
+    assert compacted.startswith(header)
+    assert compacted.count(header) == 1
+    assert "Backend developer at Globex" in compacted
+
+def test_single_page_keeps_everything():
+    assert compact_cv_text("Name\n\nPage 1 of 1") == "Name\n\nPage 1 of 1"
+
+def test_split_respects_budget():
+    text = "\n\n".join(f"Project {i}: " + "word " * 200 for i in range(20))
+    chunks = split_into_chunks(text, max_tokens=1000)
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk) <= 1000 for chunk in chunks)
+    assert "".join(chunks).count("Project") == 20
+
+def test_merge_dedupes_and_keeps_first_scalars():
+    first = sample_extraction_payload(0)
+    second = sample_extraction_payload(0)
+    second["extracted_data"]["name"] = "Someone Else"
+    second["extracted_data"]["projects"].append({"name": "Extra", "tech": "Go", "duration": "", "description": "x"})
+    merged = merge_extractions([first, second])["extracted_data"]
+    assert merged["name"] == first["extracted_data"]["name"]
+    assert len(merged["projects"]) == len(first["extracted_data"]["projects"]) + 1
+
+def test_long_cv_is_extracted_in_parallel_chunks(monkeypatch):
+    fake = FakeAsyncOpenAI(latency=0.05)
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    monkeypatch.setattr(ocr, "EXTRACTION_INPUT_TOKEN_BUDGET", 500)
+    monkeypatch.setattr("app.modules.document_extraction.compaction.EXTRACTION_CHUNK_TOKENS", 500)
+    cv_text = "\n\n".join(f"Experience {i}: " + "built services " * 100 for i in range(8))
+    result = asyncio.run(ocr.extract_structured_data_from_cv_async(cv_text))
+    assert len(fake.calls) > 1
+    assert "part 1 of" in fake.calls[0]["messages"][1]["content"]
+    assert result["extracted_data"]["name"] != "Unknown"
+
+def test_streaming_a_long_cv_compacts_and_splits_it_once(monkeypatch):
+    fake = FakeAsyncOpenAI()
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    monkeypatch.setattr(ocr, "EXTRACTION_INPUT_TOKEN_BUDGET", 500)
+    monkeypatch.setattr("app.modules.document_extraction.compaction.EXTRACTION_CHUNK_TOKENS", 500)
+    prepared = []
+    original = ocr.prepare_extraction_chunks
+    monkeypatch.setattr(ocr, "prepare_extraction_chunks", lambda text: prepared.append(text) or original(text))
+    cv_text = "\n\n".join(f"Experience {i}: " + "built services " * 100 for i in range(8))
+
+    async def collect():
+        return [event async for event in ocr.stream_structured_data_from_cv_async(cv_text)]
+
+    events = asyncio.run(collect())
+    assert len(prepared) == 1
+    assert len(fake.calls) > 1
+    assert events[-1][0] == ()
@@ -0,0 +1,105 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    # test.py at the repository root; loaded by path because "test" is also a
+    # stdlib package, from tmp_path so its log file lands there.
+    monkeypatch.chdir(tmp_path)
+    spec = importlib.util.spec_from_file_location("cv_directory_processor", ROOT / "test.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def _fake_result(file_path):
+    name = Path(file_path).name
+    index = int(name.split("_")[1].split(".")[0])
+    return {
+        "file_name": name,
+        "scores": {"education": 10.0, "experience": 20.0, "projects": 0.0, "awards": 0.0, "certifications": 0.0, "total_score": float(index)},
+        "status": "Pass" if index % 2 else "Fail",
+    }
+
+def _make_cvs(directory, count):
+    directory.mkdir()
+    for i in range(count):
+        (directory / f"cv_{i}.pdf").write_bytes(b"%PDF-1.4")
+
+def _lines(output):
+    return [json.loads(line) for line in (output / "results.jsonl").read_text(encoding="utf-8").splitlines()]
+
+def test_streams_results_and_summary(tmp_path, processor, monkeypatch):
+    monkeypatch.setattr(processor, "process_cv", _fake_result)
+    _make_cvs(tmp_path / "cvs", 7)
+
+    report = processor.process_directory(str(tmp_path / "cvs"), str(tmp_path / "out"), max_workers=3, checkpoint_every=2)
+
+    assert sorted(line["source"] for line in _lines(tmp_path / "out")) == [f"cv_{i}.pdf" for i in range(7)]
+    assert report["total_cvs"] == 7
+    assert report["passed"] == 3
+    assert report["average_scores"]["total_score"] == pytest.approx(3.0)
+    saved = json.loads((tmp_path / "out" / "summary_report.json").read_text(encoding="utf-8"))
+    assert saved["total_cvs"] == 7 and "results" not in saved
+
+def test_rerun_after_crash_skips_checkpointed_files(tmp_path, processor, monkeypatch):
+    _make_cvs(tmp_path / "cvs", 10)
+    calls = []
+
+    def crashing(file_path):
+        calls.append(Path(file_path).name)
+        if len(calls) == 6:
+            raise KeyboardInterrupt
+        return _fake_result(file_path)
+
+    monkeypatch.setattr(processor, "process_cv", crashing)
+    with pytest.raises(KeyboardInterrupt):
+        processor.process_directory(str(tmp_path / "cvs"), str(tmp_path / "out"), max_workers=1, checkpoint_every=2)
+    checkpointed = set(json.loads((tmp_path / "out" / "checkpoint.json").read_text())["processed"])
+    assert len(checkpointed) == 4
+
+    calls.clear()
+    monkeypatch.setattr(processor, "process_cv", lambda path: calls.append(Path(path).name) or _fake_result(path))
+    report = processor.process_directory(str(tmp_path / "cvs"), str(tmp_path / "out"), max_workers=2, checkpoint_every=2)
+
+    assert not checkpointed & set(calls)
+    sources = [line["source"] for line in _lines(tmp_path / "out")]
+    assert sorted(sources) == sorted(f"cv_{i}.pdf" for i in range(10))
+    assert report["total_cvs"] == 10
+
+def test_errored_files_are_retried_on_rerun(tmp_path, processor, monkeypatch):
+    _make_cvs(tmp_path / "cvs", 4)
+
+    def flaky(file_path):
+        if Path(file_path).name == "cv_2.pdf":
+            return {"file_name": "cv_2.pdf", "error": "upstream unavailable", "status": "Error"}
+        return _fake_result(file_path)
+
+    monkeypatch.setattr(processor, "process_cv", flaky)
+    report = processor.process_directory(str(tmp_path / "cvs"), str(tmp_path / "out"), max_workers=2, checkpoint_every=2)
+    assert (report["total_cvs"], report["failed"]) == (4, 1)
+    assert "cv_2.pdf" not in json.loads((tmp_path / "out" / "checkpoint.json").read_text())["processed"]
+
+    calls = []
+    monkeypatch.setattr(processor, "process_cv", lambda path: calls.append(Path(path).name) or _fake_result(path))
+    report = processor.process_directory(str(tmp_path / "cvs"), str(tmp_path / "out"), max_workers=2, checkpoint_every=2)
+
+    assert calls == ["cv_2.pdf"]
+    assert (report["total_cvs"], report["successful"], report["failed"]) == (4, 4, 0)
+    assert [line["status"] for line in _lines(tmp_path / "out") if line["source"] == "cv_2.pdf"] == ["Error", "Fail"]
+
+def test_results_without_checkpoint_are_kept(tmp_path, processor, monkeypatch):
+    monkeypatch.setattr(processor, "process_cv", _fake_result)
+    _make_cvs(tmp_path / "cvs", 2)
+    (tmp_path / "out").mkdir()
+    (tmp_path / "out" / "results.jsonl").write_text('{"source": "earlier.pdf"}\n', encoding="utf-8")
+
+    processor.process_directory(str(tmp_path / "cvs"), str(tmp_path / "out"))
+
+    assert len(_lines(tmp_path / "out")) == 2
+    kept = [path for path in (tmp_path / "out").glob("results.*.jsonl")]
+    assert len(kept) == 1 and "earlier.pdf" in kept[0].read_text(encoding="utf-8")
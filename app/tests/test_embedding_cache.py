@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from app.modules.embedding.cache import EmbeddingCache
+
+def test_put_and_get_returns_memmap_views(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "rev-1", dim=4)
+    cache.put_many(["Python", "Data  scientist "], [[1, 2, 3, 4], [5, 6, 7, 8]])
+
+    python, data, missing = cache.get_many(["Python", "Data scientist", "Java"])
+    assert python.tolist() == [1, 2, 3, 4]
+    assert data.tolist() == [5, 6, 7, 8]
+    assert missing is None
+    assert isinstance(python.base, np.memmap) or isinstance(python, np.memmap)
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["entries"] == 2
+    assert stats["bytes_on_disk"] == 2 * 4 * 4 + 2 * 24
+
+def test_second_instance_sees_appends(tmp_path):
+    writer = EmbeddingCache(str(tmp_path), "rev-1", dim=2)
+    reader = EmbeddingCache(str(tmp_path), "rev-1", dim=2)
+    assert reader.get("aws") is None
+
+    writer.put_many(["aws"], [[0.5, 0.25]])
+    assert reader.get("aws").tolist() == [0.5, 0.25]
+
+def test_revision_separates_entries(tmp_path):
+    EmbeddingCache(str(tmp_path), "rev-1", dim=2).put_many(["aws"], [[1, 1]])
+    assert EmbeddingCache(str(tmp_path), "rev-2", dim=2).get("aws") is None
+
+def test_compaction_keeps_newest_and_invalidates_other_readers(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "rev-1", dim=2)
+    other = EmbeddingCache(str(tmp_path), "rev-1", dim=2)
+    cache.put_many(["a", "b", "c"], [[1, 1], [2, 2], [3, 3]])
+    other.get("a")
+
+    dropped = cache.compact(max_entries=2)
+    cache.put_many(["d"], [[4, 4]])
+
+    assert dropped == 1
+    assert cache.get("a") is None
+    assert cache.get("c").tolist() == [3, 3]
+    assert other.get("d").tolist() == [4, 4]
+    assert other.get("b").tolist() == [2, 2]
+    assert cache.stats()["entries"] == 3
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    EmbeddingCache(str(tmp_path), "rev-1", dim=2)
+    with pytest.raises(ValueError):
+        EmbeddingCache(str(tmp_path), "rev-1", dim=3)
@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("transformers")
+
+from app.modules.embedding.embedder import get_embeddings, length_buckets
+from app.modules.embedding.model_registry import ModelRegistry, model_registry
+from benchmarks.tiny_model import build_tiny_model
+
+@pytest.fixture
+def tiny_model(tmp_path):
+    path = build_tiny_model(str(tmp_path / "tiny"))
+    yield path
+    model_registry.clear()
+
+def test_length_buckets_groups_similar_lengths():
+    buckets = length_buckets([5, 1, 9, 2, 8], batch_size=2)
+    assert buckets == [[1, 3], [0, 4], [2]]
+
+def test_registry_loads_once_in_eval_mode(tiny_model):
+    registry = ModelRegistry()
+    first = registry.get(tiny_model)
+    assert registry.get(tiny_model) is first
+    assert not first.model.training
+
+def test_embeddings_independent_of_batching(tiny_model):
+    texts = ["python", "senior backend engineer java sql docker cloud", "data scientist", "aws"]
+    one_batch = get_embeddings(texts, batch_size=8, model_name=tiny_model)
+    small_batches = get_embeddings(texts, batch_size=1, model_name=tiny_model)
+
+    assert len(one_batch) == len(texts)
+    for a, b in zip(one_batch, small_batches):
+        assert a == pytest.approx(b, abs=1e-5)
+    assert get_embeddings([], model_name=tiny_model) == []
+
+def test_get_embeddings_reuses_cached_vectors(tiny_model, monkeypatch):
+    from app.modules.embedding import embedder
+
+    first = get_embeddings(["python developer", "aws"], model_name=tiny_model)
+    monkeypatch.setattr(embedder, "encode_texts", lambda *args: pytest.fail("should be cached"))
+    second = get_embeddings(["aws", "python  developer"], model_name=tiny_model)
+
+    assert second[0] == pytest.approx(first[1])
+    assert second[1] == pytest.approx(first[0])
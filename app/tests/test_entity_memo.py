@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from app.models.resume import Resume
+from app.modules.scoring import awards
+from app.utils.entity_memo import collect_entities, resolve_entity_scores, resolve_entity_scores_async
+from app.utils.openai_client import openai_client
+from benchmarks.fake_openai import FakeAsyncOpenAI, FakeOpenAI
+
+def _resume():
+    return Resume(**{
+        "education": [{"school": "HUST", "class_year": "Senior", "major": "CS", "gpa": 3.5}],
+        "professional_experience": [
+            {"company": "FPT Software", "location": "Hanoi", "position": "Intern", "seniority": "Intern", "duration": "2023", "description": "x"},
+            {"company": "Tiny Local Shop", "location": "Hanoi", "position": "Dev", "seniority": "Junior", "duration": "2024", "description": "y"},
+        ],
+        "projects": [{"name": "P", "link": "", "tech": "Rust, WASM", "duration": "", "description": "z"}],
+        "awards": [{"contest": "ICPC Regional", "prize": "Gold", "description": "", "role": "", "link": "", "time": ""}],
+        "certifications": [{"name": "AWS Certified Solutions Architect", "link": "", "org": "AWS"}],
+    })
+
+def test_bulk_resolution_uses_one_call_then_memo(monkeypatch):
+    fake = FakeOpenAI()
+    monkeypatch.setattr(openai_client, "get_client", lambda *args: fake)
+    entities = collect_entities([_resume(), _resume()])
+
+    scores = resolve_entity_scores(entities)
+    assert len(fake.calls) == 1
+    assert scores["university"]["HUST"] == 20
+    assert scores["company"]["FPT Software"] == 20
+    assert scores["company"]["Tiny Local Shop"] == 15
+    assert scores["certification"]["AWS Certified Solutions Architect"] == 15
+
+    again = resolve_entity_scores(entities)
+    assert again == scores
+    assert len(fake.calls) == 1
+
+def test_infer_functions_read_bulk_results(monkeypatch):
+    fake = FakeAsyncOpenAI()
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    monkeypatch.setattr(openai_client, "get_client", lambda *args: FakeOpenAI(responder=lambda *a, **k: "3"))
+
+    asyncio.run(resolve_entity_scores_async({"contest": ["ICPC Regional"]}))
+    assert len(fake.calls) == 1
+    assert awards.infer_contest_prestige("icpc  regional") == 15
+    assert awards.infer_contest_prestige("Unlisted Hackathon") == 3
+    assert awards.infer_contest_prestige("Unlisted Hackathon") == 3
+
+def test_unparseable_reply_falls_back_without_memoizing(monkeypatch):
+    fake = FakeOpenAI(responder=lambda *a, **k: "not json")
+    monkeypatch.setattr(openai_client, "get_client", lambda *args: fake)
+    assert resolve_entity_scores({"contest": ["Mystery Cup"]}) == {"contest": {"Mystery Cup": 10}}
+    resolve_entity_scores({"contest": ["Mystery Cup"]})
+    assert len(fake.calls) == 2
+
+def test_sync_and_async_infer_send_the_same_request(monkeypatch):
+    sync_fake = FakeOpenAI(responder=lambda *a, **k: "40")
+    async_fake = FakeAsyncOpenAI(responder=lambda *a, **k: "40")
+    monkeypatch.setattr(openai_client, "get_client", lambda *args: sync_fake)
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: async_fake)
+
+    assert awards.infer_contest_prestige("Galaxy Cup") == 30
+    assert asyncio.run(awards.infer_contest_prestige_async("Nebula Cup")) == 30
+    assert asyncio.run(awards.infer_contest_prestige_async("Galaxy Cup")) == 30
+
+    assert len(async_fake.calls) == 1
+    sync_call, async_call = sync_fake.calls[0], async_fake.calls[0]
+    assert sync_call["model"] == async_call["model"] == "gpt-4"
+    assert sync_call["messages"][0] == async_call["messages"][0]
+    assert sync_call["messages"][1]["content"].replace("Galaxy", "Nebula") == async_call["messages"][1]["content"]
+
+def test_scoring_resolves_entities_in_the_background(monkeypatch):
+    from app.modules import pipeline
+    from app.utils.entity_memo import entity_memo
+
+    fake = FakeAsyncOpenAI()
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    monkeypatch.setattr(pipeline, "ENTITY_RESOLVE_ENABLED", True)
+
+    async def score_and_drain():
+        score_result = await pipeline.score_resume_async(_resume())
+        await asyncio.gather(*pipeline._entity_tasks)
+        return score_result
+
+    score_result = asyncio.run(score_and_drain())
+    assert "entity_scores" not in score_result
+    assert score_result["total_score"] > 0
+    assert len(fake.calls) == 1
+    assert "You score entities" in fake.calls[0]["messages"][0]["content"]
+    assert entity_memo.get("company", "Tiny Local Shop") == 15
+
+    asyncio.run(score_and_drain())
+    assert len(fake.calls) == 1
+
+def test_resolution_errors_outside_the_llm_call_propagate(monkeypatch):
+    def broken(*args, **kwargs):
+        raise KeyError("scales")
+
+    monkeypatch.setattr("app.utils.entity_memo.build_bulk_messages", broken)
+    monkeypatch.setattr(openai_client, "get_client", lambda *args: FakeOpenAI())
+    with pytest.raises(KeyError):
+        resolve_entity_scores({"contest": ["Mystery Cup"]})
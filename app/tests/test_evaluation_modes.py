@@ -0,0 +1,33 @@
+import asyncio
+
+from app.modules import pipeline
+from app.utils.openai_client import openai_client
+from benchmarks.fake_openai import FakeAsyncOpenAI
+from benchmarks.synthetic import make_pdf_bytes, sample_cv_text, sample_extraction_payload
+
+def test_single_call_mode_reuses_extraction_evaluation(monkeypatch):
+    fake = FakeAsyncOpenAI()
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    monkeypatch.setattr(pipeline, "EVALUATION_MODE", "single_call")
+    pdf = make_pdf_bytes([sample_cv_text()])
+
+    result = asyncio.run(pipeline.evaluate_cv_bytes_async(pdf, "cv.pdf"))
+    assert len(fake.calls) == 1
+    assert result["ai_reason"].startswith(f"Status: {result['status']}")
+    assert sample_extraction_payload()["evaluation"] in result["ai_reason"]
+
+    # A cache hit still has the evaluation, so it costs no calls at all.
+    asyncio.run(pipeline.evaluate_cv_bytes_async(pdf, "cv.pdf"))
+    assert len(fake.calls) == 1
+
+def test_two_call_mode_sends_compact_resume(monkeypatch):
+    fake = FakeAsyncOpenAI()
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    monkeypatch.setattr(pipeline, "EVALUATION_MODE", "two_call")
+    pdf = make_pdf_bytes([sample_cv_text()])
+
+    asyncio.run(pipeline.evaluate_cv_bytes_async(pdf, "cv.pdf"))
+    assert len(fake.calls) == 2
+    prompt = fake.calls[1]["messages"][1]["content"]
+    assert "Education:\n- " in prompt
+    assert "EducationItem(" not in prompt and "school=" not in prompt
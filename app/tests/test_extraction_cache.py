@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+from app.models.resume import Resume
+from app.modules.document_extraction import extractor, pdf_text
+from app.utils.extraction_cache import ExtractionCache
+from app.utils.openai_client import openai_client
+from benchmarks.fake_openai import FakeAsyncOpenAI
+from benchmarks.synthetic import make_pdf_bytes, sample_cv_text
+
+def test_put_get_and_prompt_version(tmp_path):
+    cache = ExtractionCache(path=str(tmp_path / "c.sqlite3"))
+    cache.put("abc", "v1", "cv text", Resume(name="An"), text_version="t1")
+
+    hit = cache.get("abc", "v1")
+    assert hit.cv_text == "cv text"
+    assert hit.resume.name == "An"
+    # A new prompt version misses, but the extracted text is still reusable.
+    assert cache.get("abc", "v2") is None
+    assert cache.get_text("abc", "t1") == "cv text"
+    # Text read under other PDF text settings is not reused.
+    assert cache.get_text("abc", "t2") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_ttl_expiry(tmp_path):
+    cache = ExtractionCache(path=str(tmp_path / "c.sqlite3"), ttl_seconds=0)
+    cache.put("abc", "v1", "cv text", Resume())
+    time.sleep(0.01)
+    assert cache.get("abc", "v1") is None
+
+def test_lru_eviction(tmp_path):
+    cache = ExtractionCache(path=str(tmp_path / "c.sqlite3"), max_entries=2)
+    cache.put("a", "v1", "text a", Resume())
+    cache.put("b", "v1", "text b", Resume())
+    cache.get("a", "v1")
+    cache.put("c", "v1", "text c", Resume())
+
+    assert cache.get("b", "v1") is None
+    assert cache.get("a", "v1") is not None
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["evictions"] == 1
+
+def test_repeat_upload_skips_llm(tmp_path, monkeypatch):
+    fake = FakeAsyncOpenAI()
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    pdf_path = tmp_path / "cv.pdf"
+    pdf_path.write_bytes(make_pdf_bytes([sample_cv_text()]))
+
+    first = asyncio.run(extractor.extract_resume_async(str(pdf_path)))
+    second = asyncio.run(extractor.extract_resume_async(str(pdf_path)))
+
+    assert len(fake.calls) == 1
+    assert second == first
+
+def test_prompt_change_invalidates(tmp_path, monkeypatch):
+    fake = FakeAsyncOpenAI()
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    pdf_path = tmp_path / "cv.pdf"
+    pdf_path.write_bytes(make_pdf_bytes([sample_cv_text()]))
+
+    asyncio.run(extractor.extract_resume_async(str(pdf_path)))
+    monkeypatch.setattr(extractor, "extraction_prompt_version", lambda: "changed")
+    asyncio.run(extractor.extract_resume_async(str(pdf_path)))
+
+    assert len(fake.calls) == 2
+
+def test_pdf_text_settings_invalidate(tmp_path, monkeypatch):
+    fake = FakeAsyncOpenAI()
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    pdf_path = tmp_path / "cv.pdf"
+    pdf_path.write_bytes(make_pdf_bytes([sample_cv_text()]))
+
+    asyncio.run(extractor.extract_resume_async(str(pdf_path)))
+    version = extractor.extraction_prompt_version()
+    monkeypatch.setattr(pdf_text, "PDF_MAX_PAGES", 1)
+    assert extractor.extraction_prompt_version() != version
+    asyncio.run(extractor.extract_resume_async(str(pdf_path)))
+
+    assert len(fake.calls) == 2
+    # The PDF was read again instead of reusing text cut under the old budget.
+    assert extractor.extraction_cache.text_hits == 0
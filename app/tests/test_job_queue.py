@@ -0,0 +1,188 @@
+import asyncio
+import io
+import time
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.modules.batch import job_queue as job_queue_module
+from app.modules.batch.job_queue import (
+    DONE,
+    ERROR,
+    PENDING,
+    STAGE_DONE,
+    STAGE_EXTRACTED,
+    STAGE_QUEUED,
+    STAGE_SCORED,
+    STAGE_TEXT,
+    JobQueue,
+    JobWorker,
+)
+from app.utils.openai_client import openai_client
+from benchmarks.fake_openai import FakeAsyncOpenAI, default_responder
+from benchmarks.synthetic import make_pdf_bytes, sample_cv_text
+
+def _extraction_calls(fake):
+    return sum(1 for call in fake.calls if "CV parser" in call["messages"][0]["content"])
+
+def _failing_reasoning(failures):
+    # Fail the status reasoning call `failures` times, answer everything else.
+    state = {"left": failures}
+
+    def responder(messages, **kwargs):
+        if "CV parser" not in messages[0]["content"] and "score" not in messages[0]["content"].lower() and state["left"]:
+            state["left"] -= 1
+            raise RuntimeError("upstream unavailable")
+        return default_responder(messages, **kwargs)
+    return responder
+
+def test_submit_deduplicates_by_file_hash(tmp_path):
+    queue = JobQueue(path=str(tmp_path / "jobs.sqlite3"))
+    pdf = make_pdf_bytes([sample_cv_text(1)])
+
+    first = queue.submit(pdf, "a.pdf")
+    second = queue.submit(pdf, "b.pdf")
+    other = queue.submit(make_pdf_bytes([sample_cv_text(2)]), "c.pdf")
+
+    assert first.id == second.id
+    assert other.id != first.id
+    assert queue.stats() == {PENDING: 2}
+
+def test_failed_job_resumes_from_last_stage(tmp_path, monkeypatch):
+    fake = FakeAsyncOpenAI(responder=_failing_reasoning(1))
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    queue = JobQueue(path=str(tmp_path / "jobs.sqlite3"), retry_delay=0)
+    worker = JobWorker(queue=queue)
+    job = queue.submit(make_pdf_bytes([sample_cv_text(3)]), "cv.pdf")
+
+    failed = asyncio.run(worker.run_job(job.id))
+    assert failed.status == PENDING
+    assert failed.stage == STAGE_SCORED
+    assert "upstream unavailable" in failed.error
+    assert _extraction_calls(fake) == 1
+    # The upload is dropped once its text is extracted.
+    assert queue.data(job.id) is None
+
+    done = asyncio.run(worker.run_job(job.id))
+    assert done.status == DONE
+    assert done.stage == STAGE_DONE
+    assert done.result["status"] in ("Pass", "Consider", "Fail")
+    # The retry started after scoring: no second extraction call.
+    assert _extraction_calls(fake) == 1
+
+def test_failed_extraction_call_fails_the_job(tmp_path, monkeypatch):
+    def responder(messages, **kwargs):
+        if "CV parser" in messages[0]["content"]:
+            raise RuntimeError("upstream unavailable")
+        return default_responder(messages, **kwargs)
+
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: FakeAsyncOpenAI(responder=responder))
+    queue = JobQueue(path=str(tmp_path / "jobs.sqlite3"), retry_delay=0)
+    job = queue.submit(make_pdf_bytes([sample_cv_text(6)]), "cv.pdf")
+
+    failed = asyncio.run(JobWorker(queue=queue).run_job(job.id))
+    # Retried later from the text, instead of scoring an empty default resume.
+    assert failed.status == PENDING
+    assert failed.stage == STAGE_TEXT
+    assert failed.result is None
+
+def test_job_gives_up_after_max_attempts(tmp_path, monkeypatch):
+    fake = FakeAsyncOpenAI(responder=_failing_reasoning(10))
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    queue = JobQueue(path=str(tmp_path / "jobs.sqlite3"), max_attempts=2, retry_delay=0)
+    worker = JobWorker(queue=queue)
+    job = queue.submit(make_pdf_bytes([sample_cv_text(4)]), "cv.pdf")
+
+    asyncio.run(worker.run_job(job.id))
+    assert asyncio.run(worker.run_job(job.id)).status == ERROR
+
+    # Submitting the same file again gives it a fresh set of attempts.
+    assert queue.submit(make_pdf_bytes([sample_cv_text(4)]), "cv.pdf").status == PENDING
+
+def test_expired_lease_is_reclaimed(tmp_path, monkeypatch):
+    fake = FakeAsyncOpenAI()
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    queue = JobQueue(path=str(tmp_path / "jobs.sqlite3"), lease_seconds=0.2)
+    job = queue.submit(make_pdf_bytes([sample_cv_text(5)]), "cv.pdf")
+
+    # A worker claims the job and dies without finishing it.
+    assert queue.claim("crashed-worker").id == job.id
+    assert queue.claim("other-worker") is None
+
+    time.sleep(0.3)
+    worker = JobWorker(queue=queue, poll_interval=0.05)
+    finished = asyncio.run(worker.run_job(job.id, timeout=10))
+
+    assert finished.status == DONE
+    assert finished.attempts == 2
+    # The crashed worker can no longer write to the job.
+    assert not queue.renew(job.id, "crashed-worker")
+
+def test_endpoint_reuses_job_for_duplicate_upload(monkeypatch):
+    fake = FakeAsyncOpenAI()
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    client = TestClient(main.app)
+    pdf = make_pdf_bytes([sample_cv_text(6)])
+
+    first = client.post("/api/evaluate-cv", files={"file": ("first.pdf", io.BytesIO(pdf), "application/pdf")})
+    calls = len(fake.calls)
+    second = client.post("/api/evaluate-cv", files={"file": ("second.pdf", io.BytesIO(pdf), "application/pdf")})
+
+    assert first.status_code == second.status_code == 200
+    assert len(fake.calls) == calls
+    assert second.json()["file_name"] == "second.pdf"
+    assert second.json()["total_score"] == first.json()["total_score"]
+
+def test_stale_finished_job_resumes_from_first_stale_stage(tmp_path, monkeypatch):
+    fake = FakeAsyncOpenAI()
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    queue = JobQueue(path=str(tmp_path / "jobs.sqlite3"))
+    worker = JobWorker(queue=queue)
+    pdf = make_pdf_bytes([sample_cv_text(7)])
+    job = queue.submit(pdf, "cv.pdf")
+    asyncio.run(worker.run_job(job.id))
+
+    # Unchanged: the finished job is served as is.
+    assert queue.submit(pdf, "cv.pdf").status == DONE
+
+    # New scoring rules: re-scored from the stored extraction.
+    monkeypatch.setattr(job_queue_module, "scoring_rules_version", lambda: "new-rules")
+    rescored = queue.submit(pdf, "cv.pdf")
+    assert (rescored.status, rescored.stage, rescored.result) == (PENDING, STAGE_EXTRACTED, None)
+    assert asyncio.run(worker.run_job(job.id)).status == DONE
+    assert _extraction_calls(fake) == 1
+
+    # New prompt version: extracted again from the stored text.
+    monkeypatch.setattr(job_queue_module, "extraction_prompt_version", lambda: "new-prompt")
+    assert queue.submit(pdf, "cv.pdf").stage == STAGE_TEXT
+    assert asyncio.run(worker.run_job(job.id)).status == DONE
+    assert _extraction_calls(fake) == 2
+
+    # Older than the extraction cache TTL: extracted again as well.
+    monkeypatch.setattr(job_queue_module, "EXTRACTION_CACHE_TTL_SECONDS", -1)
+    assert queue.submit(pdf, "cv.pdf").stage == STAGE_TEXT
+
+    assert asyncio.run(worker.run_job(job.id)).status == DONE
+
+    # Other PDF text settings: the text is read again from the upload.
+    monkeypatch.setattr(job_queue_module, "pdf_text_version", lambda: "new-text")
+    assert queue.submit(pdf, "cv.pdf").stage == STAGE_QUEUED
+    assert asyncio.run(worker.run_job(job.id)).status == DONE
+    assert queue.get(job.id).text_version == "new-text"
+
+def test_prune_deletes_old_finished_jobs_outside_batches(tmp_path, monkeypatch):
+    fake = FakeAsyncOpenAI()
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    queue = JobQueue(path=str(tmp_path / "jobs.sqlite3"), retention_seconds=0)
+    worker = JobWorker(queue=queue)
+    loose = queue.submit(make_pdf_bytes([sample_cv_text(8)]), "loose.pdf")
+    batched = queue.submit(make_pdf_bytes([sample_cv_text(9)]), "batched.pdf")
+    pending = queue.submit(make_pdf_bytes([sample_cv_text(10)]), "pending.pdf")
+    queue.add_batch("batch", [batched], ["batched.pdf"])
+    asyncio.run(worker.run_job(loose.id))
+    asyncio.run(worker.run_job(batched.id))
+
+    assert queue.prune() == 1
+    assert queue.get(loose.id) is None
+    assert queue.get(batched.id).status == DONE
+    assert queue.get(pending.id).status == PENDING
@@ -0,0 +1,51 @@
+import json
+import os
+
+from app.utils.json_lookup import get_company_score, get_university_score
+from app.utils.knowledge_base import KnowledgeBase, knowledge_base
+from app.utils.normalization import normalize_text, normalize_university_name
+from app.utils.entity_memo import resolve_entity_scores
+from app.utils.openai_client import openai_client
+from benchmarks.fake_openai import FakeOpenAI
+
+def test_normalize_text_folds_vietnamese_d():
+    assert normalize_text("Đại học Đà Nẵng") == "dai hoc da nang"
+    assert normalize_university_name("Đại học Bách Khoa Hà Nội") == "HUST"
+
+def test_lookup_variants():
+    assert get_university_score("HUST") == 20
+    assert get_university_score("Hanoi University of Science and Technology") == 20
+    assert get_university_score("PTIT") == 20
+    assert get_university_score("rmit") == 20
+    assert get_university_score("Some Unlisted College") == 10
+    assert get_company_score("FPT Software") == 20
+    assert get_company_score("fpt software company") == 20
+    assert get_company_score("Unheard Of Startup") == 10
+
+def test_generic_or_partial_names_do_not_match():
+    for name in ("University", "Sydney", "Western University", "FPT"):
+        assert knowledge_base.resolve("universities.json", name) is None, name
+    for name in ("FPT", "Startups"):
+        assert knowledge_base.resolve("companies.json", name) is None, name
+    assert knowledge_base.resolve("universities.json", "FPT Univ").key == "FPT University"
+    assert knowledge_base.resolve("companies.json", "Viettel Group").key == "Viettel"
+
+def test_hot_reload(tmp_path):
+    path = tmp_path / "companies.json"
+    path.write_text(json.dumps({"Acme": 15}), encoding="utf-8")
+    kb = KnowledgeBase(tmp_path, reload_interval=0)
+    assert kb.lookup("companies.json", "acme") == 15
+
+    path.write_text(json.dumps({"Acme": 25}), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    assert kb.lookup("companies.json", "ACME") == 25
+
+def test_reputation_uses_llm_only_for_unknown(monkeypatch):
+    fake = FakeOpenAI()
+    monkeypatch.setattr(openai_client, "get_client", lambda *args: fake)
+    scores = resolve_entity_scores({"university": ["VinUni", "Atlantis Polytechnic"]})
+    assert scores["university"]["VinUni"] == 15
+    assert len(fake.calls) == 1
+    assert "VinUni" not in fake.calls[0]["messages"][1]["content"]
+    assert "Atlantis Polytechnic" in fake.calls[0]["messages"][1]["content"]
@@ -0,0 +1,123 @@
+import asyncio
+import os
+
+import httpx
+import openai
+import pytest
+
+from app.utils import openai_client as client_module
+from app.utils.openai_client import (
+    PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, LLMScheduler, TokenBucket, openai_client
+)
+from benchmarks.fake_openai import FakeAsyncOpenAI, FakeOpenAI
+
+def _error(status):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status, request=request, headers={"retry-after": "0"})
+    if status == 429:
+        return openai.RateLimitError("rate limited", response=response, body=None)
+    return openai.InternalServerError("server error", response=response, body=None)
+
+def test_token_bucket_wait_time():
+    bucket = TokenBucket(60)
+    bucket.take(60)
+    assert 0.9 < bucket.wait_time(1) <= 1.0
+    bucket.give_back(30)
+    assert bucket.wait_time(30) == 0
+
+def test_retries_rate_limits_and_server_errors(monkeypatch):
+    monkeypatch.setattr(client_module, "LLM_BACKOFF_BASE_SECONDS", 0.001)
+    scheduler = LLMScheduler(rpm=1000, tpm=10 ** 6)
+    failures = [_error(429), _error(503)]
+
+    def create(**kwargs):
+        if failures:
+            raise failures.pop(0)
+        return "ok"
+
+    assert scheduler.call(create, {"messages": []}) == "ok"
+    assert scheduler.stats["retries"] == 2
+
+def test_non_retryable_errors_are_raised():
+    scheduler = LLMScheduler(rpm=1000, tpm=10 ** 6)
+    with pytest.raises(ValueError):
+        scheduler.call(lambda **kwargs: (_ for _ in ()).throw(ValueError("bad")), {"messages": []})
+    assert scheduler.stats["retries"] == 0
+
+def test_interactive_calls_go_before_background():
+    scheduler = LLMScheduler(rpm=1000, tpm=10 ** 6, max_concurrency=1)
+    order = []
+
+    async def create(name, **kwargs):
+        order.append(name)
+        await asyncio.sleep(0.02)
+
+    async def run():
+        first = asyncio.create_task(scheduler.call_async(lambda **k: create("first", **k), {"messages": []}))
+        await asyncio.sleep(0.005)
+        background = asyncio.create_task(scheduler.call_async(lambda **k: create("background", **k), {"messages": []}, PRIORITY_BACKGROUND))
+        await asyncio.sleep(0.005)
+        interactive = asyncio.create_task(scheduler.call_async(lambda **k: create("interactive", **k), {"messages": []}, PRIORITY_INTERACTIVE))
+        await asyncio.gather(first, background, interactive)
+
+    asyncio.run(run())
+    assert order == ["first", "interactive", "background"]
+
+def test_streamed_call_holds_its_slot_until_consumed():
+    scheduler = LLMScheduler(rpm=1000, tpm=10 ** 6, max_concurrency=1)
+    fake = FakeAsyncOpenAI()
+
+    async def run():
+        stream = await scheduler.call_async(fake.chat.completions.create, {"messages": [], "stream": True})
+        held = scheduler.in_flight
+        pieces = [chunk.choices[0].delta.content async for chunk in stream]
+        return held, pieces
+
+    held, pieces = asyncio.run(run())
+    assert held == 1
+    assert "".join(piece for piece in pieces if piece)
+    assert scheduler.in_flight == 0
+
+def test_get_client_routes_through_scheduler(monkeypatch):
+    fake = FakeOpenAI()
+    monkeypatch.setattr(openai_client, "client", fake)
+    monkeypatch.setattr(openai_client, "scheduler", LLMScheduler())
+    response = openai_client.get_client(PRIORITY_BACKGROUND).chat.completions.create(
+        model="gpt-4o", messages=[{"role": "system", "content": "Provide a score"}]
+    )
+    assert response.choices[0].message.content == "15"
+    assert openai_client.scheduler.stats["calls"] == 1
+
+def test_clients_share_pooled_transport(monkeypatch):
+    monkeypatch.setattr(client_module, "OPENAI_MAX_CONNECTIONS", 7)
+    monkeypatch.setattr(client_module, "OPENAI_CONNECT_TIMEOUT_SECONDS", 2.0)
+    monkeypatch.setattr(openai_client, "client", None)
+    first = openai_client.get_client()._raw
+    second = openai_client.get_client(PRIORITY_BACKGROUND)._raw
+    assert first is second
+    assert isinstance(first._client, httpx.Client)
+    assert first._client.timeout.connect == 2.0
+    assert first._client._transport._pool._max_connections == 7
+
+def test_clients_are_rebuilt_in_a_new_process(monkeypatch):
+    fake = FakeOpenAI()
+    monkeypatch.setattr(openai_client, "client", fake)
+    monkeypatch.setattr(openai_client, "_pid", os.getpid() + 1)
+    assert openai_client.get_client()._raw is not fake
+    assert openai_client._pid == os.getpid()
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_fork_resets_inherited_clients(monkeypatch):
+    monkeypatch.setattr(openai_client, "client", FakeOpenAI())
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+        os.write(write_end, b"1" if openai_client.client is None else b"0")
+        os._exit(0)
+    os.close(write_end)
+    reset_in_child = os.read(read_end, 1)
+    os.close(read_end)
+    os.waitpid(pid, 0)
+    assert reset_in_child == b"1"
+    assert openai_client.client is not None
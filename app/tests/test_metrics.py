@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.modules import pipeline
+from app.utils.metrics import (
+    FALLBACKS, LLM_SECONDS, LLM_TOKENS, STAGE_ERRORS, STAGE_SECONDS, Counter, Histogram, MetricsRegistry, stage_span
+)
+from app.utils.openai_client import LLMScheduler, openai_client
+from benchmarks.fake_openai import FakeAsyncOpenAI
+from benchmarks.synthetic import make_pdf_bytes, sample_cv_text
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("demo_seconds", "Demo.", ("stage",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage='a"b')
+    histogram.observe(0.5, stage='a"b')
+    histogram.observe(5, stage='a"b')
+    text = registry.render()
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{stage="a\\"b",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{stage="a\\"b",le="1"} 2' in text
+    assert 'demo_seconds_bucket{stage="a\\"b",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{stage="a\\"b"} 3' in text
+
+def test_metrics_reject_wrong_labels():
+    with pytest.raises(ValueError):
+        Counter("demo_total", "Demo.", ("kind",)).inc(stage="x")
+    with pytest.raises(ValueError):
+        Histogram("demo_seconds", "Demo.").observe(1.0, stage="x")
+
+def test_stage_span_times_and_counts_errors():
+    before = STAGE_SECONDS.count(stage="unit_test_stage")
+    with pytest.raises(RuntimeError):
+        with stage_span("unit_test_stage"):
+            raise RuntimeError("boom")
+    assert STAGE_SECONDS.count(stage="unit_test_stage") == before + 1
+    assert STAGE_ERRORS.value(stage="unit_test_stage") >= 1
+
+def test_pipeline_records_stages_tokens_and_fallbacks(monkeypatch):
+    fake = FakeAsyncOpenAI(responder=lambda messages, **kwargs: "not json" if "CV parser" in messages[0]["content"] else "Reason.")
+    monkeypatch.setattr(openai_client, "async_client", fake)
+    monkeypatch.setattr(openai_client, "scheduler", LLMScheduler())
+    monkeypatch.setattr(pipeline, "EVALUATION_MODE", "two_call")
+    scoring = STAGE_SECONDS.count(stage="scoring")
+    fallbacks = FALLBACKS.value(kind="default_structure")
+    tokens = LLM_TOKENS.value(model="gpt-4o", stage="extraction", kind="prompt")
+
+    asyncio.run(pipeline.evaluate_cv_bytes_async(make_pdf_bytes([sample_cv_text()]), "cv.pdf"))
+    assert STAGE_SECONDS.count(stage="scoring") == scoring + 1
+    assert FALLBACKS.value(kind="default_structure") == fallbacks + 1
+    assert LLM_TOKENS.value(model="gpt-4o", stage="extraction", kind="prompt") > tokens
+    assert LLM_TOKENS.value(model="gpt-4o", stage="reasoning", kind="completion") > 0
+
+def test_streamed_extraction_records_stage_latency_and_tokens(monkeypatch):
+    fake = FakeAsyncOpenAI(latency=0.2)
+    monkeypatch.setattr(openai_client, "async_client", fake)
+    monkeypatch.setattr(openai_client, "scheduler", LLMScheduler())
+    monkeypatch.setattr(pipeline, "EVALUATION_MODE", "two_call")
+    stage = STAGE_SECONDS.sum(stage="extraction")
+    calls = LLM_SECONDS.count(model="gpt-4o", stage="extraction")
+    tokens = LLM_TOKENS.value(model="gpt-4o", stage="extraction", kind="completion")
+
+    async def consume():
+        return [event async for event in pipeline.evaluate_cv_stream_async(make_pdf_bytes([sample_cv_text()]), "cv.pdf")]
+
+    asyncio.run(consume())
+    assert fake.calls[0]["stream_options"] == {"include_usage": True}
+    assert LLM_SECONDS.count(model="gpt-4o", stage="extraction") == calls + 1
+    assert LLM_SECONDS.sum(model="gpt-4o", stage="extraction") >= 0.2
+    assert LLM_TOKENS.value(model="gpt-4o", stage="extraction", kind="completion") > tokens
+    # The stage covers the whole stream, not just opening it.
+    assert STAGE_SECONDS.sum(stage="extraction") - stage >= 0.2
+
+def test_metrics_endpoint_exposes_prometheus_text():
+    from app.main import app
+    client = TestClient(app)
+    client.get("/metrics")
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE cv_stage_duration_seconds histogram" in response.text
+    assert 'http_request_duration_seconds_count{endpoint="/metrics",status="200"}' in response.text
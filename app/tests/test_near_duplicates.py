@@ -0,0 +1,122 @@
+import asyncio
+import json
+
+import pytest
+
+from app.modules.batch.job_queue import DONE, JobWorker, job_queue
+from app.utils.near_duplicates import NearDuplicateIndex, minhash, same_contact, shingles, similarity
+from app.utils.openai_client import openai_client
+from app.utils.result_store import result_store
+from benchmarks.cv_corpus import generate_corpus, paginate
+from benchmarks.fake_openai import FakeAsyncOpenAI, default_responder
+from benchmarks.synthetic import make_pdf_bytes
+
+@pytest.fixture(scope="module")
+def corpus():
+    return generate_corpus(2, items=4, sentences=3, language="en")
+
+def _reexport(text):
+    # Same CV, re-exported: different line breaks and a trailing note, so different bytes.
+    return text.replace("\n", "\n\n", 3) + "\nReferences available on request."
+
+def _extraction_calls(fake):
+    return sum(1 for call in fake.calls if "CV parser" in call["messages"][0]["content"])
+
+def _evaluate(text, file_name):
+    job = job_queue.submit(make_pdf_bytes(paginate(text)), file_name)
+    return asyncio.run(JobWorker().run_job(job.id))
+
+def test_fingerprint_ignores_formatting(corpus):
+    text = corpus[0].text
+    reformatted = text.upper().replace(",", " ,").replace("\n", "  \n\f ")
+    assert similarity(minhash(shingles(text)), minhash(shingles(reformatted))) == 1.0
+    assert similarity(minhash(shingles(text)), minhash(shingles(corpus[1].text))) < 0.5
+
+def test_index_finds_near_duplicates_only(tmp_path, corpus):
+    index = NearDuplicateIndex(path=str(tmp_path / "index.sqlite3"))
+    assert index.add("a", corpus[0].text)
+    assert not index.add("short", "too short to fingerprint")
+
+    match = index.find(_reexport(corpus[0].text))
+    assert match.file_hash == "a" and match.similarity >= 0.9
+    assert index.find(corpus[1].text) is None
+    assert index.find(corpus[0].text, exclude="a") is None
+
+@pytest.fixture
+def ascii_cv(corpus):
+    # The test PDFs use a WinAnsi font, which drops the Vietnamese letters of the generated names.
+    data = corpus[0].payload["extracted_data"]
+    payload = {**corpus[0].payload, "extracted_data": {**data, "name": "Jane Doe"}}
+    return json.dumps(payload, ensure_ascii=False), corpus[0].text.replace(data["name"], "Jane Doe")
+
+def _extracting(extraction):
+    # Extract the CV's own details, so its contact fields appear in its text.
+    def responder(messages, **kwargs):
+        if "CV parser" in messages[0]["content"]:
+            return extraction
+        return default_responder(messages, **kwargs)
+    return responder
+
+def test_same_contact_requires_every_known_field(corpus):
+    data, text = corpus[0].payload["extracted_data"], corpus[0].text
+    assert same_contact(data, text)
+    assert not same_contact({**data, "email": "someone.else@example.com"}, text)
+    assert not same_contact(corpus[1].payload["extracted_data"], text)
+    assert not same_contact({"name": data["name"], "email": "Unknown", "phone": ""}, text)
+
+def test_reuse_result_skips_llm_calls(monkeypatch, ascii_cv, isolated_near_duplicates):
+    monkeypatch.setattr(isolated_near_duplicates, "policy", "reuse_result")
+    extraction, text = ascii_cv
+    fake = FakeAsyncOpenAI(responder=_extracting(extraction))
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+
+    first = _evaluate(text, "original.pdf")
+    calls = len(fake.calls)
+    second = _evaluate(_reexport(text), "copy.pdf")
+
+    assert second.status == DONE
+    assert len(fake.calls) == calls
+    assert second.result["file_name"] == "copy.pdf"
+    assert second.result["near_duplicate_of"]["file_hash"] == first.file_hash
+    assert second.result["total_score"] == first.result["total_score"]
+    # The borrowed result is not stored as if it had been extracted from the copy.
+    result_store.flush()
+    assert result_store.get(second.file_hash) is None
+
+def test_reuse_result_evaluates_copies_with_other_contact_details(monkeypatch, ascii_cv, isolated_near_duplicates):
+    monkeypatch.setattr(isolated_near_duplicates, "policy", "reuse_result")
+    extraction, text = ascii_cv
+    fake = FakeAsyncOpenAI(responder=_extracting(extraction))
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+
+    _evaluate(text, "original.pdf")
+    email = json.loads(extraction)["extracted_data"]["email"]
+    second = _evaluate(_reexport(text).replace(email, "other.person@example.com"), "other.pdf")
+
+    assert _extraction_calls(fake) == 2
+    assert "near_duplicate_of" in second.result
+
+def test_reuse_extraction_scores_again(monkeypatch, corpus, isolated_near_duplicates):
+    monkeypatch.setattr(isolated_near_duplicates, "policy", "reuse_extraction")
+    fake = FakeAsyncOpenAI()
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+
+    _evaluate(corpus[0].text, "original.pdf")
+    calls = len(fake.calls)
+    second = _evaluate(_reexport(corpus[0].text), "copy.pdf")
+
+    assert _extraction_calls(fake) == 1
+    assert len(fake.calls) > calls
+    assert "near_duplicate_of" in second.result
+
+@pytest.mark.parametrize("policy, flagged", [("flag", True), ("off", False)])
+def test_flag_and_off_evaluate_every_copy(monkeypatch, corpus, isolated_near_duplicates, policy, flagged):
+    monkeypatch.setattr(isolated_near_duplicates, "policy", policy)
+    fake = FakeAsyncOpenAI()
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+
+    _evaluate(corpus[0].text, "original.pdf")
+    second = _evaluate(_reexport(corpus[0].text), "copy.pdf")
+
+    assert _extraction_calls(fake) == 2
+    assert ("near_duplicate_of" in second.result) is flagged
@@ -0,0 +1,90 @@
+import json
+import random
+
+import httpx
+import openai
+import pytest
+from fastapi.testclient import TestClient
+from openai import OpenAI
+
+from benchmarks.openai_standin import StandinConfig, cassette_key, create_app, parse_latency
+
+MESSAGES = [{"role": "system", "content": "Provide a score"}, {"role": "user", "content": "FPT University"}]
+
+def _openai(app):
+    return OpenAI(api_key="sk-test", base_url="http://testserver/v1", http_client=TestClient(app), max_retries=0)
+
+def test_cassette_key_depends_on_model_and_messages():
+    assert cassette_key("gpt-4o", MESSAGES) == cassette_key("gpt-4o", [dict(m) for m in MESSAGES])
+    assert cassette_key("gpt-4o", MESSAGES) != cassette_key("gpt-4o-mini", MESSAGES)
+    assert cassette_key("gpt-4o", MESSAGES) != cassette_key("gpt-4o", MESSAGES[:1])
+
+def test_parse_latency_specs():
+    rng = random.Random(0)
+    assert parse_latency("0")(rng) == 0.0
+    assert parse_latency("fixed:0.3")(rng) == 0.3
+    assert 0.2 <= parse_latency("uniform:0.2,0.4")(rng) <= 0.4
+    assert parse_latency("lognormal:0.5,0.2")(rng) > 0
+    with pytest.raises(ValueError):
+        parse_latency("gamma:1")
+
+def test_replay_serves_cassette_and_falls_back_to_synthetic(tmp_path):
+    config = StandinConfig(cassette_dir=str(tmp_path))
+    app = create_app(config)
+    client = _openai(app)
+    assert client.chat.completions.create(model="gpt-4o", messages=MESSAGES).choices[0].message.content == "15"
+
+    path = tmp_path / f"{cassette_key('gpt-4o', MESSAGES)}.json"
+    path.parent.mkdir(parents=True)
+    recorded = {
+        "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": "18"}, "finish_reason": "stop"}],
+    }
+    path.write_text(json.dumps({"request": {}, "response": recorded}))
+    assert client.chat.completions.create(model="gpt-4o", messages=MESSAGES).choices[0].message.content == "18"
+    assert app.state.stats["hits"] == 1 and app.state.stats["misses"] == 1
+
+def test_strict_replay_rejects_misses(tmp_path):
+    client = _openai(create_app(StandinConfig(cassette_dir=str(tmp_path), strict=True)))
+    with pytest.raises(openai.NotFoundError):
+        client.chat.completions.create(model="gpt-4o", messages=MESSAGES)
+
+def test_streaming_reassembles_answer(tmp_path):
+    client = _openai(create_app(StandinConfig(cassette_dir=str(tmp_path), mode="synthetic", stream_chunk_chars=7)))
+    messages = [{"role": "system", "content": "Explain the status"}]
+    stream = client.chat.completions.create(model="gpt-4o", messages=messages, stream=True)
+    pieces = [chunk.choices[0].delta.content or "" for chunk in stream]
+    assert len(pieces) > 3
+    assert "".join(pieces) == "The candidate meets the core requirements for the role."
+
+def test_fault_injection_returns_rate_limits_with_retry_after(tmp_path):
+    app = create_app(StandinConfig(cassette_dir=str(tmp_path), rate_429=1.0, retry_after=2))
+    with pytest.raises(openai.RateLimitError) as raised:
+        _openai(app).chat.completions.create(model="gpt-4o", messages=MESSAGES)
+    assert raised.value.response.headers["retry-after"] == "2"
+    assert app.state.stats["injected_429"] == 1
+
+def test_record_mode_saves_upstream_answer_once(tmp_path, monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    seen = []
+
+    def upstream(request):
+        seen.append(request)
+        body = json.loads(request.content)
+        assert "stream" not in body
+        return httpx.Response(200, json={
+            "id": "chatcmpl-up", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "19"}, "finish_reason": "stop"}],
+        })
+
+    config = StandinConfig(cassette_dir=str(tmp_path), mode="record", upstream_transport=httpx.MockTransport(upstream))
+    client = _openai(create_app(config))
+    for _ in range(2):
+        assert client.chat.completions.create(model="gpt-4o", messages=MESSAGES).choices[0].message.content == "19"
+    assert len(seen) == 1
+    assert seen[0].headers["authorization"] == "Bearer sk-test"
+    assert (tmp_path / f"{cassette_key('gpt-4o', MESSAGES)}.json").exists()
+
+    replay = _openai(create_app(StandinConfig(cassette_dir=str(tmp_path), strict=True)))
+    stream = replay.chat.completions.create(model="gpt-4o", messages=MESSAGES, stream=True)
+    assert "".join(chunk.choices[0].delta.content or "" for chunk in stream) == "19"
@@ -0,0 +1,40 @@
+from app.modules.document_extraction import pdf_backends
+from app.modules.document_extraction.pdf_backends import PdfBackend, get_backend, register_backend
+from app.modules.document_extraction.pdf_text import extract_pdf_text
+from benchmarks.bench_pdf_backends import agreement, choose_backend
+from benchmarks.synthetic import make_pdf_bytes
+
+class UpperBackend(PdfBackend):
+    name = "upper-test"
+    module = "PyPDF2"
+
+    def open(self, data):
+        return get_backend("pypdf2").open(data)
+
+    def page_count(self, document):
+        return len(document.pages)
+
+    def page_text(self, document, index):
+        return document.pages[index].extract_text().upper()
+
+def test_registered_backend_is_used(monkeypatch):
+    monkeypatch.setattr(pdf_backends, "_backends", dict(pdf_backends._backends))
+    register_backend(UpperBackend())
+    data = make_pdf_bytes(["hello page", "second page"])
+    result = extract_pdf_text(data, backend="upper-test", parallel=False)
+    assert "HELLO PAGE" in result.text and result.pages_read == 2
+    assert "upper-test" in pdf_backends.available_backends()
+
+def test_unknown_backend_falls_back_to_pypdf2():
+    assert get_backend("no-such-backend").name == "pypdf2"
+
+def test_choose_fastest_backend_above_threshold():
+    rows = [
+        {"backend": "fast", "pages_per_second": 500, "agreement": 0.90, "failures": 0},
+        {"backend": "medium", "pages_per_second": 200, "agreement": 0.99, "failures": 0},
+        {"backend": "slow", "pages_per_second": 50, "agreement": 1.0, "failures": 0},
+    ]
+    assert choose_backend(rows, 0.95) == "medium"
+    assert choose_backend(rows, 0.999) == "slow"
+    assert choose_backend(rows, 1.1) is None
+    assert agreement("Nguyễn  Văn A", "Nguyễn Văn A") == 1.0
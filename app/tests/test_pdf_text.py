@@ -0,0 +1,24 @@
+from app.modules.document_extraction.pdf_text import extract_pdf_text
+from benchmarks.synthetic import make_pdf_bytes
+
+PAGES = [f"Page {i} Python FastAPI" for i in range(20)]
+
+def test_sequential_and_parallel_agree():
+    data = make_pdf_bytes(PAGES)
+    sequential = extract_pdf_text(data, parallel=False, max_pages=0, max_chars=0)
+    parallel = extract_pdf_text(data, parallel=True, workers=2, max_pages=0, max_chars=0)
+    assert sequential.text == parallel.text
+    assert "Page 19" in sequential.text
+    assert sequential.pages_read == sequential.pages_total == 20
+    assert parallel.parallel and not sequential.parallel
+    assert [t.index for t in parallel.timings] == list(range(20))
+
+def test_page_and_char_budgets():
+    data = make_pdf_bytes(PAGES)
+    by_pages = extract_pdf_text(data, parallel=False, max_pages=3, max_chars=0)
+    assert by_pages.pages_read == 3 and by_pages.truncated
+    assert "Page 3" not in by_pages.text
+
+    by_chars = extract_pdf_text(data, parallel=False, max_pages=0, max_chars=30)
+    assert by_chars.pages_read == 2 and by_chars.truncated
+    assert len(by_chars.text) == 30
@@ -0,0 +1,113 @@
+import io
+import json
+import sqlite3
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.test_api import CVAPITester
+from app.utils.openai_client import openai_client
+from app.utils.result_store import ResultStore
+from benchmarks.fake_openai import FakeAsyncOpenAI
+from benchmarks.synthetic import make_pdf_bytes, sample_cv_text
+
+def _result(i, status="Pass", total=70.0, experience=50.0, email=None):
+    return {
+        "file_name": f"cv_{i}.pdf",
+        "processed_at": f"2025-01-01T00:00:{i:02d}",
+        "cv_data": {"name": f"Candidate {i}", "email": email or f"c{i}@example.com"},
+        "scores": {"education": 10.0, "experience": experience, "projects": 20.0, "awards": 0.0, "certifications": 5.0},
+        "status": status,
+        "total_score": total,
+    }
+
+def test_query_filters_and_keyset_pagination(tmp_path):
+    store = ResultStore(path=str(tmp_path / "results.sqlite3"))
+    store.save_many([
+        (_result(i, status="Pass" if i % 2 else "Fail", total=float(i), experience=float(i * 10)), f"hash{i}")
+        for i in range(10)
+    ])
+
+    page = store.query(status="Pass", min_scores={"experience": 30}, limit=2)
+    assert [r["file_name"] for r in page["results"]] == ["cv_9.pdf", "cv_7.pdf"]
+    rest = store.query(status="Pass", min_scores={"experience": 30}, limit=2, cursor=page["next_cursor"])
+    assert [r["file_name"] for r in rest["results"]] == ["cv_5.pdf", "cv_3.pdf"]
+    assert rest["next_cursor"] is None
+
+    ascending = store.query(sort="experience", descending=False, limit=3)
+    assert [r["scores"]["experience"] for r in ascending["results"]] == [0.0, 10.0, 20.0]
+    assert store.query(email="C4@Example.com")["results"][0]["file_hash"] == "hash4"
+
+def test_ties_are_paginated_without_gaps(tmp_path):
+    store = ResultStore(path=str(tmp_path / "results.sqlite3"))
+    store.save_many([(_result(i, total=50.0), f"hash{i}") for i in range(7)])
+
+    seen, cursor = [], None
+    while True:
+        page = store.query(limit=3, cursor=cursor)
+        seen += [r["file_hash"] for r in page["results"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(f"hash{i}" for i in range(7))
+    assert len(seen) == len(set(seen))
+
+def test_saves_are_batched_and_visible_to_reads(tmp_path):
+    store = ResultStore(path=str(tmp_path / "results.sqlite3"), batch_size=3, flush_seconds=3600)
+    store.save(_result(1), "hash1")
+    store.save(_result(2), "hash2")
+    assert store._pending
+
+    store.save(_result(3), "hash3")
+    assert not store._pending
+
+    store.save(_result(1, total=99.0), "hash1")
+    assert store.count() == 3
+    assert store.get("hash1")["total_score"] == 99.0
+
+def test_single_saves_are_flushed_by_the_timer(tmp_path):
+    path = str(tmp_path / "results.sqlite3")
+    store = ResultStore(path=path, batch_size=50, flush_seconds=0.05)
+    store.save(_result(1), "hash1")
+
+    deadline = time.time() + 5
+    while store._pending and time.time() < deadline:
+        time.sleep(0.01)
+    assert not store._pending
+    # Written without any further save or read on the store.
+    assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM results").fetchone()[0] == 1
+
+def test_tester_saves_concurrent_results_without_overwriting(tmp_path):
+    tester = CVAPITester()
+    threads = [
+        threading.Thread(target=tester.save_result, args=(_result(i), tmp_path))
+        for i in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    tester.close()
+
+    assert ResultStore(path=str(tmp_path / "results.sqlite3")).count() == 20
+    assert not list(tmp_path.glob("cv_result_*.json"))
+
+def test_results_endpoint(monkeypatch):
+    fake = FakeAsyncOpenAI()
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    client = TestClient(main.app)
+    for i in range(3):
+        pdf = make_pdf_bytes([sample_cv_text(i)])
+        assert client.post("/api/evaluate-cv", files={"file": (f"cv_{i}.pdf", io.BytesIO(pdf), "application/pdf")}).status_code == 200
+
+    body = client.get("/api/results", params={"limit": 2, "sort": "processed_at", "order": "asc"}).json()
+    assert [r["file_name"] for r in body["results"]] == ["cv_0.pdf", "cv_1.pdf"]
+    rest = client.get("/api/results", params={"limit": 2, "sort": "processed_at", "order": "asc", "cursor": body["next_cursor"]}).json()
+    assert [r["file_name"] for r in rest["results"]] == ["cv_2.pdf"]
+
+    full = client.get("/api/results", params={"full": "true", "limit": 1}).json()["results"][0]
+    assert full["result"]["cv_data"] == json.loads(json.dumps(full["result"]["cv_data"]))
+    assert client.get("/api/results", params={"sort": "name"}).status_code == 400
+    assert client.get("/api/results", params={"cursor": "not-a-cursor"}).status_code == 400
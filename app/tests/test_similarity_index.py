@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from app.modules.embedding.similarity import SimilarityIndex, calculate_similarity
+
+def _random_index(count=500, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(count, dim)).astype(np.float32)
+    index = SimilarityIndex(dim, initial_capacity=8)
+    index.add([f"cv-{i}" for i in range(count)], vectors)
+    return index, vectors, rng
+
+def test_search_matches_pairwise_similarity():
+    index, vectors, rng = _random_index()
+    query = rng.normal(size=16)
+
+    results = index.search(query, k=5)
+
+    expected = sorted(
+        ((f"cv-{i}", calculate_similarity(query, v)) for i, v in enumerate(vectors)),
+        key=lambda item: -item[1]
+    )[:5]
+    assert [item_id for item_id, _ in results] == [item_id for item_id, _ in expected]
+    assert [score for _, score in results] == pytest.approx([score for _, score in expected], abs=1e-5)
+
+def test_insert_replace_and_delete():
+    index, vectors, _ = _random_index(count=10, dim=4)
+    index.add(["cv-3"], [[1, 0, 0, 0]])
+    index.add(["new"], [[0, 1, 0, 0]])
+
+    assert index.search([1, 0, 0, 0], k=1)[0] == ("cv-3", pytest.approx(1.0))
+    assert index.remove(["cv-3", "missing"]) == 1
+    assert "cv-3" not in index
+    assert len(index) == 10
+    assert index.search([0, 1, 0, 0], k=1)[0][0] == "new"
+    assert all(item_id != "cv-3" for item_id, _ in index.search([1, 0, 0, 0], k=10))
+
+def test_approximate_index_finds_near_duplicates():
+    index, vectors, rng = _random_index(count=2000, dim=32)
+    index.build_approximate_index(n_probe=4)
+
+    hits = 0
+    for i in rng.choice(2000, 50, replace=False):
+        query = vectors[i] + rng.normal(scale=0.01, size=32)
+        hits += index.search(query, k=1)[0][0] == f"cv-{i}"
+    assert hits >= 45
+
+    index.add(["late"], [vectors[0] * -1])
+    assert index.search(vectors[0] * -1, k=1)[0][0] == "late"
+    assert index.search(vectors[7], k=1, exact=True)[0][0] == "cv-7"
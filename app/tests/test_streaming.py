@@ -0,0 +1,73 @@
+import asyncio
+import io
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.modules.document_extraction.extractor import build_resume
+from app.modules.document_extraction.streaming import IncrementalJSONParser
+from app.modules.pipeline import evaluate_cv_stream_async
+from app.modules.scoring.scorer import calculate_total_score
+from app.utils.extraction_cache import sha256_bytes
+from app.utils.openai_client import openai_client
+from app.utils.result_store import result_store
+from benchmarks.fake_openai import FakeAsyncOpenAI
+from benchmarks.synthetic import make_pdf_bytes, sample_cv_text, sample_extraction_json
+
+def test_parser_reports_sections_for_any_chunking():
+    document = {
+        "extracted_data": {"name": "A \"quoted\" {name}", "education": [{"school": "HUST", "gpa": 3.5}], "linkedin": None},
+        "summary": "ok, fine]",
+    }
+    text = "```json\n" + json.dumps(document) + "\n```"
+    for size in (1, 3, 17, len(text)):
+        parser = IncrementalJSONParser()
+        events = []
+        for start in range(0, len(text), size):
+            events.extend(parser.feed(text[start:start + size]))
+        assert parser.done
+        assert events[:3] == [
+            (("extracted_data", "name"), document["extracted_data"]["name"]),
+            (("extracted_data", "education"), document["extracted_data"]["education"]),
+            (("extracted_data", "linkedin"), None),
+        ]
+        assert (("summary",), "ok, fine]") in events
+
+def test_sections_arrive_before_extraction_finishes(monkeypatch):
+    fake = FakeAsyncOpenAI(latency=0.5, stream_chunk_chars=20)
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    pdf = make_pdf_bytes([sample_cv_text()])
+
+    async def collect():
+        start = time.perf_counter()
+        return [(event, time.perf_counter() - start) async for event in evaluate_cv_stream_async(pdf, "cv.pdf")]
+
+    events = asyncio.run(collect())
+    names = [event["event"] for event, _ in events]
+    assert names[-2:] == ["scores", "result"]
+    first_score = next(elapsed for event, elapsed in events if event["event"] == "score")
+    assert first_score < events[-1][1] - 0.2
+    assert fake.calls[0]["stream"] is True
+
+    expected = calculate_total_score(build_resume(json.loads(sample_extraction_json())["extracted_data"]))
+    streamed = {event["data"]["category"]: event["data"]["score"] for event, _ in events if event["event"] == "score"}
+    assert streamed == expected["scores"]
+
+def test_stream_endpoint_emits_server_sent_events(monkeypatch):
+    fake = FakeAsyncOpenAI()
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    client = TestClient(main.app)
+    pdf = make_pdf_bytes([sample_cv_text()])
+
+    response = client.post("/api/evaluate-cv/stream", files={"file": ("cv.pdf", io.BytesIO(pdf), "application/pdf")})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    blocks = [block for block in response.text.split("\n\n") if block]
+    assert blocks[0].startswith("event: section")
+    assert blocks[-1].startswith("event: result")
+    assert json.loads(blocks[-1].split("data: ", 1)[1])["file_name"] == "cv.pdf"
+    stored = result_store.get(sha256_bytes(pdf))
+    assert stored is not None and stored["file_name"] == "cv.pdf"
@@ -0,0 +1,39 @@
+import io
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.modules.document_extraction.extractor import extract_text_from_pdf_bytes
+from app.utils import uploads
+from app.utils.openai_client import openai_client
+from benchmarks.fake_openai import FakeAsyncOpenAI
+from benchmarks.synthetic import make_pdf_bytes, sample_cv_text
+
+def test_extract_text_from_pdf_bytes_accepts_memoryview():
+    data = make_pdf_bytes([sample_cv_text()])
+    assert "FPT Software" in extract_text_from_pdf_bytes(memoryview(data))
+
+def test_endpoint_processes_upload_in_memory(monkeypatch):
+    fake = FakeAsyncOpenAI()
+    monkeypatch.setattr(openai_client, "get_async_client", lambda *args: fake)
+    client = TestClient(main.app)
+
+    pdf = make_pdf_bytes([sample_cv_text()])
+    response = client.post("/api/evaluate-cv", files={"file": ("cv.pdf", io.BytesIO(pdf), "application/pdf")})
+
+    assert response.status_code == 200
+    assert response.json()["file_name"] == "cv.pdf"
+
+def test_endpoint_rejects_oversized_upload(monkeypatch):
+    monkeypatch.setattr(uploads, "MAX_UPLOAD_BYTES", 1024)
+    monkeypatch.setattr(uploads, "UPLOAD_CHUNK_BYTES", 256)
+    client = TestClient(main.app)
+
+    response = client.post("/api/evaluate-cv", files={"file": ("cv.pdf", io.BytesIO(b"%PDF" + b"0" * 4096), "application/pdf")})
+
+    assert response.status_code == 413
+
+def test_endpoint_rejects_non_pdf():
+    client = TestClient(main.app)
+    response = client.post("/api/evaluate-cv", files={"file": ("cv.txt", io.BytesIO(b"hello"), "text/plain")})
+    assert response.status_code == 400
@@ -0,0 +1,360 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import openai
+
+from app.utils.knowledge_base import fold_name, knowledge_base
+from app.utils.metrics import record_fallback
+from app.utils.openai_client import openai_client, PRIORITY_BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+ENTITY_MEMO_ENABLED = os.getenv("ENTITY_MEMO_ENABLED", "1") == "1"
+# Warm the memo with each evaluated CV's entities in the background (one extra call per CV with new names).
+ENTITY_RESOLVE_ENABLED = os.getenv("ENTITY_RESOLVE_ENABLED", "0") == "1"
+ENTITY_MEMO_PATH = os.getenv(
+    "ENTITY_MEMO_PATH",
+    str(Path(__file__).parent.parent.parent / ".cache" / "entity_scores.sqlite3")
+)
+ENTITY_RESOLVE_MODEL = os.getenv("ENTITY_RESOLVE_MODEL", "gpt-4o")
+ENTITY_RESOLVE_MAX_NAMES = int(os.getenv("ENTITY_RESOLVE_MAX_NAMES", "100"))
+
+# Entity kinds scored by the infer_* functions: (description, max score, knowledge base file).
+ENTITY_KINDS: Dict[str, Tuple[str, int, Optional[str]]] = {
+    "university": ("university reputation", 20, "universities.json"),
+    "company": ("company size", 25, "companies.json"),
+    "tech_stack": ("tech stack relevance", 25, None),
+    "contest": ("contest prestige", 30, None),
+    "certification": ("certification relevance", 50, None),
+}
+
+# Per kind, how the single-entity infer_* prompt names the input: (phrase, label).
+INFER_PROMPTS: Dict[str, Tuple[str, str]] = {
+    "university": ("university name", "University"),
+    "company": ("company name", "Company"),
+    "tech_stack": ("tech stack", "Tech Stack"),
+    "contest": ("contest name", "Contest"),
+    "certification": ("certification name", "Certification"),
+}
+
+DEFAULT_SCORE = 10
+
+class EntityMemo:
+    """
+    Persistent SQLite memo of LLM-inferred entity scores.
+
+    Entries are keyed by entity kind and folded name, so "FPT Software" and
+    "fpt  software" share one row. Scores never expire: the knowledge base
+    files are the place to correct a score by hand.
+    """
+
+    def __init__(self, path: str = ENTITY_MEMO_PATH, enabled: bool = ENTITY_MEMO_ENABLED):
+        self.path = path
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entity_scores (
+                    kind TEXT NOT NULL,
+                    name_key TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    score INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (kind, name_key)
+                )
+                """
+            )
+        return self._conn
+
+    def get_many(self, kind: str, names: Iterable[str]) -> Dict[str, int]:
+        """
+        Return memoized scores for the names that have one.
+        """
+        names = list(names)
+        if not self.enabled or not names:
+            return {}
+        keys = {fold_name(name): name for name in names}
+        found: Dict[str, int] = {}
+        with self._lock:
+            conn = self._connect()
+            placeholders = ",".join("?" * len(keys))
+            rows = conn.execute(
+                f"SELECT name_key, score FROM entity_scores WHERE kind = ? AND name_key IN ({placeholders})",
+                (kind, *keys)
+            ).fetchall()
+        scores = dict(rows)
+        for name in names:
+            score = scores.get(fold_name(name))
+            if score is not None:
+                found[name] = score
+        self.hits += len(found)
+        self.misses += len(names) - len(found)
+        return found
+
+    def get(self, kind: str, name: str) -> Optional[int]:
+        return self.get_many(kind, [name]).get(name)
+
+    def put_many(self, kind: str, scores: Dict[str, int]) -> None:
+        """
+        Write resolved scores back in one transaction.
+        """
+        if not self.enabled or not scores:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT OR REPLACE INTO entity_scores VALUES (?, ?, ?, ?, ?)",
+                [(kind, fold_name(name), name, int(score), now) for name, score in scores.items()]
+            )
+            conn.execute("COMMIT")
+
+    def put(self, kind: str, name: str, score: int) -> None:
+        self.put_many(kind, {name: score})
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters for this process and the number of stored scores.
+        """
+        entries = 0
+        if self.enabled:
+            with self._lock:
+                entries = self._connect().execute("SELECT COUNT(*) FROM entity_scores").fetchone()[0]
+        return {"enabled": self.enabled, "hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def clear(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._connect().execute("DELETE FROM entity_scores")
+
+# Singleton instance
+entity_memo = EntityMemo()
+
+def collect_entities(resumes: Iterable[Any]) -> Dict[str, List[str]]:
+    """
+    Gather the distinct names each infer_* function would score across resumes.
+    """
+    fields = {
+        "university": ("education", "school"),
+        "company": ("professional_experience", "company"),
+        "tech_stack": ("projects", "tech"),
+        "contest": ("awards", "contest"),
+        "certification": ("certifications", "name"),
+    }
+    entities: Dict[str, Dict[str, None]] = {kind: {} for kind in fields}
+    for resume in resumes:
+        for kind, (attribute, field) in fields.items():
+            for item in getattr(resume, attribute, None) or []:
+                value = getattr(item, field, None)
+                if value and value != "Unknown":
+                    entities[kind][value] = None
+    return {kind: list(names) for kind, names in entities.items() if names}
+
+def build_bulk_messages(unknown: Dict[str, List[str]]) -> List[Dict[str, str]]:
+    """
+    Build one prompt asking for scores of every unknown entity, grouped by kind.
+    """
+    scales = "\n".join(
+        f'- "{kind}": {ENTITY_KINDS[kind][0]}, integer 0-{ENTITY_KINDS[kind][1]} (highest is best)'
+        for kind in unknown
+    )
+    return [
+        {
+            "role": "system",
+            "content": "You score entities found in CVs. Reply with a JSON object only, mapping each kind to an object of name -> integer score."
+        },
+        {
+            "role": "user",
+            "content": f"Score scales:\n{scales}\n\nEntities:\n{json.dumps(unknown, ensure_ascii=False)}"
+        },
+    ]
+
+def parse_bulk_response(content: str, unknown: Dict[str, List[str]]) -> Dict[str, Dict[str, int]]:
+    """
+    Read the bulk JSON reply, clamping each score to its kind's range. Names the
+    model skipped or scored unreadably are left out so they are retried later.
+    """
+    try:
+        data = json.loads(content)
+    except Exception as e:
+        logger.warning(f"Unreadable bulk entity response: {str(e)}")
+        return {}
+    resolved: Dict[str, Dict[str, int]] = {}
+    for kind, names in unknown.items():
+        reply = data.get(kind) if isinstance(data, dict) else None
+        if not isinstance(reply, dict):
+            continue
+        by_key = {fold_name(str(name)): score for name, score in reply.items()}
+        for name in names:
+            try:
+                score = int(by_key[fold_name(name)])
+            except Exception:
+                continue
+            resolved.setdefault(kind, {})[name] = min(max(score, 0), ENTITY_KINDS[kind][1])
+    return resolved
+
+def _lookup_local(entities: Dict[str, List[str]]) -> Tuple[Dict[str, Dict[str, int]], Dict[str, List[str]]]:
+    scores: Dict[str, Dict[str, int]] = {}
+    unknown: Dict[str, List[str]] = {}
+    for kind, names in entities.items():
+        kind_scores = scores.setdefault(kind, {})
+        data_file = ENTITY_KINDS[kind][2]
+        remaining = []
+        for name in dict.fromkeys(names):
+            score = knowledge_base.lookup(data_file, name) if data_file else None
+            if score is None:
+                remaining.append(name)
+            else:
+                kind_scores[name] = score
+        kind_scores.update(entity_memo.get_many(kind, remaining))
+        missing = [name for name in remaining if name not in kind_scores]
+        if missing:
+            unknown[kind] = missing
+    return scores, unknown
+
+def _chunks(unknown: Dict[str, List[str]]) -> List[Dict[str, List[str]]]:
+    flat = [(kind, name) for kind, names in unknown.items() for name in names]
+    chunks = []
+    for start in range(0, len(flat), ENTITY_RESOLVE_MAX_NAMES):
+        chunk: Dict[str, List[str]] = {}
+        for kind, name in flat[start:start + ENTITY_RESOLVE_MAX_NAMES]:
+            chunk.setdefault(kind, []).append(name)
+        chunks.append(chunk)
+    return chunks
+
+def _merge(scores: Dict[str, Dict[str, int]], unknown: Dict[str, List[str]], resolved: Dict[str, Dict[str, int]]) -> None:
+    for kind, names in unknown.items():
+        fresh = resolved.get(kind, {})
+        entity_memo.put_many(kind, fresh)
+        for name in names:
+            if name not in fresh:
+                record_fallback("entity_default_score")
+            scores[kind][name] = fresh.get(name, DEFAULT_SCORE)
+
+def resolve_entity_scores(entities: Dict[str, List[str]]) -> Dict[str, Dict[str, int]]:
+    """
+    Score entities of several kinds: knowledge base first, then the memo, then a
+    single multi-entity LLM call (per ENTITY_RESOLVE_MAX_NAMES names) for
+    whatever is left. Fresh scores are written back to the memo.
+    """
+    scores, unknown = _lookup_local(entities)
+    if not unknown:
+        return scores
+    client = openai_client.get_client(PRIORITY_BACKGROUND)
+    resolved: Dict[str, Dict[str, int]] = {}
+    for chunk in _chunks(unknown):
+        try:
+            response = client.chat.completions.create(
+                model=ENTITY_RESOLVE_MODEL,
+                messages=build_bulk_messages(chunk),
+                response_format={"type": "json_object"},
+                temperature=0.3
+            )
+            for kind, fresh in parse_bulk_response(response.choices[0].message.content, chunk).items():
+                resolved.setdefault(kind, {}).update(fresh)
+        except openai.OpenAIError as e:
+            # Counted in llm_errors_total by the client; the chunk's names get
+            # DEFAULT_SCORE (counted as fallbacks) and are retried next time.
+            logger.error(f"Bulk entity scoring failed: {str(e)}")
+    _merge(scores, unknown, resolved)
+    return scores
+
+async def resolve_entity_scores_async(entities: Dict[str, List[str]]) -> Dict[str, Dict[str, int]]:
+    """
+    Async variant of resolve_entity_scores.
+    """
+    scores, unknown = await asyncio.to_thread(_lookup_local, entities)
+    if not unknown:
+        return scores
+    client = openai_client.get_async_client(PRIORITY_BACKGROUND)
+    resolved: Dict[str, Dict[str, int]] = {}
+    for chunk in _chunks(unknown):
+        try:
+            response = await client.chat.completions.create(
+                model=ENTITY_RESOLVE_MODEL,
+                messages=build_bulk_messages(chunk),
+                response_format={"type": "json_object"},
+                temperature=0.3
+            )
+            for kind, fresh in parse_bulk_response(response.choices[0].message.content, chunk).items():
+                resolved.setdefault(kind, {}).update(fresh)
+        except openai.OpenAIError as e:
+            # Counted in llm_errors_total by the client; the chunk's names get
+            # DEFAULT_SCORE (counted as fallbacks) and are retried next time.
+            logger.error(f"Bulk entity scoring failed: {str(e)}")
+    await asyncio.to_thread(_merge, scores, unknown, resolved)
+    return scores
+
+def build_infer_request(kind: str, name: str, model: str) -> Dict[str, Any]:
+    """
+    Chat completion arguments scoring a single entity, as used by the infer_* functions.
+    """
+    description, max_score, _ = ENTITY_KINDS[kind]
+    phrase, label = INFER_PROMPTS[kind]
+    prompt = f"""
+    Based on the following {phrase}, provide a {description.split()[-1]} score between 0 and {max_score}, where {max_score} is the highest.
+    {label}: {name}
+    """
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": f"You are a {description} evaluator. Provide a score between 0 and {max_score}."},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": 10,
+        "temperature": 0.3,
+    }
+
+def read_infer_response(kind: str, name: str, response: Any) -> int:
+    """
+    Clamp the model's score to the kind's range and memoize it; unreadable
+    replies fall back to DEFAULT_SCORE without being memoized.
+    """
+    try:
+        score = int(response.choices[0].message.content.strip())
+    except Exception:
+        record_fallback("entity_default_score")
+        return DEFAULT_SCORE
+    score = min(max(score, 0), ENTITY_KINDS[kind][1])
+    entity_memo.put(kind, name, score)
+    return score
+
+def infer_entity_score(kind: str, name: str, model: str) -> int:
+    """
+    Score one entity: the memo first, then a single LLM call.
+    """
+    memoized = entity_memo.get(kind, name)
+    if memoized is not None:
+        return memoized
+    client = openai_client.get_client(PRIORITY_BACKGROUND)
+    response = client.chat.completions.create(**build_infer_request(kind, name, model))
+    return read_infer_response(kind, name, response)
+
+async def infer_entity_score_async(kind: str, name: str, model: str) -> int:
+    """
+    Async variant of infer_entity_score.
+    """
+    memoized = await asyncio.to_thread(entity_memo.get, kind, name)
+    if memoized is not None:
+        return memoized
+    client = openai_client.get_async_client(PRIORITY_BACKGROUND)
+    response = await client.chat.completions.create(**build_infer_request(kind, name, model))
+    return await asyncio.to_thread(read_infer_response, kind, name, response)
@@ -0,0 +1,227 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.models.resume import Resume
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "1") == "1"
+EXTRACTION_CACHE_PATH = os.getenv(
+    "EXTRACTION_CACHE_PATH",
+    str(Path(__file__).parent.parent.parent / ".cache" / "extraction_cache.sqlite3")
+)
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "10000"))
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+EXTRACTION_CACHE_TTL_SECONDS = int(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+
+def sha256_bytes(data: bytes) -> str:
+    """
+    Return the hex SHA-256 digest of a byte string.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+def sha256_file(file_path: str) -> str:
+    """
+    Return the hex SHA-256 digest of a file's contents, read in 1 MB blocks.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+@dataclass
+class CachedExtraction:
+    cv_text: str
+    resume: Resume
+    analysis: Dict[str, Any] = field(default_factory=dict)
+
+class ExtractionCache:
+    """
+    Persistent SQLite cache of CV extraction results.
+
+    Entries are keyed by the SHA-256 of the uploaded file plus a prompt version
+    (a hash of the extraction prompt, model and scoring rules), so changing any
+    of those simply stops old entries from matching. Old entries are then aged
+    out by the TTL and the LRU limits on entry count and total bytes.
+    """
+
+    def __init__(
+        self,
+        path: str = EXTRACTION_CACHE_PATH,
+        max_entries: int = EXTRACTION_CACHE_MAX_ENTRIES,
+        max_bytes: int = EXTRACTION_CACHE_MAX_BYTES,
+        ttl_seconds: int = EXTRACTION_CACHE_TTL_SECONDS,
+        enabled: bool = EXTRACTION_CACHE_ENABLED,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.text_hits = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS extractions (
+                    file_hash TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    cv_text TEXT NOT NULL,
+                    resume_json TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (file_hash, prompt_version)
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_extractions_last_access ON extractions (last_access)")
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(extractions)")}
+            if "analysis_json" not in columns:
+                # Summary, evaluation and scoring recommendations from the extraction call.
+                self._conn.execute("ALTER TABLE extractions ADD COLUMN analysis_json TEXT")
+            if "text_version" not in columns:
+                # Settings the text was extracted under; rows without one never serve get_text.
+                self._conn.execute("ALTER TABLE extractions ADD COLUMN text_version TEXT")
+        return self._conn
+
+    def get(self, file_hash: str, prompt_version: str) -> Optional[CachedExtraction]:
+        """
+        Return the cached extraction for this file and prompt version, or None.
+        """
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT cv_text, resume_json, created_at, analysis_json FROM extractions WHERE file_hash = ? AND prompt_version = ?",
+                (file_hash, prompt_version)
+            ).fetchone()
+            if row is None or now - row[2] > self.ttl_seconds:
+                if row is not None:
+                    conn.execute(
+                        "DELETE FROM extractions WHERE file_hash = ? AND prompt_version = ?",
+                        (file_hash, prompt_version)
+                    )
+                self.misses += 1
+                return None
+            conn.execute(
+                "UPDATE extractions SET last_access = ? WHERE file_hash = ? AND prompt_version = ?",
+                (now, file_hash, prompt_version)
+            )
+            self.hits += 1
+        try:
+            return CachedExtraction(
+                cv_text=row[0],
+                resume=Resume(**json.loads(row[1])),
+                analysis=json.loads(row[3]) if row[3] else {}
+            )
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {file_hash[:12]}: {str(e)}")
+            return None
+
+    def get_text(self, file_hash: str, text_version: str) -> Optional[str]:
+        """
+        Return text extracted from this file under the same text version, from
+        any prompt version, so a prompt change can still skip the PDF parse.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT cv_text FROM extractions WHERE file_hash = ? AND text_version = ? AND created_at >= ? "
+                "ORDER BY last_access DESC LIMIT 1",
+                (file_hash, text_version, time.time() - self.ttl_seconds)
+            ).fetchone()
+            if row is not None:
+                self.text_hits += 1
+        return row[0] if row else None
+
+    def put(self, file_hash: str, prompt_version: str, cv_text: str, resume: Resume,
+            analysis: Optional[Dict[str, Any]] = None, text_version: Optional[str] = None) -> None:
+        """
+        Store an extraction and evict least recently used entries beyond the limits.
+        text_version names the settings cv_text was extracted under (see get_text).
+        """
+        if not self.enabled:
+            return
+        resume_json = json.dumps(resume.dict(), ensure_ascii=False)
+        analysis_json = json.dumps(analysis or {}, ensure_ascii=False)
+        size_bytes = len(cv_text.encode("utf-8")) + len(resume_json.encode("utf-8")) + len(analysis_json.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO extractions "
+                "(file_hash, prompt_version, cv_text, resume_json, size_bytes, created_at, last_access, analysis_json, text_version) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (file_hash, prompt_version, cv_text, resume_json, size_bytes, now, now, analysis_json, text_version)
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM extractions WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        count, total_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM extractions").fetchone()
+        while count > self.max_entries or total_bytes > self.max_bytes:
+            row = conn.execute(
+                "SELECT file_hash, prompt_version, size_bytes FROM extractions ORDER BY last_access ASC LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            conn.execute("DELETE FROM extractions WHERE file_hash = ? AND prompt_version = ?", (row[0], row[1]))
+            count -= 1
+            total_bytes -= row[2]
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters for this process and the current cache size.
+        """
+        entries, total_bytes = 0, 0
+        if self.enabled:
+            with self._lock:
+                entries, total_bytes = self._connect().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM extractions"
+                ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "text_hits": self.text_hits,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": total_bytes,
+        }
+
+    def clear(self) -> None:
+        """
+        Remove every entry.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._connect().execute("DELETE FROM extractions")
+
+# Singleton instance
+extraction_cache = ExtractionCache()
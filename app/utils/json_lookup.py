@@ -1,24 +1,20 @@
-import json
-from pathlib import Path
+from app.utils.knowledge_base import knowledge_base
 
 def load_json_data(file_name: str) -> dict:
     """
     Load JSON data from the data folder.
+    Files are parsed once and reloaded only when they change on disk.
     """
-    file_path = Path(__file__).parent.parent / "data" / file_name
-    with open(file_path, "r") as file:
-        return json.load(file)
+    return knowledge_base.data(file_name)
 
 def get_university_score(university: str) -> int:
     """
     Get the score for a university based on its reputation.
     """
-    universities = load_json_data("universities.json")
-    return universities.get(university, 10)
+    return knowledge_base.lookup("universities.json", university, 10)
 
 def get_company_score(company: str) -> int:
     """
     Get the score for a company based on its size.
     """
-    companies = load_json_data("companies.json")
-    return companies.get(company, 10)
\ No newline at end of file
+    return knowledge_base.lookup("companies.json", company, 10)
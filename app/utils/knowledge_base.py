@@ -0,0 +1,225 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.utils.normalization import UNIVERSITY_SYNONYMS, normalize_text
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+KB_RELOAD_INTERVAL = float(os.getenv("KB_RELOAD_INTERVAL", "5"))
+KB_FUZZY_THRESHOLD = float(os.getenv("KB_FUZZY_THRESHOLD", "0.85"))
+# A fuzzy match must beat the runner-up by this much, or the name is ambiguous.
+KB_FUZZY_MARGIN = float(os.getenv("KB_FUZZY_MARGIN", "0.1"))
+
+# Only all-caps parentheticals such as "(HUST)" or "(VNU-UET)" are treated as
+# acronyms; "(Vietnam)" is a qualifier, not a name.
+ACRONYM_PATTERN = re.compile(r"\(([A-Z0-9][A-Z0-9&\-]+)\)")
+
+# Words shared by many entries; a name made only of these identifies nothing.
+GENERIC_WORDS = {
+    "university", "college", "institute", "school", "academy", "of", "and", "the", "for",
+    "technology", "science", "vietnam", "international", "national", "city",
+    "company", "corporation", "group", "startups", "employees", "others",
+}
+# Legal-form words dropped from the end of a name when it has no exact match: "FPT Software Company".
+LEGAL_SUFFIXES = {"company", "co", "corp", "corporation", "group", "jsc", "ltd", "llc", "inc"}
+
+# Synonym tables applied to a file's lookups before matching.
+SYNONYMS = {
+    "universities.json": UNIVERSITY_SYNONYMS,
+}
+
+def fold_name(name: str) -> str:
+    """
+    Fold an entity name to a comparable form: no diacritics (including đ),
+    lowercase, punctuation turned into single spaces.
+    """
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", normalize_text(name)).split())
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+@dataclass
+class Match:
+    key: str
+    value: Any
+    method: str  # exact, alias, prefix or fuzzy
+    similarity: float = 1.0
+
+class _Table:
+    """
+    One flat {name: score} file with its exact, alias and trigram indexes.
+    """
+
+    def __init__(self, data: Dict[str, Any], synonyms: Dict[str, str]):
+        self.data = data
+        self.exact: Dict[str, str] = {}
+        self.aliases: Dict[str, str] = {}
+        self.words: Dict[str, List[str]] = {}
+        self.grams: Dict[str, Set[str]] = {}
+        self.postings: Dict[str, Set[str]] = defaultdict(set)
+        self.synonyms = {fold_name(k): fold_name(v) for k, v in synonyms.items()}
+
+        shared_aliases: Dict[str, Set[str]] = defaultdict(set)
+        for key in data:
+            folded = fold_name(key)
+            self.exact.setdefault(folded, key)
+            for acronym in ACRONYM_PATTERN.findall(key):
+                self.aliases.setdefault(fold_name(acronym), key)
+            without_parens = fold_name(re.sub(r"\([^)]*\)", " ", key))
+            if without_parens and without_parens != folded:
+                shared_aliases[without_parens].add(key)
+            self.words[key] = folded.split()
+            grams = trigrams(folded)
+            self.grams[key] = grams
+            for gram in grams:
+                self.postings[gram].add(key)
+        # "Startups" is the unqualified name of several entries, so it is not an alias of any.
+        for alias, keys in shared_aliases.items():
+            if len(keys) == 1:
+                self.aliases.setdefault(alias, next(iter(keys)))
+        # Synonyms may rewrite an entry's full name to a short form ("RMIT"); that form names the entry.
+        for source, target in self.synonyms.items():
+            if target not in self.exact and source in self.exact:
+                self.aliases.setdefault(target, self.exact[source])
+
+    def resolve(self, name: str, threshold: float, margin: float = KB_FUZZY_MARGIN) -> Optional[Match]:
+        folded = fold_name(name)
+        if not folded:
+            return None
+        folded = self.synonyms.get(folded, folded)
+
+        tokens = folded.split()
+        stripped = list(tokens)
+        while len(stripped) > 1 and stripped[-1] in LEGAL_SUFFIXES:
+            stripped.pop()
+        for form in dict.fromkeys([folded, " ".join(stripped)]):
+            key = self.exact.get(form)
+            if key is not None:
+                return Match(key, self.data[key], "exact")
+            key = self.aliases.get(form)
+            if key is not None:
+                return Match(key, self.data[key], "alias")
+
+        # The query abbreviates the leading words of exactly one entry: "fpt univ", "vng corp".
+        # A single word ("FPT", "Sydney") or only generic words are too weak a signal.
+        if 2 <= len(tokens) <= 3 and any(token not in GENERIC_WORDS for token in tokens):
+            prefixed = [
+                candidate for candidate, words in self.words.items()
+                if len(words) >= len(tokens) and all(word.startswith(token) for word, token in zip(words, tokens))
+            ]
+            if len(prefixed) == 1:
+                return Match(prefixed[0], self.data[prefixed[0]], "prefix")
+
+        # Dice coefficient over character trigrams, scoring only entries that share a trigram.
+        query = trigrams(folded)
+        counts: Dict[str, int] = defaultdict(int)
+        for gram in query:
+            for candidate in self.postings.get(gram, ()):
+                counts[candidate] += 1
+        best: Tuple[float, Optional[str]] = (0.0, None)
+        runner_up = 0.0
+        for candidate, shared in counts.items():
+            similarity = 2 * shared / (len(query) + len(self.grams[candidate]))
+            if similarity > best[0]:
+                best, runner_up = (similarity, candidate), best[0]
+            elif similarity > runner_up:
+                runner_up = similarity
+        if best[1] is not None and best[0] >= threshold and best[0] - runner_up >= margin:
+            return Match(best[1], self.data[best[1]], "fuzzy", best[0])
+        return None
+
+class KnowledgeBase:
+    """
+    Loads every JSON file in app/data once and serves lookups from memory.
+
+    Flat {name: score} files get a normalized, diacritic-folded index with
+    acronym aliases, synonyms and trigram fuzzy matching. File mtimes are
+    checked at most every KB_RELOAD_INTERVAL seconds and changed files are
+    reloaded, so edits to the data take effect without a restart.
+    """
+
+    def __init__(self, data_dir: Path = DATA_DIR, fuzzy_threshold: float = KB_FUZZY_THRESHOLD,
+                 reload_interval: float = KB_RELOAD_INTERVAL, fuzzy_margin: float = KB_FUZZY_MARGIN):
+        self.data_dir = Path(data_dir)
+        self.fuzzy_threshold = fuzzy_threshold
+        self.fuzzy_margin = fuzzy_margin
+        self.reload_interval = reload_interval
+        self._raw: Dict[str, Any] = {}
+        self._tables: Dict[str, _Table] = {}
+        self._mtimes: Dict[str, float] = {}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if self._mtimes and now - self._checked_at < self.reload_interval:
+            return
+        with self._lock:
+            if self._mtimes and now - self._checked_at < self.reload_interval:
+                return
+            self._checked_at = now
+            seen = set()
+            for path in sorted(self.data_dir.glob("*.json")):
+                seen.add(path.name)
+                mtime = path.stat().st_mtime
+                if self._mtimes.get(path.name) == mtime:
+                    continue
+                try:
+                    with open(path, "r", encoding="utf-8") as file:
+                        data = json.load(file)
+                except Exception as e:
+                    logger.error(f"Failed to load knowledge base file {path.name}: {str(e)}")
+                    continue
+                self._raw[path.name] = data
+                if isinstance(data, dict) and all(isinstance(v, (int, float)) for v in data.values()):
+                    self._tables[path.name] = _Table(data, SYNONYMS.get(path.name, {}))
+                self._mtimes[path.name] = mtime
+                logger.info(f"Loaded knowledge base file {path.name}")
+            for name in set(self._mtimes) - seen:
+                self._raw.pop(name, None)
+                self._tables.pop(name, None)
+                self._mtimes.pop(name, None)
+
+    def data(self, file_name: str) -> Any:
+        """
+        Return the parsed contents of a data file.
+        """
+        self._maybe_reload()
+        return self._raw[file_name]
+
+    def resolve(self, file_name: str, name: str) -> Optional[Match]:
+        """
+        Resolve a free-form entity name to an entry of a score table.
+        """
+        if not name:
+            return None
+        self._maybe_reload()
+        table = self._tables.get(file_name)
+        if table is None:
+            return None
+        return table.resolve(name, self.fuzzy_threshold, self.fuzzy_margin)
+
+    def lookup(self, file_name: str, name: str, default: Any = None) -> Any:
+        """
+        Return the score for an entity name, or default if it cannot be resolved.
+        """
+        match = self.resolve(file_name, name)
+        return match.value if match is not None else default
+
+    def names(self, file_name: str) -> List[str]:
+        self._maybe_reload()
+        table = self._tables.get(file_name)
+        return list(table.data) if table is not None else []
+
+# Singleton instance
+knowledge_base = KnowledgeBase()
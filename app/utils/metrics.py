@@ -0,0 +1,247 @@
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Seconds; covers fast scoring steps up to slow LLM calls.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"] + self.samples()
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Per label set: [count per bucket (non-cumulative)], sum, count
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def sum(self, **labels: str) -> float:
+        state = self._values.get(self._key(labels))
+        return state[1] if state else 0.0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, ([*state[0]], state[1], state[2])) for key, state in self._values.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+class MetricsRegistry:
+    """
+    Process-local metrics rendered in the Prometheus text exposition format.
+
+    Each worker process keeps its own values, so with several workers scrape
+    them individually (or run one worker per scrape target).
+    """
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+# Singleton instance
+metrics = MetricsRegistry()
+
+STAGE_SECONDS = metrics.histogram(
+    "cv_stage_duration_seconds", "Time spent in each CV pipeline stage.", ("stage",)
+)
+STAGE_ERRORS = metrics.counter(
+    "cv_stage_errors_total", "Exceptions raised by each CV pipeline stage.", ("stage",)
+)
+FALLBACKS = metrics.counter(
+    "cv_fallbacks_total", "Times a default value was used instead of a model answer.", ("kind",)
+)
+NEAR_DUPLICATES = metrics.counter(
+    "cv_near_duplicates_total", "Uploads matched to an earlier near-identical CV.", ("policy",)
+)
+EXTRACTION_CACHE = metrics.counter(
+    "cv_extraction_cache_total", "Extraction cache lookups.", ("result",)
+)
+LLM_SECONDS = metrics.histogram(
+    "llm_request_duration_seconds", "Chat completion latency, including scheduler retries.", ("model", "stage")
+)
+LLM_TOKENS = metrics.counter(
+    "llm_tokens_total", "Tokens reported in response.usage.", ("model", "stage", "kind")
+)
+LLM_ERRORS = metrics.counter(
+    "llm_errors_total", "Chat completions that failed after retries.", ("model", "stage", "error")
+)
+HTTP_SECONDS = metrics.histogram(
+    "http_request_duration_seconds", "Request latency of the evaluation endpoints.", ("endpoint", "status")
+)
+
+_current_stage: contextvars.ContextVar[str] = contextvars.ContextVar("cv_stage", default="other")
+
+def current_stage() -> str:
+    """
+    The innermost active stage_span, used to label LLM calls made inside it.
+    """
+    return _current_stage.get()
+
+@contextmanager
+def stage_span(stage: str) -> Iterator[None]:
+    """
+    Time a pipeline stage and count its exceptions. Spans nest; LLM calls made
+    inside are labelled with the innermost stage. Do not hold a span across
+    a yield in a generator: the stage label is a context variable. Generators
+    open their calls under stage_label and time themselves with record_stage.
+    """
+    token = _current_stage.set(stage)
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+        _current_stage.reset(token)
+
+@contextmanager
+def stage_label(stage: str) -> Iterator[None]:
+    """
+    Label LLM calls made inside with `stage` without timing a span.
+    """
+    token = _current_stage.set(stage)
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+
+def record_stage(stage: str, seconds: float, failed: bool = False) -> None:
+    """
+    Record a stage timed by hand, like stage_span does.
+    """
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    if failed:
+        STAGE_ERRORS.inc(stage=stage)
+
+def record_fallback(kind: str) -> None:
+    FALLBACKS.inc(kind=kind)
+
+def record_llm_call(model: Optional[str], seconds: float, response: object = None, error: Optional[Exception] = None,
+                    stage: Optional[str] = None) -> None:
+    """
+    Record one chat completion: latency, token usage when the response has it, and failures.
+    stage defaults to the current one.
+    """
+    model = model or "unknown"
+    stage = stage or current_stage()
+    LLM_SECONDS.observe(seconds, model=model, stage=stage)
+    if error is not None:
+        LLM_ERRORS.inc(model=model, stage=stage, error=type(error).__name__)
+        return
+    usage = getattr(response, "usage", None)
+    for kind in ("prompt", "completion"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        if isinstance(tokens, int):
+            LLM_TOKENS.inc(tokens, model=model, stage=stage, kind=kind)
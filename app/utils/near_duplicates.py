@@ -0,0 +1,232 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# "reuse_result": answer with the earlier CV's result, no LLM calls, when the
+#   earlier CV's contact details all appear in the new text.
+# "reuse_extraction": reuse the earlier extraction, then score and reason again.
+# "flag": evaluate normally and mark the result as a near duplicate.
+# "off": no fingerprinting.
+NEAR_DUPLICATE_POLICY = os.getenv("NEAR_DUPLICATE_POLICY", "flag")
+NEAR_DUPLICATE_POLICIES = ("reuse_result", "reuse_extraction", "flag", "off")
+NEAR_DUPLICATE_PATH = os.getenv(
+    "NEAR_DUPLICATE_PATH",
+    str(Path(__file__).parent.parent.parent / ".cache" / "near_duplicates.sqlite3")
+)
+# Estimated Jaccard similarity of word shingles above which two CVs are duplicates.
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.9"))
+NEAR_DUPLICATE_SHINGLE_WORDS = int(os.getenv("NEAR_DUPLICATE_SHINGLE_WORDS", "5"))
+# Texts with fewer shingles (e.g. scanned PDFs with no text layer) are never matched.
+NEAR_DUPLICATE_MIN_SHINGLES = int(os.getenv("NEAR_DUPLICATE_MIN_SHINGLES", "20"))
+
+# 16 bands of 8 rows: pairs above ~0.7 similarity share a bucket with high
+# probability, and candidates are then checked against the threshold.
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.RandomState(1)
+# Fixed seed: signatures must stay comparable across processes and restarts.
+_PERM_A = _rng.randint(1, 1 << 32, NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 32, NUM_PERMUTATIONS, dtype=np.uint64)
+
+_NON_WORD = re.compile(r"[^\w]+")
+_NON_DIGIT = re.compile(r"\D+")
+
+def normalize_text(text: str) -> str:
+    """
+    Fold case, Unicode forms, punctuation, page breaks and whitespace, which
+    re-exporting a CV tends to change.
+    """
+    text = unicodedata.normalize("NFC", text).lower()
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+def shingles(text: str, size: int = NEAR_DUPLICATE_SHINGLE_WORDS) -> Set[int]:
+    """
+    32-bit hashes of the overlapping `size`-word windows of normalized text.
+    """
+    words = normalize_text(text).split()
+    if len(words) < size:
+        windows = [" ".join(words)] if words else []
+    else:
+        windows = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return {int.from_bytes(hashlib.blake2b(w.encode("utf-8"), digest_size=4).digest(), "little") for w in windows}
+
+def minhash(hashed_shingles: Set[int]) -> np.ndarray:
+    """
+    MinHash signature: per permutation, the minimum of (a * x + b) mod p.
+    """
+    values = np.fromiter(hashed_shingles, dtype=np.uint64, count=len(hashed_shingles))
+    # a and x are below 2**32, so a * x fits in uint64 before the modulus.
+    permuted = ((np.outer(values, _PERM_A) % _MERSENNE_PRIME) + _PERM_B) % _MERSENNE_PRIME
+    return permuted.min(axis=0)
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Estimated Jaccard similarity: the fraction of equal signature slots.
+    """
+    return float(np.mean(a == b))
+
+def band_keys(signature: np.ndarray) -> List[int]:
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()
+        keys.append(int.from_bytes(hashlib.blake2b(rows, digest_size=8).digest(), "little", signed=True))
+    return keys
+
+def same_contact(cv_data: Dict[str, Any], text: str) -> bool:
+    """
+    Whether the name, email and phone extracted from an earlier CV all appear
+    in `text`. Two candidates can share a CV template, so a match without a
+    known email or phone number is not enough.
+    """
+    known = {key: str(cv_data.get(key) or "").strip() for key in ("name", "email", "phone")}
+    known = {key: value for key, value in known.items() if value and value != "Unknown"}
+    if "email" not in known and "phone" not in known:
+        return False
+    if "email" in known and known["email"].lower() not in text.lower():
+        return False
+    if "phone" in known:
+        digits = _NON_DIGIT.sub("", known["phone"])
+        if len(digits) < 7 or digits not in _NON_DIGIT.sub("", text):
+            return False
+    if "name" in known and f" {normalize_text(known['name'])} " not in f" {normalize_text(text)} ":
+        return False
+    return True
+
+@dataclass
+class NearDuplicate:
+    file_hash: str
+    similarity: float
+
+class NearDuplicateIndex:
+    """
+    Persistent MinHash LSH index of the texts of evaluated CVs.
+
+    Each CV's signature is split into bands; CVs sharing any band bucket are
+    candidates, and the best candidate at or above the threshold is the
+    match. Lookups touch only the matching buckets, so they stay fast as
+    the index grows. `policy` says what callers do with a match.
+    """
+
+    def __init__(self, path: str = NEAR_DUPLICATE_PATH, threshold: float = NEAR_DUPLICATE_THRESHOLD,
+                 min_shingles: int = NEAR_DUPLICATE_MIN_SHINGLES, policy: str = NEAR_DUPLICATE_POLICY):
+        if policy not in NEAR_DUPLICATE_POLICIES:
+            raise ValueError(f"Unknown near-duplicate policy {policy}; expected one of {NEAR_DUPLICATE_POLICIES}")
+        self.policy = policy
+        self.path = path
+        self.threshold = threshold
+        self.min_shingles = min_shingles
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fingerprints (
+                    file_hash TEXT PRIMARY KEY,
+                    signature BLOB NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS lsh_buckets (
+                    band INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    file_hash TEXT NOT NULL,
+                    PRIMARY KEY (band, bucket, file_hash)
+                ) WITHOUT ROWID
+                """
+            )
+        return self._conn
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        The text's signature, or None when it is too short to fingerprint reliably.
+        """
+        hashed = shingles(text)
+        if len(hashed) < self.min_shingles:
+            return None
+        return minhash(hashed)
+
+    def find(self, text: str, exclude: Optional[str] = None) -> Optional[NearDuplicate]:
+        """
+        The most similar indexed CV at or above the threshold, other than `exclude`.
+        """
+        if self.policy == "off":
+            return None
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        keys = band_keys(signature)
+        with self._lock:
+            conn = self._connect()
+            placeholders = " OR ".join("(band = ? AND bucket = ?)" for _ in keys)
+            params = [value for band, key in enumerate(keys) for value in (band, key)]
+            rows = conn.execute(
+                f"SELECT f.file_hash, f.signature FROM fingerprints f WHERE f.file_hash IN "
+                f"(SELECT file_hash FROM lsh_buckets WHERE {placeholders})",
+                params
+            ).fetchall()
+        best = None
+        for file_hash, blob in rows:
+            if file_hash == exclude:
+                continue
+            score = similarity(signature, np.frombuffer(blob, dtype=np.uint64))
+            if score >= self.threshold and (best is None or score > best.similarity):
+                best = NearDuplicate(file_hash=file_hash, similarity=score)
+        return best
+
+    def add(self, file_hash: str, text: str) -> bool:
+        """
+        Index a CV's text under its file hash; False when it is too short to fingerprint.
+        """
+        if self.policy == "off":
+            return False
+        signature = self.signature(text)
+        if signature is None:
+            return False
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?)",
+                    (file_hash, signature.tobytes(), time.time())
+                )
+                conn.execute("DELETE FROM lsh_buckets WHERE file_hash = ?", (file_hash,))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO lsh_buckets VALUES (?, ?, ?)",
+                    [(band, key, file_hash) for band, key in enumerate(band_keys(signature))]
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return True
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+# Singleton instance
+near_duplicates = NearDuplicateIndex()
@@ -17,9 +17,16 @@ def normalize_text(text: str) -> str:
     """
     Normalize text by removing diacritics and converting to lowercase.
     """
+    # "đ" has no Unicode decomposition, so NFKD alone would drop it.
+    text = text.replace("đ", "d").replace("Đ", "D")
     text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
     return text.lower()
 
+# Normalized synonym keys, computed once instead of on every lookup.
+_NORMALIZED_SYNONYMS: Dict[str, str] = {}
+for _key, _value in UNIVERSITY_SYNONYMS.items():
+    _NORMALIZED_SYNONYMS.setdefault(normalize_text(_key), _value)
+
 def normalize_university_name(university: str) -> str:
     """
     Normalize university names using a synonym dictionary.
@@ -27,10 +34,5 @@ def normalize_university_name(university: str) -> str:
     # Remove diacritics and convert to lowercase
     normalized_name = normalize_text(university)
     
-    # Check if the normalized name matches any synonym
-    for key, value in UNIVERSITY_SYNONYMS.items():
-        if normalize_text(key) == normalized_name:
-            return value
-    
     # If no match, return the original normalized name
-    return normalized_name
\ No newline at end of file
+    return _NORMALIZED_SYNONYMS.get(normalized_name, normalized_name)
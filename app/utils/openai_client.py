@@ -1,20 +1,407 @@
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+import openai
 from dotenv import load_dotenv
+import asyncio
+import httpx
+import logging
 import os
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Optional
+
+from app.utils.metrics import current_stage, record_llm_call
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Point at an OpenAI-compatible server, e.g. benchmarks/openai_standin.py for offline load tests.
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+OPENAI_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY_SECONDS", "30"))
+OPENAI_CONNECT_TIMEOUT_SECONDS = float(os.getenv("OPENAI_CONNECT_TIMEOUT_SECONDS", "5"))
+OPENAI_READ_TIMEOUT_SECONDS = float(os.getenv("OPENAI_READ_TIMEOUT_SECONDS", "120"))
+
+LLM_SCHEDULER_ENABLED = os.getenv("LLM_SCHEDULER_ENABLED", "1") == "1"
+LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "500"))
+LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "30000"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "30"))
+
+# Lower numbers go first: interactive extraction and reasoning for a waiting
+# request before background entity scoring and summarization.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+class TokenBucket:
+    """
+    Refills at `per_minute / 60` units per second up to `per_minute`.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """
+        Seconds until `amount` units are available (0 if they are now).
+        """
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def give_back(self, amount: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+def estimate_tokens(kwargs: Dict[str, Any]) -> int:
+    """
+    Rough token cost of a chat request before it is sent: prompt characters / 4
+    plus the completion budget.
+    """
+    prompt_chars = sum(len(str(message.get("content", ""))) for message in kwargs.get("messages", []))
+    return prompt_chars // 4 + int(kwargs.get("max_tokens") or 500)
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Rate limits, server errors, timeouts and dropped connections are worth retrying.
+    """
+    if isinstance(error, (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except Exception:
+        return None
+
+class LLMScheduler:
+    """
+    Admission control for every chat completion in the process.
+
+    A call is admitted when fewer than max_concurrency calls are in flight and
+    both the requests-per-minute and tokens-per-minute buckets can cover it;
+    background calls also wait while any interactive call is queued. Sync
+    callers sleep and async callers await between admission attempts, so one
+    gate serves both. Retryable failures are retried with full-jitter
+    exponential backoff, honouring Retry-After when the server sends it.
+    """
+
+    def __init__(self, rpm: int = LLM_RPM_LIMIT, tpm: int = LLM_TPM_LIMIT,
+                 max_concurrency: int = LLM_MAX_CONCURRENCY, max_retries: int = LLM_MAX_RETRIES):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.in_flight = 0
+        self.waiting = {PRIORITY_INTERACTIVE: 0, PRIORITY_BACKGROUND: 0}
+        self.stats = {"calls": 0, "retries": 0, "failures": 0, "throttled_seconds": 0.0}
+        self._lock = threading.Lock()
+
+    def _try_admit(self, priority: int, cost: int) -> float:
+        with self._lock:
+            if priority > PRIORITY_INTERACTIVE and self.waiting[PRIORITY_INTERACTIVE]:
+                return 0.05
+            if self.in_flight >= self.max_concurrency:
+                return 0.01
+            wait = max(self.requests.wait_time(1), self.tokens.wait_time(cost))
+            if wait > 0:
+                return wait
+            self.requests.take(1)
+            self.tokens.take(cost)
+            self.in_flight += 1
+            self.stats["calls"] += 1
+            return 0.0
+
+    def _release(self, cost: int, response: Any) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            used = getattr(getattr(response, "usage", None), "total_tokens", None)
+            if isinstance(used, int) and used < cost:
+                self.tokens.give_back(cost - used)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        delay = random.uniform(0, min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2 ** attempt))
+        retry_after = _retry_after(error)
+        return max(delay, retry_after) if retry_after is not None else delay
+
+    def _enter_queue(self, priority: int, delta: int) -> None:
+        with self._lock:
+            self.waiting[priority] = self.waiting.get(priority, 0) + delta
+
+    def acquire(self, priority: int, cost: int) -> None:
+        self._enter_queue(priority, 1)
+        try:
+            while True:
+                wait = self._try_admit(priority, cost)
+                if wait == 0:
+                    return
+                self.stats["throttled_seconds"] += wait
+                time.sleep(wait)
+        finally:
+            self._enter_queue(priority, -1)
+
+    async def acquire_async(self, priority: int, cost: int) -> None:
+        self._enter_queue(priority, 1)
+        try:
+            while True:
+                wait = self._try_admit(priority, cost)
+                if wait == 0:
+                    return
+                self.stats["throttled_seconds"] += wait
+                await asyncio.sleep(wait)
+        finally:
+            self._enter_queue(priority, -1)
+
+    def call(self, create: Callable[..., Any], kwargs: Dict[str, Any], priority: int = PRIORITY_INTERACTIVE) -> Any:
+        cost = estimate_tokens(kwargs)
+        for attempt in range(self.max_retries + 1):
+            self.acquire(priority, cost)
+            response = None
+            try:
+                response = create(**kwargs)
+                return response
+            except Exception as e:
+                if not is_retryable(e) or attempt == self.max_retries:
+                    self.stats["failures"] += 1
+                    raise
+                delay = self._backoff(attempt, e)
+                logger.warning(f"LLM call failed ({type(e).__name__}), retry {attempt + 1} in {delay:.2f}s")
+                self.stats["retries"] += 1
+            finally:
+                self._release(cost, response)
+            time.sleep(delay)
+
+    async def call_async(self, create: Callable[..., Any], kwargs: Dict[str, Any], priority: int = PRIORITY_INTERACTIVE) -> Any:
+        cost = estimate_tokens(kwargs)
+        for attempt in range(self.max_retries + 1):
+            await self.acquire_async(priority, cost)
+            response = None
+            held = False
+            try:
+                response = await create(**kwargs)
+                if kwargs.get("stream"):
+                    # The slot stays taken until the stream is consumed or closed.
+                    held = True
+                    return HeldStream(response, lambda usage: self._release(cost, SimpleNamespace(usage=usage)))
+                return response
+            except Exception as e:
+                if not is_retryable(e) or attempt == self.max_retries:
+                    self.stats["failures"] += 1
+                    raise
+                delay = self._backoff(attempt, e)
+                logger.warning(f"LLM call failed ({type(e).__name__}), retry {attempt + 1} in {delay:.2f}s")
+                self.stats["retries"] += 1
+            finally:
+                if not held:
+                    self._release(cost, response)
+            await asyncio.sleep(delay)
+
+class HeldStream:
+    """
+    A streamed completion that calls on_done(usage) once, when it has been
+    read to the end, fails, is closed, or is garbage collected unread. usage
+    is the last chunk's usage (sent with stream_options={"include_usage": True}),
+    or None.
+    """
+
+    def __init__(self, stream: Any, on_done: Callable[[Any], None]):
+        self._stream = stream
+        self._on_done = on_done
+        self.usage = None
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        try:
+            async for chunk in self._stream:
+                if getattr(chunk, "usage", None) is not None:
+                    self.usage = chunk.usage
+                yield chunk
+        finally:
+            self._finish()
+
+    def _finish(self) -> None:
+        on_done, self._on_done = self._on_done, None
+        if on_done is not None:
+            on_done(self.usage)
+
+    async def aclose(self) -> None:
+        close = getattr(self._stream, "aclose", None) or getattr(self._stream, "close", None)
+        try:
+            if close is not None:
+                result = close()
+                if asyncio.iscoroutine(result):
+                    await result
+        finally:
+            self._finish()
+
+    def __del__(self):
+        self._finish()
+
+class _ScheduledCompletions:
+    def __init__(self, raw: Any, scheduler: Optional[LLMScheduler], priority: int):
+        self._raw = raw
+        self._scheduler = scheduler
+        self._priority = priority
+
+    def create(self, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            if self._scheduler is None:
+                response = self._raw.chat.completions.create(**kwargs)
+            else:
+                response = self._scheduler.call(self._raw.chat.completions.create, kwargs, self._priority)
+        except Exception as e:
+            record_llm_call(kwargs.get("model"), time.perf_counter() - start, error=e)
+            raise
+        record_llm_call(kwargs.get("model"), time.perf_counter() - start, response)
+        return response
+
+class _AsyncScheduledCompletions(_ScheduledCompletions):
+    async def create(self, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            if self._scheduler is None:
+                response = await self._raw.chat.completions.create(**kwargs)
+            else:
+                response = await self._scheduler.call_async(self._raw.chat.completions.create, kwargs, self._priority)
+        except Exception as e:
+            record_llm_call(kwargs.get("model"), time.perf_counter() - start, error=e)
+            raise
+        if kwargs.get("stream"):
+            # Recorded once read to the end, with the usage of the last chunk,
+            # under the stage the stream was opened in.
+            model, stage = kwargs.get("model"), current_stage()
+            return HeldStream(response, lambda usage: record_llm_call(
+                model, time.perf_counter() - start, SimpleNamespace(usage=usage), stage=stage
+            ))
+        record_llm_call(kwargs.get("model"), time.perf_counter() - start, response)
+        return response
+
+class ScheduledClient:
+    """
+    Wraps an OpenAI client so chat.completions.create goes through the
+    scheduler (when there is one) and is recorded in the LLM metrics;
+    everything else is passed through to the wrapped client.
+    """
+
+    def __init__(self, raw: Any, scheduler: Optional[LLMScheduler], priority: int, is_async: bool = False):
+        self._raw = raw
+        completions = _AsyncScheduledCompletions if is_async else _ScheduledCompletions
+        self.chat = SimpleNamespace(completions=completions(raw, scheduler, priority))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
 class OpenAIClientManager:
+    """
+    Per-process factory for the OpenAI clients.
+
+    Clients are built lazily on a pooled httpx transport (one pool for sync
+    calls, one for async) with the limits and timeouts below. The manager
+    remembers which process created them; after a fork the child drops the
+    inherited clients and scheduler without closing them (the sockets still
+    belong to the parent) and builds fresh ones on first use.
+    """
     _instance = None
-    
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(OpenAIClientManager, cls).__new__(cls)
-            cls._instance.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            cls._instance._reset()
         return cls._instance
-    
-    def get_client(self):
-        return self.client
+
+    def _reset(self) -> None:
+        self.client = None
+        self.async_client = None
+        self.scheduler = LLMScheduler()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def _check_process(self) -> None:
+        if self._pid != os.getpid():
+            self._reset()
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+        )
+
+    def _timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(OPENAI_READ_TIMEOUT_SECONDS, connect=OPENAI_CONNECT_TIMEOUT_SECONDS)
+
+    def _sdk_retries(self) -> int:
+        # The scheduler retries itself; SDK retries would bypass its rate limits.
+        return 0 if LLM_SCHEDULER_ENABLED else 2
+
+    def get_client(self, priority: int = PRIORITY_INTERACTIVE):
+        self._check_process()
+        if self.client is None:
+            with self._lock:
+                if self.client is None:
+                    self.client = OpenAI(
+                        api_key=os.getenv("OPENAI_API_KEY"),
+                        base_url=OPENAI_BASE_URL,
+                        max_retries=self._sdk_retries(),
+                        timeout=self._timeout(),
+                        http_client=httpx.Client(limits=self._limits(), timeout=self._timeout()),
+                    )
+        return ScheduledClient(self.client, self.scheduler if LLM_SCHEDULER_ENABLED else None, priority)
+
+    def get_async_client(self, priority: int = PRIORITY_INTERACTIVE):
+        """
+        Return the AsyncOpenAI client, creating it on first use so that it
+        binds to whichever event loop the server is running.
+        """
+        self._check_process()
+        if self.async_client is None:
+            with self._lock:
+                if self.async_client is None:
+                    self.async_client = AsyncOpenAI(
+                        api_key=os.getenv("OPENAI_API_KEY"),
+                        base_url=OPENAI_BASE_URL,
+                        max_retries=self._sdk_retries(),
+                        timeout=self._timeout(),
+                        http_client=httpx.AsyncClient(limits=self._limits(), timeout=self._timeout()),
+                    )
+        return ScheduledClient(self.async_client, self.scheduler if LLM_SCHEDULER_ENABLED else None, priority, is_async=True)
+
+    async def aclose(self) -> None:
+        """
+        Close this process's connection pools; clients are rebuilt on next use.
+        """
+        client, async_client = self.client, self.async_client
+        self.client, self.async_client = None, None
+        if async_client is not None and hasattr(async_client, "close"):
+            await async_client.close()
+        if client is not None and hasattr(client, "close"):
+            client.close()
 
 # Singleton instance
-openai_client = OpenAIClientManager() 
\ No newline at end of file
+openai_client = OpenAIClientManager()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=openai_client._reset)
@@ -0,0 +1,254 @@
+import base64
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RESULT_STORE_PATH = os.getenv(
+    "RESULT_STORE_PATH",
+    str(Path(__file__).parent.parent.parent / ".cache" / "results.sqlite3")
+)
+RESULT_STORE_BATCH_SIZE = int(os.getenv("RESULT_STORE_BATCH_SIZE", "50"))
+RESULT_STORE_FLUSH_SECONDS = float(os.getenv("RESULT_STORE_FLUSH_SECONDS", "2"))
+
+CATEGORIES = ("education", "experience", "projects", "awards", "certifications")
+# Columns results can be sorted by; all are NOT NULL so keyset pagination is exact.
+SORT_COLUMNS = ("total_score", "processed_at", "stored_at") + CATEGORIES
+RESULT_QUERY_MAX_LIMIT = 500
+
+# Columns written per result, in the order result_row() produces them.
+_ROW_COLUMNS = ("file_hash", "file_name", "name", "email", "status", "total_score") + CATEGORIES + (
+    "processed_at", "result_json", "stored_at"
+)
+_SUMMARY_COLUMNS = ("id",) + _ROW_COLUMNS[:-2]
+
+def _encode_cursor(value: Any, row_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([value, row_id]).encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[Any, int]:
+    try:
+        value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return value, int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def result_row(result: Dict[str, Any], file_hash: str) -> tuple:
+    """
+    Flatten an evaluation result into the indexed columns of the results table.
+    """
+    cv_data = result.get("cv_data") or {}
+    scores = result.get("scores") or {}
+    return (
+        file_hash,
+        result.get("file_name", ""),
+        cv_data.get("name"),
+        (cv_data.get("email") or "").strip().lower() or None,
+        result.get("status", ""),
+        float(result.get("total_score") or 0.0),
+        *(float(scores.get(category) or 0.0) for category in CATEGORIES),
+        result.get("processed_at", ""),
+        json.dumps(result, ensure_ascii=False),
+        time.time(),
+    )
+
+class ResultStore:
+    """
+    SQLite store of evaluation results, one row per file hash, indexed for
+    filtering by email, status, total and per-category scores.
+
+    save() buffers results and writes them in a single transaction once
+    `batch_size` are pending, or from a timer thread `flush_seconds` after
+    the oldest was saved; reads flush first, so they always see every saved
+    result. Re-evaluating a file replaces its row.
+    """
+
+    def __init__(self, path: str = RESULT_STORE_PATH, batch_size: int = RESULT_STORE_BATCH_SIZE,
+                 flush_seconds: float = RESULT_STORE_FLUSH_SECONDS):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: List[tuple] = []
+        self._timer: Optional[threading.Timer] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS results (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    file_hash TEXT NOT NULL UNIQUE,
+                    file_name TEXT NOT NULL,
+                    name TEXT,
+                    email TEXT,
+                    status TEXT NOT NULL,
+                    total_score REAL NOT NULL,
+                    {", ".join(f"{category} REAL NOT NULL" for category in CATEGORIES)},
+                    processed_at TEXT NOT NULL,
+                    result_json TEXT NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_email ON results (email)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_status ON results (status, total_score, id)")
+            for column in ("total_score", "processed_at", "stored_at") + CATEGORIES:
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_results_{column} ON results ({column}, id)")
+        return self._conn
+
+    def save(self, result: Dict[str, Any], file_hash: str) -> None:
+        """
+        Queue a result for the next batched write, which happens at the
+        latest `flush_seconds` from now.
+        """
+        with self._lock:
+            self._pending.append(result_row(result, file_hash))
+            if len(self._pending) >= self.batch_size or self.flush_seconds <= 0:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_seconds, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def save_many(self, results: List[Tuple[Dict[str, Any], str]]) -> None:
+        """
+        Write (result, file_hash) pairs now, all or none.
+        """
+        with self._lock:
+            self._pending.extend(result_row(result, file_hash) for result, file_hash in results)
+            self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_on_timer(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Flushing {len(self._pending)} results failed: {str(e)}")
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        updates = ", ".join(f"{column} = excluded.{column}" for column in _ROW_COLUMNS[1:])
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                f"INSERT INTO results ({', '.join(_ROW_COLUMNS)}) VALUES ({', '.join('?' * len(_ROW_COLUMNS))}) "
+                f"ON CONFLICT(file_hash) DO UPDATE SET {updates}",
+                self._pending
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        logger.debug(f"Stored {len(self._pending)} results")
+        self._pending = []
+
+    def get(self, file_hash: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._flush_locked()
+            row = self._connect().execute("SELECT result_json FROM results WHERE file_hash = ?", (file_hash,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        email: Optional[str] = None,
+        file_hash: Optional[str] = None,
+        min_scores: Optional[Dict[str, float]] = None,
+        max_scores: Optional[Dict[str, float]] = None,
+        sort: str = "total_score",
+        descending: bool = True,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        include_result: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Filter and sort results with keyset pagination. min_scores/max_scores
+        map "total_score" or a category to an inclusive bound. Returns
+        {"results": [...], "next_cursor": str or None}; pass next_cursor back
+        to get the following page.
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort}; expected one of {SORT_COLUMNS}")
+        conditions, params = [], []
+        for column, value in (("status", status), ("email", email and email.strip().lower()), ("file_hash", file_hash)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        for bounds, operator in ((min_scores, ">="), (max_scores, "<=")):
+            for column, value in (bounds or {}).items():
+                if column not in ("total_score",) + CATEGORIES:
+                    raise ValueError(f"Unknown score {column}")
+                conditions.append(f"{column} {operator} ?")
+                params.append(value)
+        if cursor is not None:
+            value, row_id = _decode_cursor(cursor)
+            conditions.append(f"({sort}, id) {'<' if descending else '>'} (?, ?)")
+            params += [value, row_id]
+
+        limit = max(1, min(limit, RESULT_QUERY_MAX_LIMIT))
+        direction = "DESC" if descending else "ASC"
+        columns = _SUMMARY_COLUMNS + ((sort,) if sort not in _SUMMARY_COLUMNS else ())
+        columns += ("result_json",) if include_result else ()
+        sql = (
+            f"SELECT {', '.join(columns)} FROM results"
+            + (f" WHERE {' AND '.join(conditions)}" if conditions else "")
+            + f" ORDER BY {sort} {direction}, id {direction} LIMIT ?"
+        )
+        with self._lock:
+            self._flush_locked()
+            cursor_rows = self._connect().execute(sql, tuple(params) + (limit + 1,))
+            names = [description[0] for description in cursor_rows.description]
+            rows = [dict(zip(names, row)) for row in cursor_rows.fetchall()]
+
+        next_cursor = _encode_cursor(rows[limit - 1][sort], rows[limit - 1]["id"]) if len(rows) > limit else None
+        return {"results": [self._summary(row) for row in rows[:limit]], "next_cursor": next_cursor}
+
+    @staticmethod
+    def _summary(row: Dict[str, Any]) -> Dict[str, Any]:
+        summary = {
+            "id": row["id"],
+            "file_hash": row["file_hash"],
+            "file_name": row["file_name"],
+            "name": row["name"],
+            "email": row["email"],
+            "status": row["status"],
+            "total_score": row["total_score"],
+            "scores": {category: row[category] for category in CATEGORIES},
+            "processed_at": row["processed_at"],
+        }
+        if "result_json" in row:
+            summary["result"] = json.loads(row["result_json"])
+        return summary
+
+    def count(self) -> int:
+        with self._lock:
+            self._flush_locked()
+            return self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+# Singleton instance
+result_store = ResultStore()
@@ -0,0 +1,35 @@
+import os
+from typing import List, Optional
+
+from fastapi import HTTPException, UploadFile
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(64 * 1024)))
+
+async def read_upload_limited(
+    file: UploadFile,
+    max_bytes: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> bytes:
+    """
+    Read an upload into memory chunk by chunk, raising 413 as soon as it grows
+    past max_bytes (MAX_UPLOAD_BYTES by default) instead of buffering the whole
+    file first.
+    """
+    max_bytes = MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+    chunk_size = UPLOAD_CHUNK_BYTES if chunk_size is None else chunk_size
+    declared_size = getattr(file, "size", None)
+    if declared_size is not None and declared_size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"File exceeds the {max_bytes} byte upload limit")
+
+    chunks: List[bytes] = []
+    received = 0
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        received += len(chunk)
+        if received > max_bytes:
+            raise HTTPException(status_code=413, detail=f"File exceeds the {max_bytes} byte upload limit")
+        chunks.append(chunk)
+    return b"".join(chunks)
@@ -0,0 +1,45 @@
+import asyncio
+import os
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# "process" keeps CPU-bound PyPDF2 parsing off the GIL; "thread" is cheaper to
+# start and is what tests and the benchmarks use.
+WORKER_POOL_KIND = os.getenv("CV_WORKER_POOL", "process")
+WORKER_POOL_SIZE = int(os.getenv("CV_WORKER_POOL_SIZE", str(os.cpu_count() or 1)))
+
+_executor: Optional[Executor] = None
+
+def get_worker_pool() -> Executor:
+    """
+    Return the process-wide executor used for CPU-bound work, creating it on first use.
+    """
+    global _executor
+    if _executor is None:
+        if WORKER_POOL_KIND == "thread":
+            _executor = ThreadPoolExecutor(max_workers=WORKER_POOL_SIZE, thread_name_prefix="cv-worker")
+        else:
+            _executor = ProcessPoolExecutor(max_workers=WORKER_POOL_SIZE)
+        logger.info(f"Started {WORKER_POOL_KIND} worker pool with {WORKER_POOL_SIZE} workers")
+    return _executor
+
+async def run_in_worker(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking function on the worker pool without stalling the event loop.
+    The function and its arguments must be picklable when the pool is process-based.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_worker_pool(), partial(func, *args, **kwargs))
+
+def shutdown_worker_pool() -> None:
+    """
+    Shut the worker pool down; the next call to get_worker_pool starts a fresh one.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
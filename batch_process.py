@@ -1,62 +1,337 @@
-import json
+"""
+Evaluate every PDF in a directory against the running API.
+
+Requests go through one pooled async HTTP client. The number in flight is
+adjusted by AIMD (additive increase, multiplicative decrease): it grows by
+about one per round of successful requests and halves when the server
+answers 429/503 or latency climbs well above the best seen so far. Retry-After
+is honored by pausing all new requests. Files are streamed from the directory
+with no cap, results go to the result store in the output directory, and
+throughput and ETA are logged as the run progresses.
+
+Usage:
+    python batch_process.py cvs --output-dir results --max-concurrency 32
+"""
+import argparse
+import asyncio
+import collections
+import email.utils
+import hashlib
 import logging
+import os
+import random
+import time
 from pathlib import Path
-import concurrent.futures
-from app.test_api import CVAPITester
-
-# Configure logging for both file & console output
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("batch_process.log"),
-        logging.StreamHandler()
-    ]
-)
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+
+from app.utils.result_store import ResultStore
+
 logger = logging.getLogger(__name__)
 
-def process_file(file_path: Path, tester: CVAPITester, output_dir: Path):
-    logger.info(f"Processing CV: {file_path}")
-    result = tester.send_cv(file_path)
-    if result:
-        tester.save_result(result, output_dir)
-        logger.info(f"Successfully processed and saved result for {file_path.name}")
-    else:
-        logger.error(f"Failed to process CV: {file_path}")
-    return result
+RETRY_STATUSES = (429, 502, 503, 504)
+OVERLOAD_STATUSES = (429, 503)
 
-def main():
-    # Define input and output directories (using raw strings for Windows paths)
-    input_dir = r"C:\Users\Admin\Documents\AI-CV-SCREENING-SYSTEM\cvs"
-    output_dir = Path(r"C:\Users\Admin\Documents\AI-CV-SCREENING-SYSTEM\results")
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Get up to 10 PDF files from the input directory
-    cv_files = list(Path(input_dir).glob("*.pdf"))[:10]
-    
-    if not cv_files:
-        logger.error(f"No PDF files found in {input_dir}")
-        return
-    
-    logger.info(f"Found {len(cv_files)} CV files to process.")
-    
-    # Initialize the API tester (replace URL if needed)
-    tester = CVAPITester(api_url="http://localhost:8000/api/evaluate-cv")
-    
-    # Process files concurrently using a thread pool
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-        future_to_file = {
-            executor.submit(process_file, file, tester, output_dir): file
-            for file in cv_files
+def iter_pdf_files(input_dir: str) -> Iterator[Path]:
+    """
+    Yield the PDFs under input_dir lazily, in directory order.
+    """
+    stack = [input_dir]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(".pdf"):
+                    yield Path(entry.path)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header (delay in seconds or an HTTP date).
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class AIMDLimiter:
+    """
+    Concurrency limit adjusted by AIMD.
+
+    Each success below the latency threshold adds 1/limit (about +1 per full
+    round of requests); an overload signal halves the limit, at most once
+    per cooldown so one burst of 429s counts as a single decrease. The
+    latency threshold is `latency_tolerance` times the lowest smoothed
+    latency in the last `window` requests.
+    """
+
+    def __init__(self, initial: float = 4, minimum: float = 1, maximum: float = 64,
+                 latency_tolerance: float = 2.0, window: int = 100):
+        self.limit = float(initial)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self.smoothed_latency: Optional[float] = None
+        self._recent = collections.deque(maxlen=window)
+        self._last_decrease = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+
+    @property
+    def baseline_latency(self) -> Optional[float]:
+        return min(self._recent) if self._recent else None
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            # Created lazily so it binds to the running event loop.
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        self.smoothed_latency = latency if self.smoothed_latency is None else 0.8 * self.smoothed_latency + 0.2 * latency
+        baseline = self.baseline_latency
+        self._recent.append(self.smoothed_latency)
+        if baseline is not None and self.smoothed_latency > self.latency_tolerance * baseline:
+            self.decrease(cooldown=self.smoothed_latency)
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def on_overload(self, cooldown: Optional[float] = None) -> None:
+        self.decrease(cooldown if cooldown is not None else (self.smoothed_latency or 1.0))
+
+    def decrease(self, cooldown: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit / 2)
+
+class Progress:
+    """
+    Completed count, throughput over a sliding window and ETA.
+    """
+
+    def __init__(self, total: Optional[int] = None, window_seconds: float = 30.0):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self.window_seconds = window_seconds
+        self._finished_at = collections.deque()
+
+    def record(self, ok: bool) -> None:
+        self.done += 1
+        if not ok:
+            self.failed += 1
+        now = time.monotonic()
+        self._finished_at.append(now)
+        while self._finished_at and now - self._finished_at[0] > self.window_seconds:
+            self._finished_at.popleft()
+
+    @property
+    def throughput(self) -> float:
+        """
+        CVs per second over the last window (since the start for short runs).
+        """
+        elapsed = min(time.monotonic() - self.started, self.window_seconds)
+        return len(self._finished_at) / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        if self.total is None or self.throughput == 0:
+            return None
+        return max(0, self.total - self.done) / self.throughput
+
+    def snapshot(self) -> Dict[str, Any]:
+        eta = self.eta_seconds
+        return {
+            "done": self.done,
+            "total": self.total,
+            "failed": self.failed,
+            "cvs_per_sec": round(self.throughput, 2),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "elapsed_seconds": round(time.monotonic() - self.started, 1),
         }
-        for future in concurrent.futures.as_completed(future_to_file):
-            file = future_to_file[future]
+
+class AsyncBatchClient:
+    """
+    Upload CVs to /api/evaluate-cv through a pooled client under an AIMD limit.
+    """
+
+    def __init__(self, api_url: str = "http://localhost:8000/api/evaluate-cv", limiter: Optional[AIMDLimiter] = None,
+                 max_retries: int = 5, backoff_base: float = 1.0, timeout: float = 300.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.api_url = api_url
+        self.limiter = limiter or AIMDLimiter()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.timeout = timeout
+        self.transport = transport
+        self.retries = 0
+        self._paused_until = 0.0
+
+    def _client(self) -> httpx.AsyncClient:
+        connections = int(self.limiter.maximum)
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout, connect=10.0),
+            limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+            transport=self.transport,
+        )
+
+    async def _wait_if_paused(self) -> None:
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def send(self, client: httpx.AsyncClient, path: Path, data: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Post one CV, holding a limiter slot per attempt. Returns the result, or None on failure.
+        """
+        for attempt in range(self.max_retries + 1):
+            await self._wait_if_paused()
+            await self.limiter.acquire()
+            start = time.monotonic()
+            try:
+                response = await client.post(self.api_url, files={"file": (path.name, data, "application/pdf")})
+            except httpx.TransportError as e:
+                logger.warning(f"{path.name}: {type(e).__name__} (attempt {attempt + 1})")
+                self.limiter.on_overload()
+                retry_after = None
+            else:
+                if response.status_code == 200:
+                    self.limiter.on_success(time.monotonic() - start)
+                    return response.json()
+                if response.status_code not in RETRY_STATUSES:
+                    logger.error(f"{path.name}: HTTP {response.status_code}: {response.text[:200]}")
+                    return None
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if response.status_code in OVERLOAD_STATUSES:
+                    self.limiter.on_overload(cooldown=retry_after)
+                if retry_after is not None:
+                    # Pause everyone, not just this request: the server asked for room.
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            finally:
+                await self.limiter.release()
+
+            if attempt == self.max_retries:
+                break
+            self.retries += 1
+            if retry_after is None:
+                await asyncio.sleep(self.backoff_base * 2 ** attempt * random.uniform(0.5, 1.5))
+        logger.error(f"{path.name}: giving up after {self.max_retries + 1} attempts")
+        return None
+
+    async def run(self, files: Iterator[Path], store: Optional[ResultStore] = None,
+                  progress: Optional[Progress] = None, report_interval: float = 5.0) -> Progress:
+        """
+        Evaluate all files, saving results to `store`. New files are read
+        only when a slot is free, so memory does not grow with the directory.
+        """
+        progress = progress or Progress()
+        pending = set()
+
+        async def one(path: Path) -> None:
             try:
-                future.result()
+                data = await asyncio.to_thread(path.read_bytes)
+                result = await self.send(client, path, data)
+                if result is not None and store is not None:
+                    store.save(result, hashlib.sha256(data).hexdigest())
+                progress.record(result is not None)
             except Exception as e:
-                logger.error(f"Exception processing {file}: {e}")
-    
+                logger.error(f"{path.name}: {str(e)}")
+                progress.record(False)
+
+        async def report() -> None:
+            while True:
+                await asyncio.sleep(report_interval)
+                self._log_progress(progress)
+
+        reporter = asyncio.create_task(report())
+        try:
+            async with self._client() as client:
+                for path in files:
+                    # Keep at most one request waiting beyond the current limit.
+                    while len(pending) > int(self.limiter.limit):
+                        _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    pending.add(asyncio.create_task(one(path)))
+                if pending:
+                    await asyncio.wait(pending)
+        finally:
+            reporter.cancel()
+            if store is not None:
+                store.flush()
+        self._log_progress(progress)
+        return progress
+
+    def _log_progress(self, progress: Progress) -> None:
+        snapshot = progress.snapshot()
+        eta = f"{snapshot['eta_seconds']}s" if snapshot["eta_seconds"] is not None else "?"
+        logger.info(
+            f"{snapshot['done']}/{snapshot['total'] or '?'} done ({snapshot['failed']} failed), "
+            f"{snapshot['cvs_per_sec']} CVs/s, ETA {eta}, concurrency {self.limiter.limit:.1f} "
+            f"({self.limiter.in_flight} in flight), {self.retries} retries"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input_dir", help="Directory of PDFs (searched recursively)")
+    parser.add_argument("--output-dir", default="results")
+    parser.add_argument("--api-url", default="http://localhost:8000/api/evaluate-cv")
+    parser.add_argument("--initial-concurrency", type=float, default=4)
+    parser.add_argument("--max-concurrency", type=float, default=64)
+    parser.add_argument("--latency-tolerance", type=float, default=2.0,
+                        help="Back off when latency exceeds this multiple of the best recent latency")
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--report-interval", type=float, default=5.0)
+    parser.add_argument("--no-count", action="store_true", help="Skip counting files first (no ETA)")
+    args = parser.parse_args()
+
+    # Configure logging for both file & console output
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[
+            logging.FileHandler("batch_process.log"),
+            logging.StreamHandler()
+        ]
+    )
+
+    total = None if args.no_count else sum(1 for _ in iter_pdf_files(args.input_dir))
+    if total == 0:
+        logger.error(f"No PDF files found in {args.input_dir}")
+        return
+    logger.info(f"Found {total if total is not None else 'an unknown number of'} CV files to process.")
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    store = ResultStore(path=str(output_dir / "results.sqlite3"))
+    client = AsyncBatchClient(
+        api_url=args.api_url,
+        limiter=AIMDLimiter(args.initial_concurrency, maximum=args.max_concurrency, latency_tolerance=args.latency_tolerance),
+        max_retries=args.max_retries,
+    )
+    asyncio.run(client.run(iter_pdf_files(args.input_dir), store, Progress(total), args.report_interval))
+    store.close()
     logger.info("Batch processing complete.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,117 @@
+"""
+End-to-end benchmark of POST /api/evaluate-cv against the OpenAI stand-in.
+
+Starts benchmarks.openai_standin on a local port, points the app's OpenAI
+clients at it through OPENAI_BASE_URL, and uploads synthetic CVs to the
+FastAPI app in-process, so the real OpenAI SDK, HTTP pooling, scheduler and
+retries are all exercised without network access. Runs are reproducible for
+a given --seed and cassette directory.
+
+Usage:
+    python -m benchmarks.bench_api_standin --requests 64 --concurrency 16 --latency lognormal:0.6,0.3 --rate-429 0.02
+"""
+import os
+import socket
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+PORT = _free_port()
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("OPENAI_BASE_URL", f"http://127.0.0.1:{PORT}/v1")
+os.environ.setdefault("CV_WORKER_POOL", "thread")
+os.environ.setdefault("EXTRACTION_CACHE_ENABLED", "0")
+os.environ.setdefault("ENTITY_MEMO_ENABLED", "0")
+os.environ.setdefault("JOB_QUEUE_ENABLED", "0")
+os.environ.setdefault("LLM_BACKOFF_BASE_SECONDS", "0.05")
+# Only the stand-in's injected 429s should throttle; lift the scheduler's own limits.
+os.environ.setdefault("LLM_RPM_LIMIT", "1000000")
+os.environ.setdefault("LLM_TPM_LIMIT", "1000000000")
+os.environ.setdefault("LLM_MAX_CONCURRENCY", "1000")
+
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from typing import Any, Dict, List
+
+import httpx
+import uvicorn
+
+from app.main import app
+from app.utils.openai_client import openai_client
+from benchmarks.openai_standin import StandinConfig, create_app
+from benchmarks.synthetic import make_pdf_bytes, sample_cv_text
+
+def start_standin(config: StandinConfig) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(create_app(config), host="127.0.0.1", port=PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+async def run_requests(requests: int, concurrency: int) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://app", timeout=600) as client:
+        async def one(i: int) -> None:
+            nonlocal failures
+            pdf = make_pdf_bytes([sample_cv_text(i)])
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/api/evaluate-cv", files={"file": (f"cv_{i}.pdf", pdf, "application/pdf")})
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    failures += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "failures": failures,
+        "cvs_per_sec": round(requests / elapsed, 2),
+        "p50_seconds": round(statistics.median(latencies), 3),
+        "p95_seconds": round(latencies[int(0.95 * (len(latencies) - 1))], 3),
+        "llm_calls": openai_client.scheduler.stats["calls"],
+        "llm_retries": openai_client.scheduler.stats["retries"],
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--cassettes", default=".cassettes")
+    parser.add_argument("--mode", default="replay", choices=("replay", "synthetic"))
+    parser.add_argument("--latency", default="fixed:0.2")
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-500", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = start_standin(StandinConfig(
+        cassette_dir=args.cassettes,
+        mode=args.mode,
+        latency=args.latency,
+        rate_429=args.rate_429,
+        rate_500=args.rate_500,
+        retry_after=0,
+        seed=args.seed,
+    ))
+    try:
+        result = asyncio.run(run_requests(args.requests, args.concurrency))
+    finally:
+        server.should_exit = True
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
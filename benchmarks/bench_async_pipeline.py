@@ -0,0 +1,102 @@
+"""
+Concurrency benchmark for the async /api/evaluate-cv pipeline.
+
+Runs the pipeline against an in-process fake OpenAI client with a fixed
+per-call latency and reports throughput for increasing numbers of in-flight
+CVs, next to the old blocking pipeline for comparison.
+
+Usage:
+    python -m benchmarks.bench_async_pipeline --latency 0.5 --requests 32
+"""
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("CV_WORKER_POOL", "thread")
+os.environ.setdefault("EXTRACTION_CACHE_ENABLED", "0")
+# The fake client has no rate limits; keep the scheduler from simulating some.
+os.environ.setdefault("LLM_RPM_LIMIT", "1000000")
+os.environ.setdefault("LLM_TPM_LIMIT", "1000000000")
+os.environ.setdefault("LLM_MAX_CONCURRENCY", "1000")
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from typing import Dict, List
+
+from app.utils.openai_client import openai_client
+from app.modules.document_extraction.extractor import extract_resume
+from app.modules.pipeline import evaluate_cv_async
+from app.modules.scoring.scorer import calculate_total_score
+from app.modules.summarization.evaluator import evaluate_resume
+from app.utils.worker_pool import shutdown_worker_pool
+from benchmarks.fake_openai import FakeAsyncOpenAI, FakeOpenAI
+from benchmarks.synthetic import make_pdf_bytes, sample_cv_text
+
+async def _run_async(pdf_path: str, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            await evaluate_cv_async(pdf_path, f"cv_{i}.pdf")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return time.perf_counter() - start
+
+async def _run_blocking(pdf_path: str, requests: int, concurrency: int) -> float:
+    # Mirrors the old endpoint: an async handler calling blocking functions.
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            resume = extract_resume(pdf_path)
+            score_result = calculate_total_score(resume)
+            evaluate_resume(resume, score_result["status"])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return time.perf_counter() - start
+
+def run_benchmark(latency: float, requests: int, levels: List[int]) -> List[Dict[str, float]]:
+    openai_client.client = FakeOpenAI(latency=latency)
+    openai_client.async_client = FakeAsyncOpenAI(latency=latency)
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
+        temp_file.write(make_pdf_bytes([sample_cv_text()]))
+        pdf_path = temp_file.name
+
+    rows = []
+    try:
+        for level in levels:
+            async_elapsed = asyncio.run(_run_async(pdf_path, requests, level))
+            blocking_elapsed = asyncio.run(_run_blocking(pdf_path, requests, level))
+            rows.append({
+                "in_flight": level,
+                "async_cvs_per_sec": round(requests / async_elapsed, 2),
+                "blocking_cvs_per_sec": round(requests / blocking_elapsed, 2),
+            })
+    finally:
+        os.unlink(pdf_path)
+        shutdown_worker_pool()
+    return rows
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated seconds per LLM call")
+    parser.add_argument("--requests", type=int, default=32, help="CVs evaluated per concurrency level")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.latency, args.requests, args.levels)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'in-flight':>10} {'async CV/s':>12} {'blocking CV/s':>14}")
+    for row in rows:
+        print(f"{row['in_flight']:>10} {row['async_cvs_per_sec']:>12} {row['blocking_cvs_per_sec']:>14}")
+
+if __name__ == "__main__":
+    main()
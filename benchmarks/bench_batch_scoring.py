@@ -0,0 +1,50 @@
+"""
+Re-scoring an archive: calculate_total_score per resume versus the columnar
+batch scorer, on synthetic resumes.
+
+Usage:
+    python -m benchmarks.bench_batch_scoring --sizes 10000 100000
+"""
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+import argparse
+import json
+import time
+
+from app.modules.scoring.batch_scorer import extract_features, score_features
+from app.modules.scoring.scorer import calculate_total_score
+from benchmarks.synthetic_resumes import random_resumes
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        resumes = random_resumes(size)
+
+        start = time.perf_counter()
+        expected = [calculate_total_score(resume) for resume in resumes]
+        per_resume = time.perf_counter() - start
+
+        start = time.perf_counter()
+        features = extract_features(resumes)
+        featurize = time.perf_counter() - start
+        start = time.perf_counter()
+        scores = score_features(features)
+        vectorized = time.perf_counter() - start
+
+        rows.append({
+            "resumes": size,
+            "per_resume_seconds": round(per_resume, 3),
+            "featurize_seconds": round(featurize, 3),
+            "vectorized_score_seconds": round(vectorized, 4),
+            "identical": scores.to_dicts() == expected,
+        })
+    print(json.dumps(rows, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Embedding throughput: the resident, length-bucketed registry path against the
+previous get_embeddings, which reloaded the model on every call.
+
+Usage:
+    python -m benchmarks.bench_embeddings                 # vinai/phobert-base
+    python -m benchmarks.bench_embeddings --tiny          # offline, tiny random RoBERTa
+"""
+import os
+
+os.environ.setdefault("EMBEDDING_CACHE_ENABLED", "0")
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from typing import Dict, List
+
+import torch
+
+from app.modules.embedding.embedder import get_embeddings
+from app.modules.embedding.model_registry import model_registry
+from benchmarks.tiny_model import TINY_VOCAB, build_tiny_model
+
+def legacy_get_embeddings(texts: List[str], model_name: str) -> List[List[float]]:
+    # The implementation this benchmark replaces, kept verbatim for comparison.
+    from transformers import AutoTokenizer, AutoModel
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name)
+    inputs = tokenizer(texts, return_tensors="pt", padding=True, truncation=True)
+    with torch.no_grad():
+        outputs = model(**inputs)
+    return outputs.last_hidden_state.mean(dim=1).tolist()
+
+def make_texts(count: int, seed: int = 0) -> List[str]:
+    # Skewed lengths (many short skill names, some long section texts) like real CVs.
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        length = rng.choice([2, 3, 4, 8, 16, 64, 120])
+        texts.append(" ".join(rng.choice(TINY_VOCAB) for _ in range(length)))
+    return texts
+
+def run_benchmark(model_name: str, texts: List[str], calls: int, batch_size: int) -> Dict[str, float]:
+    per_call = max(1, len(texts) // calls)
+    chunks = [texts[i:i + per_call] for i in range(0, len(texts), per_call)]
+
+    start = time.perf_counter()
+    for chunk in chunks:
+        legacy_get_embeddings(chunk, model_name)
+    legacy_elapsed = time.perf_counter() - start
+
+    model_registry.clear()
+    start = time.perf_counter()
+    for chunk in chunks:
+        get_embeddings(chunk, batch_size=batch_size, model_name=model_name)
+    registry_elapsed = time.perf_counter() - start
+
+    return {
+        "texts": len(texts),
+        "calls": len(chunks),
+        "legacy_texts_per_sec": round(len(texts) / legacy_elapsed, 1),
+        "registry_texts_per_sec": round(len(texts) / registry_elapsed, 1),
+        "speedup": round(legacy_elapsed / registry_elapsed, 2),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="vinai/phobert-base")
+    parser.add_argument("--tiny", action="store_true", help="Use a tiny random model built locally")
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--calls", type=int, default=16, help="Number of get_embeddings calls")
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_name = build_tiny_model(tmp) if args.tiny else args.model
+        result = run_benchmark(model_name, make_texts(args.texts), args.calls, args.batch_size)
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+LLM round trips, tokens and latency per CV for the evaluation modes:
+
+  two_call_repr     extraction + reasoning call embedding the Resume repr (old prompt)
+  two_call_compact  extraction + reasoning call with format_resume_for_evaluation
+  single_call       reasoning reused from the extraction call
+
+Runs against the in-process fake OpenAI client, whose usage counts are
+estimated from message length (about 4 characters per token).
+
+Usage:
+    python -m benchmarks.bench_evaluation_modes --latency 0.5 --cvs 20
+"""
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("CV_WORKER_POOL", "thread")
+os.environ.setdefault("EXTRACTION_CACHE_ENABLED", "0")
+# The fake client has no rate limits; keep the scheduler from simulating some.
+os.environ.setdefault("LLM_RPM_LIMIT", "1000000")
+os.environ.setdefault("LLM_TPM_LIMIT", "1000000000")
+os.environ.setdefault("LLM_MAX_CONCURRENCY", "1000")
+
+import argparse
+import asyncio
+import json
+import time
+
+from app.modules import pipeline
+from app.modules.summarization import evaluator
+from app.utils.openai_client import openai_client
+from app.utils.worker_pool import shutdown_worker_pool
+from benchmarks.fake_openai import FakeAsyncOpenAI, make_response
+from benchmarks.synthetic import make_pdf_bytes, sample_cv_text
+
+MODES = {
+    "two_call_repr": ("two_call", lambda resume: f"{resume}"),
+    "two_call_compact": ("two_call", evaluator.format_resume_for_evaluation),
+    "single_call": ("single_call", evaluator.format_resume_for_evaluation),
+}
+
+def run_mode(mode: str, latency: float, cvs: int) -> dict:
+    evaluation_mode, formatter = MODES[mode]
+    original = evaluator.format_resume_for_evaluation
+    pipeline.EVALUATION_MODE = evaluation_mode
+    evaluator.format_resume_for_evaluation = formatter
+    fake = FakeAsyncOpenAI(latency=latency)
+    openai_client.async_client = fake
+    pdfs = [make_pdf_bytes([sample_cv_text(i)]) for i in range(cvs)]
+    try:
+        start = time.perf_counter()
+        for i, pdf in enumerate(pdfs):
+            asyncio.run(pipeline.evaluate_cv_bytes_async(pdf, f"cv_{i}.pdf"))
+        elapsed = time.perf_counter() - start
+    finally:
+        evaluator.format_resume_for_evaluation = original
+
+    prompt_tokens = completion_tokens = 0
+    for call in fake.calls:
+        usage = make_response(fake.responder(**call), call["messages"]).usage
+        prompt_tokens += usage.prompt_tokens
+        completion_tokens += usage.completion_tokens
+    return {
+        "mode": mode,
+        "llm_calls_per_cv": len(fake.calls) / cvs,
+        "prompt_tokens_per_cv": round(prompt_tokens / cvs),
+        "completion_tokens_per_cv": round(completion_tokens / cvs),
+        "seconds_per_cv": round(elapsed / cvs, 3),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.5, help="Simulated seconds per LLM call")
+    parser.add_argument("--cvs", type=int, default=20)
+    args = parser.parse_args()
+    try:
+        rows = [run_mode(mode, args.latency, args.cvs) for mode in MODES]
+    finally:
+        shutdown_worker_pool()
+    print(json.dumps(rows, indent=2))
+
+if __name__ == "__main__":
+    main()
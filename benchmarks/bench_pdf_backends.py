@@ -0,0 +1,122 @@
+"""
+Speed and fidelity of every installed PDF text backend over a PDF corpus.
+
+For each backend: pages/sec, tracemalloc peak (Python allocations only, so
+C libraries such as MuPDF under-report) and character-level agreement with a
+reference. The reference is a same-named .txt file next to each PDF when
+present, otherwise the --reference backend's output. The fastest backend
+whose mean agreement reaches --min-agreement is printed as the recommended
+PDF_TEXT_BACKEND.
+
+Usage:
+    python -m benchmarks.bench_pdf_backends --corpus ./cvs --min-agreement 0.97
+    python -m benchmarks.bench_pdf_backends            # synthetic corpus
+"""
+import argparse
+import difflib
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.modules.document_extraction.pdf_backends import available_backends, get_backend
+from benchmarks.synthetic import make_pdf_bytes, sample_cv_text
+
+def load_corpus(directory: Optional[str], synthetic_docs: int) -> List[Tuple[str, bytes, Optional[str]]]:
+    """
+    Return (name, pdf bytes, ground truth text or None) for every document.
+    """
+    if directory is None:
+        return [
+            (f"synthetic-{i}.pdf", make_pdf_bytes(sample_cv_text(i).split("\n\n")), None)
+            for i in range(synthetic_docs)
+        ]
+    corpus = []
+    for path in sorted(Path(directory).glob("*.pdf")):
+        truth_path = path.with_suffix(".txt")
+        truth = truth_path.read_text(encoding="utf-8") if truth_path.exists() else None
+        corpus.append((path.name, path.read_bytes(), truth))
+    return corpus
+
+def agreement(text: str, reference: str) -> float:
+    """
+    Character-level similarity of two texts after collapsing whitespace.
+    """
+    a, b = " ".join(text.split()), " ".join(reference.split())
+    if not a and not b:
+        return 1.0
+    return difflib.SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+def extract_all(backend_name: str, data: bytes) -> Tuple[str, int]:
+    backend = get_backend(backend_name)
+    document = backend.open(data)
+    count = backend.page_count(document)
+    return "".join(backend.page_text(document, i) for i in range(count)), count
+
+def run_backend(backend_name: str, corpus: List[Tuple[str, bytes, Optional[str]]]) -> Tuple[Dict[str, Any], List[str]]:
+    texts, pages, failures = [], 0, 0
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _, data, _ in corpus:
+        try:
+            text, count = extract_all(backend_name, data)
+        except Exception:
+            text, count = "", 0
+            failures += 1
+        texts.append(text)
+        pages += count
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "backend": backend_name,
+        "documents": len(corpus),
+        "pages": pages,
+        "failures": failures,
+        "seconds": round(elapsed, 3),
+        "pages_per_second": round(pages / elapsed, 1) if elapsed else None,
+        "peak_python_mb": round(peak / 2 ** 20, 2),
+    }, texts
+
+def choose_backend(rows: List[Dict[str, Any]], min_agreement: float) -> Optional[str]:
+    """
+    Fastest backend whose mean agreement meets the threshold, or None.
+    """
+    eligible = [row for row in rows if row["agreement"] >= min_agreement and not row["failures"]]
+    if not eligible:
+        return None
+    return max(eligible, key=lambda row: row["pages_per_second"] or 0)["backend"]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory of PDFs (optionally with .txt ground truth)")
+    parser.add_argument("--synthetic-docs", type=int, default=50)
+    parser.add_argument("--reference", default="pypdf2", help="Backend used as reference when no .txt exists")
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, args.synthetic_docs)
+    backends = available_backends()
+    outputs, rows = {}, []
+    for name in backends:
+        row, texts = run_backend(name, corpus)
+        outputs[name] = texts
+        rows.append(row)
+
+    reference_texts = outputs.get(args.reference, outputs[backends[0]])
+    for row in rows:
+        scores = [
+            agreement(text, truth if truth is not None else reference)
+            for text, reference, (_, _, truth) in zip(outputs[row["backend"]], reference_texts, corpus)
+        ]
+        row["agreement"] = round(sum(scores) / len(scores), 4) if scores else 0.0
+
+    print(json.dumps({
+        "backends": rows,
+        "min_agreement": args.min_agreement,
+        "recommended": choose_backend(rows, args.min_agreement),
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Top-k ranking against a job description: pairwise calculate_similarity calls
+versus SimilarityIndex (exact and IVF approximate).
+
+Usage:
+    python -m benchmarks.bench_similarity --candidates 50000 --dim 768
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.modules.embedding.similarity import SimilarityIndex, calculate_similarity
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--pairwise-sample", type=int, default=2000,
+                        help="Pairwise calls actually timed; the full-corpus time is extrapolated")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(args.candidates, args.dim)).astype(np.float32)
+    query = rng.normal(size=args.dim).astype(np.float32)
+
+    start = time.perf_counter()
+    for vector in vectors[:args.pairwise_sample]:
+        calculate_similarity(query, vector)
+    pairwise = (time.perf_counter() - start) * args.candidates / args.pairwise_sample
+
+    index = SimilarityIndex(args.dim)
+    start = time.perf_counter()
+    index.add(list(range(args.candidates)), vectors)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    exact = index.search(query, k=args.k)
+    exact_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index.build_approximate_index()
+    ivf_build = time.perf_counter() - start
+    start = time.perf_counter()
+    approx = index.search(query, k=args.k)
+    approx_elapsed = time.perf_counter() - start
+
+    recall = len({i for i, _ in exact} & {i for i, _ in approx}) / args.k
+    print(json.dumps({
+        "candidates": args.candidates,
+        "dim": args.dim,
+        "pairwise_seconds_estimated": round(pairwise, 3),
+        "index_build_seconds": round(build, 3),
+        "exact_query_ms": round(exact_elapsed * 1000, 2),
+        "ivf_build_seconds": round(ivf_build, 3),
+        "ivf_query_ms": round(approx_elapsed * 1000, 2),
+        "ivf_recall_at_k": recall,
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Stage-level micro-benchmarks on a synthetic CV corpus, with baseline comparison.
+
+Each stage is timed on its own over the whole corpus, `--repeat` times after
+one warm-up pass, and reported as microseconds per operation (median and
+fastest sample). Stages:
+
+  pdf_text            extract_text_from_pdf_bytes, per CV
+  parse_response      parse_extraction_response on the LLM JSON, per CV
+  build_resume        build_resume from the parsed extracted_data, per CV
+  total_score         calculate_total_score, per CV
+  category_scores     the five calculate_*_score functions, per CV
+  normalize_gpa       normalize_gpa, per GPA string
+  duration_parsing    parse_experience_duration and calculate_duration, per string
+  embeddings          embedding skill and position texts (cache bypassed), per text
+                      (tiny local model unless --embedding-model is given)
+  serialize_response  build_evaluation_result rendered as the JSON response, per CV
+
+With --baseline, stages slower than the baseline by more than --tolerance
+(and by at least --min-delta-us) are reported as regressions and the exit
+status is 1.
+
+Usage:
+    python -m benchmarks.bench_stages --output baseline.json
+    python -m benchmarks.bench_stages --baseline baseline.json --tolerance 0.25
+"""
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+
+from app.modules.document_extraction.extractor import build_resume, extract_text_from_pdf_bytes
+from app.modules.document_extraction.gpa_parser import normalize_gpa
+from app.modules.document_extraction.ocr import parse_extraction_response
+from app.modules.pipeline import build_evaluation_result
+from app.modules.scoring.awards import calculate_awards_score
+from app.modules.scoring.certifications import calculate_certifications_score
+from app.modules.scoring.education import calculate_education_score
+from app.modules.scoring.experience import calculate_duration, calculate_experience_score, parse_experience_duration
+from app.modules.scoring.projects import calculate_projects_score
+from app.modules.scoring.scorer import calculate_total_score
+from benchmarks.cv_corpus import SyntheticCV, generate_corpus
+
+# A stage setup takes the corpus and returns (callable running one pass, operations per pass).
+StageSetup = Callable[[List[SyntheticCV]], Tuple[Callable[[], Any], int]]
+
+def _resumes(corpus: List[SyntheticCV]) -> list:
+    return [build_resume(parse_extraction_response(cv.llm_json)["extracted_data"]) for cv in corpus]
+
+def stage_pdf_text(corpus):
+    return lambda: [extract_text_from_pdf_bytes(cv.pdf) for cv in corpus], len(corpus)
+
+def stage_parse_response(corpus):
+    return lambda: [parse_extraction_response(cv.llm_json) for cv in corpus], len(corpus)
+
+def stage_build_resume(corpus):
+    parsed = [parse_extraction_response(cv.llm_json)["extracted_data"] for cv in corpus]
+    return lambda: [build_resume(data) for data in parsed], len(corpus)
+
+def stage_total_score(corpus):
+    resumes = _resumes(corpus)
+    return lambda: [calculate_total_score(resume) for resume in resumes], len(resumes)
+
+def stage_category_scores(corpus):
+    resumes = _resumes(corpus)
+
+    def run():
+        for resume in resumes:
+            calculate_education_score(resume.education)
+            calculate_experience_score(resume.professional_experience)
+            calculate_projects_score(resume.projects)
+            calculate_awards_score(resume.awards)
+            calculate_certifications_score(resume.certifications)
+    return run, len(resumes)
+
+def stage_normalize_gpa(corpus):
+    values = [edu["gpa"] for cv in corpus for edu in cv.payload["extracted_data"]["education"]]
+    return lambda: [normalize_gpa(value) for value in values], len(values)
+
+def stage_duration_parsing(corpus):
+    data = [cv.payload["extracted_data"] for cv in corpus]
+    values = [item["duration"] for d in data for item in d["professional_experience"] + d["projects"]]
+
+    def run():
+        for value in values:
+            parse_experience_duration(value)
+            calculate_duration(value)
+    return run, len(values)
+
+def stage_serialize_response(corpus):
+    resumes = _resumes(corpus)
+    results = [
+        build_evaluation_result(f"{cv.name}.pdf", resume, calculate_total_score(resume), cv.payload["evaluation"])
+        for cv, resume in zip(corpus, resumes)
+    ]
+    return lambda: [JSONResponse(content=result).body for result in results], len(results)
+
+def make_embedding_stage(model_name: Optional[str]) -> StageSetup:
+    def stage_embeddings(corpus):
+        # encode_texts is get_embeddings minus the embedding cache, which would
+        # turn every pass after the warm-up into cache reads.
+        from app.modules.embedding.embedder import EMBEDDING_BATCH_SIZE, encode_texts
+        from app.modules.embedding.model_registry import model_registry
+        loaded = model_registry.get(model_name)
+        texts = []
+        for cv in corpus:
+            data = cv.payload["extracted_data"]
+            texts += [skill for group in data["skills"] for skill in group["list"]]
+            texts += [exp["position"] for exp in data["professional_experience"]]
+        return lambda: encode_texts(loaded, texts, EMBEDDING_BATCH_SIZE), len(texts)
+    return stage_embeddings
+
+STAGES: Dict[str, StageSetup] = {
+    "pdf_text": stage_pdf_text,
+    "parse_response": stage_parse_response,
+    "build_resume": stage_build_resume,
+    "total_score": stage_total_score,
+    "category_scores": stage_category_scores,
+    "normalize_gpa": stage_normalize_gpa,
+    "duration_parsing": stage_duration_parsing,
+    "serialize_response": stage_serialize_response,
+}
+
+def time_stage(setup: StageSetup, corpus: List[SyntheticCV], repeat: int, min_sample_seconds: float = 0.05) -> Dict[str, Any]:
+    """
+    Warm up once, then take `repeat` samples, each looping over the corpus
+    enough times to last at least min_sample_seconds so fast stages are not
+    dominated by timer noise.
+    """
+    run, ops = setup(corpus)
+    start = time.perf_counter()
+    run()
+    loops = max(1, math.ceil(min_sample_seconds / max(time.perf_counter() - start, 1e-9)))
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        timings.append((time.perf_counter() - start) / loops)
+    ops = max(ops, 1)
+    return {
+        "ops": ops,
+        "loops": loops,
+        "median_us_per_op": round(statistics.median(timings) / ops * 1e6, 3),
+        "min_us_per_op": round(min(timings) / ops * 1e6, 3),
+    }
+
+def run_stages(corpus: List[SyntheticCV], stages: Dict[str, StageSetup], repeat: int,
+               min_sample_seconds: float = 0.05) -> Dict[str, Dict[str, Any]]:
+    return {name: time_stage(setup, corpus, repeat, min_sample_seconds) for name, setup in stages.items()}
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, min_delta_us: float) -> List[Dict[str, Any]]:
+    """
+    Compare the fastest sample's µs/op per stage present in both reports; the
+    minimum is the least noisy estimate of a stage's cost.
+    """
+    rows = []
+    for name, stage in current["stages"].items():
+        before = baseline.get("stages", {}).get(name)
+        if before is None:
+            continue
+        old, new = before["min_us_per_op"], stage["min_us_per_op"]
+        ratio = new / old if old else float("inf")
+        rows.append({
+            "stage": name,
+            "baseline_us": old,
+            "current_us": new,
+            "ratio": round(ratio, 3),
+            "regressed": ratio > 1 + tolerance and new - old >= min_delta_us,
+        })
+    return rows
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=50, help="CVs in the synthetic corpus")
+    parser.add_argument("--items", type=int, default=3, help="Entries per list section")
+    parser.add_argument("--sentences", type=int, default=2)
+    parser.add_argument("--language", default="mixed")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-sample-seconds", type=float, default=0.05)
+    parser.add_argument("--stages", nargs="+", help="Run only these stages")
+    parser.add_argument("--skip-embeddings", action="store_true")
+    parser.add_argument("--embedding-model", help="Model for the embeddings stage (default: tiny local model)")
+    parser.add_argument("--output", help="Also write the report to this file")
+    parser.add_argument("--baseline", help="Report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--min-delta-us", type=float, default=1.0, help="Ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.count, args.items, args.sentences, args.language, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        stages = dict(STAGES)
+        if not args.skip_embeddings:
+            model_name = args.embedding_model
+            if model_name is None:
+                from benchmarks.tiny_model import build_tiny_model
+                model_name = build_tiny_model(tmp)
+            stages["embeddings"] = make_embedding_stage(model_name)
+        if args.stages:
+            stages = {name: setup for name, setup in stages.items() if name in args.stages}
+
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "corpus": {"count": args.count, "items": args.items, "sentences": args.sentences, "language": args.language, "seed": args.seed},
+                "repeat": args.repeat,
+                "min_sample_seconds": args.min_sample_seconds,
+                "embedding_model": args.embedding_model or ("tiny" if "embeddings" in stages else None),
+            },
+            "stages": run_stages(corpus, stages, args.repeat, args.min_sample_seconds),
+        }
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["comparison"] = compare(report, json.load(f), args.tolerance, args.min_delta_us)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    if any(row["regressed"] for row in report.get("comparison", [])):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
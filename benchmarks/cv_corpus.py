@@ -0,0 +1,226 @@
+"""
+Generator for synthetic Vietnamese/English CVs of configurable size.
+
+Each CV comes as the LLM extraction answer (JSON in the extraction prompt's
+schema), the plain text a PDF of it would contain, and the PDF itself. Field
+values deliberately mix the formats seen in real CVs: GPAs on 4- and
+10-point scales or per grade, durations as month ranges, years or
+"x years", Vietnamese and English section headings.
+
+Usage:
+    python -m benchmarks.cv_corpus --out ./corpus --count 200 --items 4 --language mixed
+"""
+import argparse
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.synthetic import make_pdf_bytes
+
+LANGUAGES = ("vi", "en", "mixed")
+LINES_PER_PAGE = 60
+
+FIRST_NAMES = ["An", "Bình", "Châu", "Dũng", "Giang", "Hà", "Hiếu", "Khánh", "Linh", "Minh", "Nam", "Phương", "Quân", "Thảo", "Trang", "Tuấn"]
+LAST_NAMES = ["Nguyễn", "Trần", "Lê", "Phạm", "Hoàng", "Vũ", "Đặng", "Bùi", "Đỗ", "Ngô"]
+CITIES = ["Hà Nội", "TP. Hồ Chí Minh", "Đà Nẵng", "Hanoi", "Ho Chi Minh City", "Cần Thơ"]
+UNIVERSITIES = [
+    "Đại học Bách Khoa Hà Nội", "Hanoi University of Science and Technology (HUST)", "FPT University",
+    "Đại học Quốc gia TP.HCM", "RMIT University Vietnam", "Đại học Công nghệ - ĐHQGHN",
+    "Posts and Telecommunications Institute of Technology (PTIT)", "Đại học Kinh tế Quốc dân",
+]
+MAJORS = ["Computer Science", "Khoa học Máy tính", "Software Engineering", "Information Systems", "Data Science", "Kỹ thuật Phần mềm", "Business Administration"]
+COMPANIES = ["FPT Software", "Viettel", "VNG Corporation", "Tiki", "MoMo", "Shopee Vietnam", "KMS Technology", "Axon Active", "Công ty TNHH Giải pháp Số ABC"]
+POSITIONS = ["Backend Developer", "Software Engineer", "Data Engineer", "Frontend Developer", "Lập trình viên Java", "QA Engineer", "Intern"]
+SENIORITY = ["Intern", "Fresher", "Junior", "Middle", "Senior"]
+TECH = ["Python", "FastAPI", "Django", "Java", "Spring Boot", "React", "Node.js", "PostgreSQL", "Redis", "Docker", "Kubernetes", "AWS", "PyTorch"]
+CONTESTS = ["ICPC Asia Hanoi", "Olympic Tin học Sinh viên Việt Nam", "Vietnam AI Hackathon", "Google Hash Code", "Học sinh giỏi Quốc gia môn Tin"]
+PRIZES = ["Giải Nhất", "Giải Nhì", "2nd Prize", "Honorable Mention", "Top 10", "Giải Khuyến khích"]
+CERTIFICATIONS = [
+    ("AWS Certified Solutions Architect", "Amazon Web Services"), ("IELTS 7.0", "British Council"),
+    ("Google Data Analytics", "Coursera"), ("Oracle Certified Professional Java SE", "Oracle"),
+    ("TOEIC 850", "IIG Vietnam"), ("Certified Kubernetes Administrator", "CNCF"),
+]
+SENTENCES = [
+    "Developed REST APIs in Python serving 2 million requests per day.",
+    "Thiết kế và triển khai hệ thống microservices trên Kubernetes.",
+    "Reduced query latency by 40% through indexing and caching.",
+    "Phối hợp với đội sản phẩm để phân tích yêu cầu và viết tài liệu kỹ thuật.",
+    "Built CI/CD pipelines with GitHub Actions and Docker.",
+    "Xây dựng mô hình học máy dự đoán tỉ lệ rời bỏ khách hàng.",
+    "Mentored two interns and reviewed code for a team of six.",
+    "Tối ưu hóa truy vấn SQL giúp giảm 30% thời gian phản hồi.",
+]
+HEADINGS = {
+    "vi": {"education": "HỌC VẤN", "experience": "KINH NGHIỆM LÀM VIỆC", "projects": "DỰ ÁN", "awards": "GIẢI THƯỞNG", "certifications": "CHỨNG CHỈ", "skills": "KỸ NĂNG"},
+    "en": {"education": "EDUCATION", "experience": "EXPERIENCE", "projects": "PROJECTS", "awards": "AWARDS", "certifications": "CERTIFICATIONS", "skills": "SKILLS"},
+}
+
+@dataclass
+class SyntheticCV:
+    name: str
+    payload: Dict[str, Any]
+    text: str
+    pdf: bytes
+
+    @property
+    def llm_json(self) -> str:
+        return json.dumps(self.payload, ensure_ascii=False)
+
+def _gpa(rng: random.Random) -> str:
+    return rng.choice([
+        f"{rng.uniform(2.5, 4.0):.2f}",
+        f"{rng.uniform(6.5, 9.5):.1f}/10",
+        f"{rng.uniform(2.8, 4.0):.1f}/4.0",
+        f"Grade 10: {rng.uniform(8, 10):.1f}, Grade 11: {rng.uniform(8, 10):.1f}, Grade 12: {rng.uniform(8, 10):.1f}",
+        "N/A",
+    ])
+
+def _duration(rng: random.Random) -> str:
+    start = rng.randint(2012, 2022)
+    end = start + rng.randint(0, 3)
+    months = ["Jan", "Mar", "Jun", "Sep", "Dec"]
+    return rng.choice([
+        f"{start}-{rng.randint(1, 12):02d} to {end}-{rng.randint(1, 12):02d}",
+        f"{rng.choice(months)} {start} - {rng.choice(months)} {end}",
+        f"{start} to {end}",
+        f"{rng.randint(1, 5)} years",
+        f"{rng.randint(2, 11)} months",
+    ])
+
+def _description(rng: random.Random, sentences: int) -> str:
+    return " ".join(rng.choice(SENTENCES) for _ in range(sentences))
+
+def generate_payload(rng: random.Random, index: int, items: int = 2, sentences: int = 2) -> Dict[str, Any]:
+    """
+    Build one extraction answer with `items` entries per list section and
+    `sentences` sentences per description.
+    """
+    name = f"{rng.choice(LAST_NAMES)} {rng.choice(FIRST_NAMES)} {index}"
+    certifications = rng.sample(CERTIFICATIONS, min(items, len(CERTIFICATIONS)))
+    return {
+        "extracted_data": {
+            "name": name,
+            "location": rng.choice(CITIES),
+            "social": [f"https://github.com/candidate{index}"],
+            "email": f"candidate{index}@example.com",
+            "linkedin": f"https://linkedin.com/in/candidate{index}",
+            "phone": f"09{rng.randint(10000000, 99999999)}",
+            "intro": _description(rng, sentences),
+            "education": [{
+                "school": rng.choice(UNIVERSITIES),
+                "class_year": str(rng.randint(2015, 2026)),
+                "major": rng.choice(MAJORS),
+                "gpa": _gpa(rng),
+            } for _ in range(max(1, items // 2))],
+            "professional_experience": [{
+                "company": rng.choice(COMPANIES),
+                "location": rng.choice(CITIES),
+                "position": rng.choice(POSITIONS),
+                "seniority": rng.choice(SENIORITY),
+                "duration": _duration(rng),
+                "description": _description(rng, sentences),
+            } for _ in range(items)],
+            "projects": [{
+                "name": f"Project {index}-{i}",
+                "link": rng.choice([None, f"https://github.com/candidate{index}/project{i}"]),
+                "tech": ", ".join(rng.sample(TECH, 3)),
+                "duration": _duration(rng),
+                "description": _description(rng, sentences),
+            } for i in range(items)],
+            "awards": [{
+                "contest": rng.choice(CONTESTS),
+                "prize": rng.choice(PRIZES),
+                "description": _description(rng, 1),
+                "role": rng.choice([None, "Team leader", "Thành viên"]),
+                "time": str(rng.randint(2015, 2024)),
+            } for _ in range(max(1, items // 2))],
+            "certifications": [{"name": cert, "org": org, "link": None} for cert, org in certifications],
+            "skills": [
+                {"name": "Programming", "list": rng.sample(TECH, min(len(TECH), 2 + items))},
+                {"name": "Ngoại ngữ", "list": ["Tiếng Anh", "Tiếng Nhật"][:1 + index % 2]},
+            ],
+        },
+        "summary": _description(rng, 1),
+        "evaluation": _description(rng, 1),
+        "scoring_recommendations": {
+            category: {"score": rng.randint(30, 95), "reasoning": _description(rng, 1)}
+            for category in ("education", "experience", "projects", "awards", "certifications")
+        },
+    }
+
+def render_cv_text(payload: Dict[str, Any], language: str) -> str:
+    """
+    Render an extraction answer as the plain text of a CV in `language` ("vi" or "en").
+    """
+    data = payload["extracted_data"]
+    headings = HEADINGS[language]
+    lines = [data["name"], data["location"], f"{data['email']} | {data['phone']}", data["intro"], "", headings["education"]]
+    for edu in data["education"]:
+        lines.append(f"{edu['school']} - {edu['major']} ({edu['class_year']})")
+        lines.append(f"GPA: {edu['gpa']}")
+    lines += ["", headings["experience"]]
+    for exp in data["professional_experience"]:
+        lines.append(f"{exp['position']} ({exp['seniority']}) - {exp['company']}, {exp['location']} | {exp['duration']}")
+        lines.append(exp["description"])
+    lines += ["", headings["projects"]]
+    for project in data["projects"]:
+        lines.append(f"{project['name']} | {project['tech']} | {project['duration']}")
+        lines.append(project["description"])
+    lines += ["", headings["awards"]]
+    for award in data["awards"]:
+        lines.append(f"{award['prize']} - {award['contest']} ({award['time']})")
+    lines += ["", headings["certifications"]]
+    for cert in data["certifications"]:
+        lines.append(f"{cert['name']} - {cert['org']}")
+    lines += ["", headings["skills"]]
+    for group in data["skills"]:
+        lines.append(f"{group['name']}: {', '.join(group['list'])}")
+    return "\n".join(lines)
+
+def paginate(text: str, lines_per_page: int = LINES_PER_PAGE) -> List[str]:
+    lines = text.split("\n")
+    return ["\n".join(lines[i:i + lines_per_page]) for i in range(0, len(lines), lines_per_page)] or [""]
+
+def generate_corpus(count: int, items: int = 2, sentences: int = 2, language: str = "mixed", seed: int = 0) -> List[SyntheticCV]:
+    """
+    Generate `count` CVs deterministically for a seed.
+    """
+    if language not in LANGUAGES:
+        raise ValueError(f"Unknown language {language}; expected one of {LANGUAGES}")
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(count):
+        payload = generate_payload(rng, index, items, sentences)
+        cv_language = language if language != "mixed" else ("vi", "en")[index % 2]
+        text = render_cv_text(payload, cv_language)
+        corpus.append(SyntheticCV(f"cv_{index:05d}", payload, text, make_pdf_bytes(paginate(text))))
+    return corpus
+
+def write_corpus(directory: str, corpus: List[SyntheticCV]) -> None:
+    """
+    Write <name>.pdf, <name>.txt (ground truth text) and <name>.json (LLM answer) per CV.
+    """
+    out = Path(directory)
+    out.mkdir(parents=True, exist_ok=True)
+    for cv in corpus:
+        (out / f"{cv.name}.pdf").write_bytes(cv.pdf)
+        (out / f"{cv.name}.txt").write_text(cv.text, encoding="utf-8")
+        (out / f"{cv.name}.json").write_text(cv.llm_json, encoding="utf-8")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--items", type=int, default=2, help="Entries per list section")
+    parser.add_argument("--sentences", type=int, default=2, help="Sentences per description")
+    parser.add_argument("--language", choices=LANGUAGES, default="mixed")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    write_corpus(args.out, generate_corpus(args.count, args.items, args.sentences, args.language, args.seed))
+    print(f"Wrote {args.count} CVs to {args.out}")
+
+if __name__ == "__main__":
+    main()
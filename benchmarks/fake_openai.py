@@ -0,0 +1,118 @@
+"""
+In-process stand-ins for the OpenAI clients, used by benchmarks and offline tests.
+
+They answer extraction prompts with a synthetic JSON payload and every other
+prompt with a short text, after a configurable simulated latency.
+"""
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.synthetic import sample_extraction_json
+
+def default_responder(messages: List[Dict[str, str]], **kwargs: Any) -> str:
+    """
+    Pick a plausible answer for the prompt: extraction JSON, a score, or reasoning text.
+    """
+    system = messages[0]["content"] if messages else ""
+    if "CV parser" in system:
+        return sample_extraction_json()
+    if "Provide a score" in system:
+        return "15"
+    if "You score entities" in system:
+        entities = json.loads(messages[-1]["content"].split("Entities:\n", 1)[1])
+        return json.dumps({kind: {name: 15 for name in names} for kind, names in entities.items()})
+    return "The candidate meets the core requirements for the role."
+
+def make_response(content: str, messages: List[Dict[str, str]]) -> SimpleNamespace:
+    """
+    Wrap content in an object shaped like a ChatCompletion.
+    """
+    prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+    completion_tokens = len(content) // 4
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason="stop")],
+        usage=SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        ),
+    )
+
+class _Completions:
+    def __init__(self, owner):
+        self._owner = owner
+
+    def create(self, **kwargs: Any) -> SimpleNamespace:
+        return self._owner._create(**kwargs)
+
+class _AsyncCompletions:
+    def __init__(self, owner):
+        self._owner = owner
+
+    async def create(self, **kwargs: Any) -> SimpleNamespace:
+        return await self._owner._create(**kwargs)
+
+class FakeOpenAI:
+    """
+    Blocking fake: sleeps for `latency` seconds per call like a real HTTP round trip.
+    """
+    def __init__(self, latency: float = 0.0, responder: Optional[Callable[..., str]] = None):
+        self.latency = latency
+        self.responder = responder or default_responder
+        self.calls: List[Dict[str, Any]] = []
+        self.chat = SimpleNamespace(completions=_Completions(self))
+
+    def _create(self, **kwargs: Any) -> SimpleNamespace:
+        self.calls.append(kwargs)
+        if self.latency:
+            time.sleep(self.latency)
+        messages = kwargs.get("messages", [])
+        return make_response(self.responder(**kwargs), messages)
+
+def make_stream_chunk(content: Optional[str], finish_reason: Optional[str] = None) -> SimpleNamespace:
+    """
+    Wrap a piece of content in an object shaped like a ChatCompletionChunk.
+    """
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content), finish_reason=finish_reason)])
+
+class FakeAsyncOpenAI:
+    """
+    Async fake: awaits `latency` seconds per call, so concurrent calls overlap.
+    With stream=True the answer arrives in `stream_chunk_chars` pieces, the first
+    after `stream_first_token` seconds and the rest spread over `latency`.
+    """
+    def __init__(self, latency: float = 0.0, responder: Optional[Callable[..., str]] = None,
+                 stream_first_token: float = 0.0, stream_chunk_chars: int = 40):
+        self.latency = latency
+        self.responder = responder or default_responder
+        self.stream_first_token = stream_first_token
+        self.stream_chunk_chars = stream_chunk_chars
+        self.calls: List[Dict[str, Any]] = []
+        self.chat = SimpleNamespace(completions=_AsyncCompletions(self))
+
+    async def _create(self, **kwargs: Any) -> Any:
+        self.calls.append(kwargs)
+        if kwargs.get("stream"):
+            usage = (kwargs.get("stream_options") or {}).get("include_usage")
+            return self._stream(self.responder(**kwargs), kwargs.get("messages", []) if usage else None)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        messages = kwargs.get("messages", [])
+        return make_response(self.responder(**kwargs), messages)
+
+    async def _stream(self, content: str, usage_for: Optional[List[Dict[str, str]]] = None):
+        pieces = [content[i:i + self.stream_chunk_chars] for i in range(0, len(content), self.stream_chunk_chars)]
+        if self.stream_first_token:
+            await asyncio.sleep(self.stream_first_token)
+        delay = self.latency / len(pieces) if pieces else 0
+        for piece in pieces:
+            yield make_stream_chunk(piece)
+            if delay:
+                await asyncio.sleep(delay)
+        yield make_stream_chunk(None, "stop")
+        if usage_for is not None:
+            # Like stream_options={"include_usage": True}: a final chunk with no choices.
+            yield SimpleNamespace(choices=[], usage=make_response(content, usage_for).usage)
@@ -0,0 +1,284 @@
+"""
+OpenAI-compatible stand-in server for offline, reproducible load tests.
+
+Serves POST /v1/chat/completions (plain and stream=true) from a cassette
+directory of recorded responses keyed by model and a hash of the messages.
+Latency is drawn from a configurable distribution with a seeded RNG, and a
+fraction of requests can be failed with 429 (with Retry-After) or 500.
+
+Modes:
+  replay     answer from cassettes; misses use the synthetic responder
+             (or 404 with --strict)
+  record     forward misses to --upstream with OPENAI_API_KEY (or the
+             caller's key), save the answer as a cassette, then serve it;
+             hits are replayed
+  synthetic  ignore cassettes and answer with the synthetic responder
+
+Latency specs: "fixed:0.4", "uniform:0.2,1.5", "lognormal:0.6,0.4" (median
+seconds, sigma) or "0" for none.
+
+Usage:
+    python -m benchmarks.openai_standin --cassettes .cassettes --latency lognormal:0.8,0.3 --rate-429 0.02
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from benchmarks.fake_openai import default_responder
+
+MODES = ("replay", "record", "synthetic")
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Turn a latency spec into a sampler of seconds.
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(",") if value]
+    if kind in ("", "0", "none"):
+        return lambda rng: 0.0
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        median, sigma = values
+        return lambda rng: rng.lognormvariate(math.log(median), sigma)
+    try:
+        seconds = float(spec)
+    except ValueError:
+        raise ValueError(f"Unknown latency spec: {spec}")
+    return lambda rng: seconds
+
+def cassette_key(model: str, messages: List[Dict[str, Any]]) -> str:
+    """
+    Stable key for a request: the model plus a SHA-256 of the canonical messages.
+    """
+    digest = hashlib.sha256(json.dumps(messages, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+    return f"{model}/{digest}"
+
+@dataclass
+class StandinConfig:
+    cassette_dir: str = ".cassettes"
+    mode: str = "replay"
+    strict: bool = False
+    latency: str = "0"
+    stream_chunk_chars: int = 40
+    # Share of the sampled latency spent before the first streamed chunk.
+    first_token_ratio: float = 0.25
+    rate_429: float = 0.0
+    rate_500: float = 0.0
+    retry_after: float = 1.0
+    seed: int = 0
+    upstream: str = "https://api.openai.com/v1"
+    upstream_transport: Optional[httpx.AsyncBaseTransport] = None
+
+class CassetteStore:
+    """
+    One JSON file per recorded exchange: <dir>/<model>/<hash>.json.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def put(self, key: str, request: Dict[str, Any], response: Dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps({"request": request, "response": response}, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(temp_path, path)
+
+def completion_body(model: str, content: str, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    A ChatCompletion JSON body with usage estimated at about 4 characters per token.
+    """
+    prompt_tokens = sum(len(str(message.get("content", ""))) for message in messages) // 4
+    completion_tokens = len(content) // 4
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+def _chunk(body: Dict[str, Any], delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+    chunk = {
+        "id": body["id"],
+        "object": "chat.completion.chunk",
+        "created": body["created"],
+        "model": body["model"],
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+
+def _error(status: int, message: str, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    error_type = "rate_limit_exceeded" if status == 429 else "server_error"
+    return JSONResponse(
+        {"error": {"message": message, "type": error_type, "code": error_type}},
+        status_code=status,
+        headers=headers,
+    )
+
+def create_app(config: StandinConfig) -> FastAPI:
+    """
+    Build the stand-in FastAPI app for a configuration.
+    """
+    if config.mode not in MODES:
+        raise ValueError(f"Unknown mode {config.mode}; expected one of {MODES}")
+    app = FastAPI()
+    store = CassetteStore(config.cassette_dir)
+    sample_latency = parse_latency(config.latency)
+    rng = random.Random(config.seed)
+    stats = {"requests": 0, "hits": 0, "misses": 0, "recorded": 0, "injected_429": 0, "injected_500": 0}
+    app.state.stats = stats
+
+    async def record(request_body: Dict[str, Any], authorization: str) -> Dict[str, Any]:
+        upstream_body = dict(request_body)
+        upstream_body.pop("stream", None)
+        upstream_body.pop("stream_options", None)
+        async with httpx.AsyncClient(transport=config.upstream_transport, timeout=120) as client:
+            response = await client.post(
+                f"{config.upstream.rstrip('/')}/chat/completions",
+                json=upstream_body,
+                headers={"Authorization": authorization},
+            )
+        response.raise_for_status()
+        return response.json()
+
+    async def answer(body: Dict[str, Any], authorization: str) -> Optional[Dict[str, Any]]:
+        model = body.get("model", "")
+        messages = body.get("messages", [])
+        if config.mode == "synthetic":
+            return completion_body(model, default_responder(**body), messages)
+        key = cassette_key(model, messages)
+        cassette = store.get(key)
+        if cassette is not None:
+            stats["hits"] += 1
+            return cassette["response"]
+        stats["misses"] += 1
+        if config.mode == "record":
+            recorded = await record(body, authorization)
+            store.put(key, {"model": model, "messages": messages}, recorded)
+            stats["recorded"] += 1
+            return recorded
+        if config.strict:
+            return None
+        return completion_body(model, default_responder(**body), messages)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats["requests"] += 1
+        roll = rng.random()
+        delay = sample_latency(rng)
+        if roll < config.rate_429:
+            stats["injected_429"] += 1
+            return _error(429, "Injected rate limit", {"retry-after": str(config.retry_after)})
+        if roll < config.rate_429 + config.rate_500:
+            stats["injected_500"] += 1
+            return _error(500, "Injected server error")
+
+        # Record with the stand-in's own key when set, else the caller's.
+        key = os.getenv("OPENAI_API_KEY")
+        authorization = f"Bearer {key}" if key else request.headers.get("authorization", "")
+        response = await answer(body, authorization)
+        if response is None:
+            return JSONResponse(
+                {"error": {"message": "No cassette for this request", "type": "not_found", "code": "cassette_miss"}},
+                status_code=404,
+            )
+        if not body.get("stream"):
+            if delay:
+                await asyncio.sleep(delay)
+            return JSONResponse(response)
+
+        content = response["choices"][0]["message"].get("content") or ""
+        size = config.stream_chunk_chars
+        pieces = [content[i:i + size] for i in range(0, len(content), size)] or [""]
+
+        async def events():
+            if delay:
+                await asyncio.sleep(delay * config.first_token_ratio)
+            yield _chunk(response, {"role": "assistant", "content": ""})
+            step = delay * (1 - config.first_token_ratio) / len(pieces)
+            for piece in pieces:
+                yield _chunk(response, {"content": piece})
+                if step:
+                    await asyncio.sleep(step)
+            yield _chunk(response, {}, "stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    async def get_stats() -> Dict[str, int]:
+        return stats
+
+    return app
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--cassettes", default=".cassettes", help="Cassette directory")
+    parser.add_argument("--mode", choices=MODES, default="replay")
+    parser.add_argument("--strict", action="store_true", help="Return 404 on a cassette miss in replay mode")
+    parser.add_argument("--latency", default="0", help="Latency spec, e.g. lognormal:0.8,0.3")
+    parser.add_argument("--stream-chunk-chars", type=int, default=40)
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--rate-500", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--upstream", default="https://api.openai.com/v1", help="API used in record mode")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = StandinConfig(
+        cassette_dir=args.cassettes,
+        mode=args.mode,
+        strict=args.strict,
+        latency=args.latency,
+        stream_chunk_chars=args.stream_chunk_chars,
+        rate_429=args.rate_429,
+        rate_500=args.rate_500,
+        retry_after=args.retry_after,
+        seed=args.seed,
+        upstream=args.upstream,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
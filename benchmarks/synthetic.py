@@ -0,0 +1,147 @@
+"""
+Synthetic CV fixtures for benchmarks and offline tests.
+
+Nothing in here talks to the network: PDFs are written by hand with a
+built-in Helvetica font and LLM payloads follow the extraction prompt schema.
+"""
+import json
+import unicodedata
+from typing import Any, Dict, List
+
+def _pdf_safe(line: str) -> str:
+    """
+    Fold characters outside cp1252 (most Vietnamese vowels with tone marks) to
+    their base letter so the built-in font can render them, then escape PDF
+    string delimiters.
+    """
+    out = []
+    for ch in line:
+        try:
+            ch.encode("cp1252")
+            out.append(ch)
+        except UnicodeEncodeError:
+            base = unicodedata.normalize("NFKD", ch)[0]
+            out.append(base if base.encode("cp1252", "ignore") else "?")
+    text = "".join(out)
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def make_pdf_bytes(pages: List[str]) -> bytes:
+    """
+    Build a minimal, valid PDF with one page per string; newlines become text lines.
+    """
+    objects: List[bytes] = []
+    page_count = len(pages)
+    font_id = 3
+    page_ids = [4 + 2 * i for i in range(page_count)]
+
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    for i, page_text in enumerate(pages):
+        lines = page_text.split("\n") or [""]
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 800 Td"]
+        for line in lines:
+            ops.append(f"({_pdf_safe(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("cp1252")
+        content_id = page_ids[i] + 1
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode()
+    return bytes(out)
+
+def sample_extraction_payload(index: int = 0) -> Dict[str, Any]:
+    """
+    Return an LLM extraction response in the shape requested by the extraction prompt.
+    """
+    return {
+        "extracted_data": {
+            "name": f"Nguyễn Văn An {index}",
+            "location": "Hà Nội, Việt Nam",
+            "social": ["https://github.com/example"],
+            "email": f"candidate{index}@example.com",
+            "linkedin": "https://linkedin.com/in/example",
+            "phone": "0901234567",
+            "intro": "Backend engineer focused on Python services.",
+            "education": [{
+                "school": "Đại học Bách Khoa Hà Nội",
+                "class_year": "2022",
+                "major": "Computer Science",
+                "gpa": "3.4"
+            }],
+            "professional_experience": [{
+                "company": "FPT Software",
+                "location": "Hanoi",
+                "position": "Software Engineer",
+                "seniority": "Junior",
+                "duration": "2022-01 to 2024-06",
+                "description": "Developed REST APIs in Python and improved query latency."
+            }],
+            "projects": [{
+                "name": "CV Screening",
+                "tech": "Python, FastAPI",
+                "duration": "3 months",
+                "description": "Built an automated resume screening service."
+            }],
+            "awards": [{
+                "contest": "ICPC Asia Hanoi",
+                "prize": "2nd Prize",
+                "description": "Team competitive programming contest.",
+                "time": "2021"
+            }],
+            "certifications": [{
+                "name": "AWS Certified Solutions Architect",
+                "org": "Amazon Web Services",
+                "link": "https://aws.amazon.com/certification/"
+            }],
+            "skills": [{"name": "Programming", "list": ["Python", "SQL", "Docker"]}]
+        },
+        "summary": "Junior backend engineer with solid Python experience.",
+        "evaluation": "Strong technical fundamentals and relevant experience.",
+        "scoring_recommendations": {
+            "education": {"score": 80, "reasoning": "Top technical university"},
+            "experience": {"score": 70, "reasoning": "Two years at a large company"},
+            "projects": {"score": 60, "reasoning": "Relevant personal project"},
+            "awards": {"score": 50, "reasoning": "Regional contest prize"},
+            "certifications": {"score": 60, "reasoning": "Recognised cloud certificate"}
+        }
+    }
+
+def sample_cv_text(index: int = 0) -> str:
+    """
+    Render sample_extraction_payload as the plain text a CV PDF would contain.
+    """
+    data = sample_extraction_payload(index)["extracted_data"]
+    lines = [data["name"], data["location"], data["email"], data["phone"], "", "EDUCATION"]
+    for edu in data["education"]:
+        lines.append(f"{edu['school']} - {edu['major']} ({edu['class_year']}) GPA {edu['gpa']}")
+    lines += ["", "EXPERIENCE"]
+    for exp in data["professional_experience"]:
+        lines.append(f"{exp['position']} at {exp['company']}, {exp['duration']}")
+        lines.append(exp["description"])
+    lines += ["", "PROJECTS"]
+    for proj in data["projects"]:
+        lines.append(f"{proj['name']} ({proj['tech']}): {proj['description']}")
+    lines += ["", "SKILLS", ", ".join(data["skills"][0]["list"])]
+    return "\n".join(lines)
+
+def sample_extraction_json(index: int = 0) -> str:
+    """
+    Return sample_extraction_payload serialised the way the model would answer.
+    """
+    return json.dumps(sample_extraction_payload(index), ensure_ascii=False)
@@ -0,0 +1,48 @@
+"""
+Random Resume objects covering every branch of the per-item scoring checks.
+"""
+import random
+from typing import List
+
+from app.models.resume import (
+    Resume, EducationItem, ProfessionalExperienceItem, ProjectItem, AwardItem, CertificationItem
+)
+
+_TEXT = ["", "Unknown", "  ", "FPT Software", "Hanoi", "Developed APIs in Python", None]
+
+def _pick(rng: random.Random, allow_none: bool = True):
+    value = rng.choice(_TEXT)
+    if value is None and not allow_none:
+        return ""
+    return value
+
+def random_resume(rng: random.Random) -> Resume:
+    s = lambda: _pick(rng, allow_none=False)
+    o = lambda: _pick(rng)
+    return Resume(
+        name="Candidate",
+        education=[
+            EducationItem(school=s(), class_year=s(), major=s(), gpa=rng.choice([None, 2.5, 3.2, 3.9, 8.5]))
+            for _ in range(rng.randint(0, 3))
+        ],
+        professional_experience=[
+            ProfessionalExperienceItem(company=s(), location=s(), position=s(), seniority=s(), duration=s(), description=s())
+            for _ in range(rng.randint(0, 4))
+        ],
+        projects=[
+            ProjectItem(name=s(), link=o(), tech=o(), duration=o(), description=s())
+            for _ in range(rng.randint(0, 5))
+        ],
+        awards=[
+            AwardItem(contest=s(), prize=s(), description=s(), role=o(), link=o(), time=s())
+            for _ in range(rng.randint(0, 2))
+        ],
+        certifications=[
+            CertificationItem(name=s(), link=o(), org=o())
+            for _ in range(rng.randint(0, 3))
+        ],
+    )
+
+def random_resumes(count: int, seed: int = 0) -> List[Resume]:
+    rng = random.Random(seed)
+    return [random_resume(rng) for _ in range(count)]
@@ -0,0 +1,38 @@
+"""
+A tiny randomly initialised RoBERTa (PhoBERT's architecture) saved to a local
+directory, so embedding code can be exercised without downloading PhoBERT.
+"""
+from typing import List
+
+TINY_VOCAB: List[str] = (
+    "python developer data scientist engineer java sql hanoi fpt software backend frontend "
+    "machine learning cloud aws docker project intern senior junior university hust rmit"
+).split()
+
+def build_tiny_model(path: str) -> str:
+    """
+    Write a tiny tokenizer and model to `path` in from_pretrained format and return the path.
+    """
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from tokenizers.processors import TemplateProcessing
+    from transformers import PreTrainedTokenizerFast, RobertaConfig, RobertaModel
+
+    vocab = {"<s>": 0, "<pad>": 1, "</s>": 2, "<unk>": 3}
+    for word in TINY_VOCAB:
+        vocab.setdefault(word, len(vocab))
+
+    backend = Tokenizer(models.WordLevel(vocab, unk_token="<unk>"))
+    backend.pre_tokenizer = pre_tokenizers.Whitespace()
+    backend.post_processor = TemplateProcessing(single="<s> $A </s>", special_tokens=[("<s>", 0), ("</s>", 2)])
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=backend,
+        bos_token="<s>", eos_token="</s>", pad_token="<pad>", unk_token="<unk>",
+        model_max_length=128,
+    )
+    model = RobertaModel(RobertaConfig(
+        vocab_size=len(vocab), hidden_size=32, num_hidden_layers=2, num_attention_heads=4,
+        intermediate_size=64, max_position_embeddings=132, pad_token_id=1,
+    ))
+    tokenizer.save_pretrained(path)
+    model.save_pretrained(path)
+    return path
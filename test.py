@@ -1,8 +1,10 @@
 import os
 import json
 import logging
+import itertools
+import concurrent.futures
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
 from datetime import datetime
 
 # Update imports to use absolute imports
@@ -27,6 +29,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+MAX_WORKERS = int(os.getenv("CV_PROCESS_MAX_WORKERS", "4"))
+CHECKPOINT_EVERY = int(os.getenv("CV_PROCESS_CHECKPOINT_EVERY", "25"))
+
 def process_cv(file_path: str) -> Dict[str, Any]:
     """
     Process a single CV file and return evaluation results.
@@ -81,40 +86,171 @@ def process_cv(file_path: str) -> Dict[str, Any]:
             "status": "Error"
         }
 
-def process_directory(directory_path: str, output_dir: str) -> None:
+SCORE_KEYS = ("education", "experience", "projects", "awards", "certifications", "total_score")
+RESULTS_FILE = "results.jsonl"
+CHECKPOINT_FILE = "checkpoint.json"
+SUMMARY_FILE = "summary_report.json"
+
+class RunningSummary:
+    """
+    Summary statistics updated one result at a time, so the report never
+    needs the full list of results in memory. Errors are counted for the
+    current run only, since errored CVs are retried on the next one.
+    """
+
+    def __init__(self, state: Optional[Dict[str, Any]] = None):
+        state = state or {}
+        self.successful = state.get("successful", 0)
+        self.passed = state.get("passed", 0)
+        self.errors = 0
+        self.score_sums = {key: 0.0 for key in SCORE_KEYS}
+        self.score_sums.update(state.get("score_sums", {}))
+
+    @property
+    def total_cvs(self) -> int:
+        return self.successful + self.errors
+
+    def add(self, result: Dict[str, Any]) -> None:
+        if result.get("status") == "Error":
+            self.errors += 1
+            return
+        self.successful += 1
+        if result.get("status") == "Pass":
+            self.passed += 1
+        for category, score in result.get("scores", {}).items():
+            self.score_sums[category] = self.score_sums.get(category, 0.0) + score
+
+    def state(self) -> Dict[str, Any]:
+        return {"successful": self.successful, "passed": self.passed, "score_sums": self.score_sums}
+
+    def report(self) -> Dict[str, Any]:
+        avg_scores = dict(self.score_sums)
+        if self.successful > 0:
+            avg_scores = {k: v / self.successful for k, v in avg_scores.items()}
+        return {
+            "processed_at": datetime.now().isoformat(),
+            "total_cvs": self.total_cvs,
+            "successful": self.successful,
+            "failed": self.errors,
+            "passed": self.passed,
+            "failed_screening": self.successful - self.passed,
+            "average_scores": avg_scores,
+        }
+
+def iter_cv_files(directory_path: str, skip: Set[str]) -> Iterator[Path]:
+    """
+    Yield the PDFs of a directory lazily, skipping names already processed.
+    """
+    for path in Path(directory_path).glob("*.pdf"):
+        if path.name not in skip:
+            yield path
+
+def process_files(files: Iterable[Path], max_workers: int = MAX_WORKERS) -> Iterator[Tuple[Path, Dict[str, Any]]]:
+    """
+    Run process_cv on a thread pool and yield (file, result) as each finishes.
+    At most 2 * max_workers files are in flight, so the file list is consumed
+    lazily however large it is.
+    """
+    files = iter(files)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        for cv_file in itertools.islice(files, 2 * max_workers):
+            pending[executor.submit(process_cv, str(cv_file))] = cv_file
+        while pending:
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            # In submission order, so a failed file stops the run before later ones are yielded.
+            for future in [future for future in pending if future in done]:
+                cv_file = pending.pop(future)
+                yield cv_file, future.result()
+                for next_file in itertools.islice(files, 1):
+                    pending[executor.submit(process_cv, str(next_file))] = next_file
+
+def load_checkpoint(output_dir: Path) -> Dict[str, Any]:
+    """
+    Load the last checkpoint and drop any results appended after it, so the
+    results file and the checkpoint always describe the same set of CVs.
+    Without a checkpoint, an existing results file is moved aside rather
+    than overwritten.
+    """
+    checkpoint_file = output_dir / CHECKPOINT_FILE
+    results_file = output_dir / RESULTS_FILE
+    if not checkpoint_file.exists():
+        if results_file.exists():
+            kept = results_file.with_name(f"{results_file.stem}.{datetime.now():%Y%m%d%H%M%S}{results_file.suffix}")
+            logger.warning(f"No checkpoint in {output_dir}; moving existing {RESULTS_FILE} to {kept.name}")
+            os.replace(results_file, kept)
+        return {"offset": 0, "processed": [], "summary": {}}
+    with open(checkpoint_file, encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    if results_file.exists() and results_file.stat().st_size != checkpoint["offset"]:
+        with open(results_file, "r+b") as f:
+            f.truncate(checkpoint["offset"])
+    return checkpoint
+
+def write_checkpoint(output_dir: Path, offset: int, processed: Set[str], summary: RunningSummary) -> None:
+    """
+    Atomically record progress, then refresh the summary report.
+    """
+    checkpoint = {"offset": offset, "processed": sorted(processed), "summary": summary.state()}
+    temp_file = output_dir / f"{CHECKPOINT_FILE}.tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, output_dir / CHECKPOINT_FILE)
+    save_json({**summary.report(), "results_file": RESULTS_FILE}, str(output_dir / SUMMARY_FILE))
+
+def process_directory(directory_path: str, output_dir: str, max_workers: int = MAX_WORKERS,
+                      checkpoint_every: int = CHECKPOINT_EVERY) -> Dict[str, Any]:
     """
     Process all CV files in a directory and save results.
-    
+
+    Results are appended to results.jsonl as they complete, and the summary
+    is kept as running totals. Every `checkpoint_every` results (and at the
+    end) checkpoint.json and summary_report.json are rewritten, so rerunning
+    after a crash skips the CVs processed before the last checkpoint. CVs
+    that failed are not checkpointed and are retried by the next run; their
+    Error line is then followed by the retry's result.
+
     Args:
         directory_path (str): Path to directory containing CVs
         output_dir (str): Path to directory for saving results
+        max_workers (int): CVs processed in parallel
+        checkpoint_every (int): Results between checkpoints
+
+    Returns:
+        Dict[str, Any]: Summary report
     """
-    # Create output directory if it doesn't exist
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    
-    # Get all PDF files
-    cv_files = list(Path(directory_path).glob("*.pdf"))
-    
-    if not cv_files:
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+
+    checkpoint = load_checkpoint(output)
+    processed = set(checkpoint["processed"])
+    summary = RunningSummary(checkpoint["summary"])
+    if processed:
+        logger.info(f"Resuming: {len(processed)} CVs already processed")
+
+    since_checkpoint = 0
+    with open(output / RESULTS_FILE, "a", encoding="utf-8") as results_file:
+        for cv_file, result in process_files(iter_cv_files(directory_path, processed), max_workers):
+            results_file.write(json.dumps({"source": cv_file.name, **result}, ensure_ascii=False) + "\n")
+            if result.get("status") != "Error":
+                processed.add(cv_file.name)
+            summary.add(result)
+            since_checkpoint += 1
+            if since_checkpoint >= checkpoint_every:
+                results_file.flush()
+                os.fsync(results_file.fileno())
+                write_checkpoint(output, results_file.tell(), processed, summary)
+                since_checkpoint = 0
+        results_file.flush()
+        os.fsync(results_file.fileno())
+        write_checkpoint(output, results_file.tell(), processed, summary)
+
+    if summary.total_cvs == 0:
         logger.warning(f"No PDF files found in {directory_path}")
-        return
-    
-    logger.info(f"Found {len(cv_files)} PDF files to process")
-    
-    # Process each CV
-    all_results = []
-    for cv_file in cv_files:
-        results = process_cv(str(cv_file))
-        all_results.append(results)
-        
-        # Save individual result
-        result_file = Path(output_dir) / f"{cv_file.stem}_result.json"
-        save_json(results, str(result_file))
-    
-    # Save summary report
-    summary_report = create_summary_report(all_results)
-    save_json(summary_report, str(Path(output_dir) / "summary_report.json"))
-    
+    return summary.report()
+
 def create_summary_report(results: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Create a summary report from all processed CVs.
@@ -125,38 +261,10 @@ def create_summary_report(results: List[Dict[str, Any]]) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Summary report
     """
-    total_cvs = len(results)
-    successful = len([r for r in results if r.get("status") != "Error"])
-    passed = len([r for r in results if r.get("status") == "Pass"])
-    
-    # Calculate average scores for successful processes
-    avg_scores = {
-        "education": 0.0,
-        "experience": 0.0,
-        "projects": 0.0,
-        "awards": 0.0,
-        "certifications": 0.0,
-        "total_score": 0.0
-    }
-    
+    summary = RunningSummary()
     for result in results:
-        if "scores" in result:
-            for category, score in result["scores"].items():
-                avg_scores[category] += score
-    
-    if successful > 0:
-        avg_scores = {k: v/successful for k, v in avg_scores.items()}
-    
-    return {
-        "processed_at": datetime.now().isoformat(),
-        "total_cvs": total_cvs,
-        "successful": successful,
-        "failed": total_cvs - successful,
-        "passed": passed,
-        "failed_screening": successful - passed,
-        "average_scores": avg_scores,
-        "results": results
-    }
+        summary.add(result)
+    return {**summary.report(), "results": results}
 
 def save_json(data: Dict[str, Any], file_path: str) -> None:
     """